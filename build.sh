@@ -8,5 +8,11 @@ pip install -r requirements.txt
 # Convert static asset files
 python3 manage.py collectstatic --no-input
 
+# Fail the build on templates that do not compile
+python3 manage.py compile_templates
+
+# Report settings that cost performance
+python3 manage.py check --deploy --tag performance
+
 # Apply any outstanding database migrations
 python3 manage.py runserver
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Gunicorn settings, read from the working directory on start."""
+import os
+import sys
+
+
+def on_starting(server):
+    """Refuse to run several workers on a per-process cache.
+
+    The table versions behind the cached pages and ETags live in the
+    cache (see task_manager/cache_versions.py). Workers that do not share
+    it would answer 304 for pages another worker has since changed.
+    """
+    if server.cfg.workers < 2:
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+    from django.conf import settings
+    from task_manager.checks import LOCAL_CACHES
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in LOCAL_CACHES:
+        server.log.error(
+            f'{server.cfg.workers} workers cannot share {backend}. Set '
+            f'CACHE_BACKEND to a shared backend, or run DJANGO_ENV=prod.'
+        )
+        sys.exit(1)
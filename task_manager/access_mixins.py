@@ -1,3 +1,5 @@
+import inspect
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
@@ -18,6 +20,26 @@ class LoginRequireMixin(LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
+def _resolve_user(request):
+    return request.user.is_authenticated
+
+
+class AsyncLoginRequireMixin(LoginRequireMixin):
+    """LoginRequireMixin for views with async handlers.
+
+    ``request.user`` is a lazy object that loads the session and the user
+    from the database, so it is resolved in a worker thread before the
+    synchronous checks run.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        await sync_to_async(_resolve_user)(request)
+        response = super().dispatch(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
 class LimitedPermissionsMixin(LoginRequireMixin):
     redirect_url = reverse_lazy('index')
     permission_denied_message = 'You do not have permissions!'
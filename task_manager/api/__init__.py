@@ -0,0 +1 @@
+"""JSON API over tasks, statuses, labels and users, mounted at /api/."""
@@ -0,0 +1,139 @@
+from collections import defaultdict
+from django.contrib.auth import get_user_model
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.filter import TaskFilter
+from task_manager.tasks.models import Task
+
+
+class Resource:
+    """How a model is exposed: its fields, relations and ordering.
+
+    ``relations`` maps relation fields to the resource they point to.
+    Foreign keys are serialized as the related id, many-to-many fields
+    as a list of ids. Clients pick fields with ``fields`` and related
+    rows to embed with ``include``; every page is read with a fixed
+    number of queries, one per many-to-many field and one per included
+    resource, whatever its size.
+    """
+    type = None
+    model = None
+    fields = ()
+    relations = {}
+    ordering = ('pk',)
+    filterset_class = None
+    version_tables = ()
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def is_many(self, name):
+        return self.model._meta.get_field(name).many_to_many
+
+    def columns(self, fields, include=()):
+        """Model fields to load to serialize ``fields``."""
+        names = {'pk', *(key.lstrip('-') for key in self.ordering)}
+        names.update(name for name in (*fields, *include)
+                     if name != 'id' and not self.is_many(name))
+        return names
+
+    def links(self, pks, name):
+        """Map each pk to the ids linked through a many-to-many field."""
+        field = self.model._meta.get_field(name)
+        own = f'{field.m2m_field_name()}_id'
+        other = f'{field.m2m_reverse_field_name()}_id'
+        links = defaultdict(list)
+        rows = field.remote_field.through.objects.filter(
+            **{f'{own}__in': pks}
+        ).order_by(other).values_list(own, other)
+        for pk, linked in rows:
+            links[pk].append(linked)
+        return links
+
+    def value(self, obj, name, links):
+        if name == 'id':
+            return obj.pk
+        if name in links:
+            return links[name].get(obj.pk, [])
+        return getattr(obj, self.model._meta.get_field(name).attname)
+
+    def serialize(self, obj, fields, links):
+        return {name: self.value(obj, name, links) for name in fields}
+
+    def related_ids(self, objects, name, links):
+        if name in links:
+            return {pk for obj in objects for pk in links[name].get(obj.pk, ())}
+        return {self.value(obj, name, links) for obj in objects} - {None}
+
+    def document(self, objects, fields, include=(), fieldsets=None):
+        pks = [obj.pk for obj in objects]
+        links = {name: self.links(pks, name)
+                 for name in {*fields, *include} if self.is_many(name)}
+        document = {'data': [self.serialize(obj, fields, links)
+                             for obj in objects]}
+        if include:
+            document['included'] = self.included(objects, include, links,
+                                                 fieldsets or {})
+        return document
+
+    def included(self, objects, include, links, fieldsets):
+        """Serialize the rows the ``include`` relations point to.
+
+        Relations to the same resource share one query.
+        """
+        ids = defaultdict(set)
+        for name in include:
+            ids[self.relations[name]] |= self.related_ids(objects, name, links)
+        included = {}
+        for type, pks in ids.items():
+            resource = RESOURCES[type]
+            fields = fieldsets.get(type, resource.fields)
+            rows = resource.get_queryset().only(
+                *resource.columns(fields)
+            ).filter(pk__in=pks).order_by('pk')
+            included[type] = [resource.serialize(row, fields, {})
+                              for row in rows]
+        return included
+
+
+class TaskResource(Resource):
+    type = 'tasks'
+    model = Task
+    fields = ('id', 'name', 'description', 'status', 'author', 'executor',
+              'labels', 'created_at', 'updated_at')
+    relations = {
+        'status': 'statuses',
+        'author': 'users',
+        'executor': 'users',
+        'labels': 'labels',
+    }
+    ordering = ('created_at', 'pk')
+    filterset_class = TaskFilter
+    version_tables = ('tasks', 'statuses', 'labels', 'users')
+
+
+class StatusResource(Resource):
+    type = 'statuses'
+    model = Statuses
+    fields = ('id', 'name', 'task_count', 'created_at')
+    # task_count changes with the tasks.
+    version_tables = ('statuses', 'tasks')
+
+
+class LabelResource(Resource):
+    type = 'labels'
+    model = Label
+    fields = ('id', 'name', 'task_count', 'created_at')
+    version_tables = ('labels', 'tasks')
+
+
+class UserResource(Resource):
+    type = 'users'
+    model = get_user_model()
+    fields = ('id', 'username', 'first_name', 'last_name', 'date_joined')
+    version_tables = ('users',)
+
+
+RESOURCES = {resource.type: resource() for resource in (
+    TaskResource, StatusResource, LabelResource, UserResource,
+)}
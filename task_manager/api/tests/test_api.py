@@ -0,0 +1,206 @@
+import json
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.models import Task
+from task_manager.tasks.tests.mixins import TaskViewsTestMixin
+
+
+class ApiTestMixin(TaskViewsTestMixin):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.api_tasks_url = reverse('api_tasks')
+        self.bulk_url = reverse('api_tasks_bulk')
+
+    def get_json(self, url, expect=200, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, expect)
+        return response.json()
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_json(url, **params)
+        return len(queries)
+
+
+class ResourceReadTest(ApiTestMixin, TestCase):
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(self.api_tasks_url)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('errors', response.json())
+
+    def test_list(self):
+        document = self.get_json(self.api_tasks_url)
+        self.assertEqual([task['id'] for task in document['data']], [1, 2, 3])
+        self.assertEqual(document['data'][0]['labels'], [1, 2])
+        self.assertEqual(document['links'], {'next': None, 'prev': None})
+        self.assertNotIn('included', document)
+
+    def test_cursor_pagination(self):
+        document = self.get_json(self.api_tasks_url, page_size=2)
+        self.assertEqual([task['id'] for task in document['data']], [1, 2])
+        document = self.get_json(document['links']['next'])
+        self.assertEqual([task['id'] for task in document['data']], [3])
+        self.assertIsNone(document['links']['next'])
+        self.get_json(self.api_tasks_url, expect=400, cursor='garbage')
+        self.get_json(self.api_tasks_url, expect=400, page_size=0)
+
+    def test_sparse_fieldsets_and_include(self):
+        document = self.get_json(
+            self.api_tasks_url, fields='name,executor',
+            include='status,author,executor',
+            **{'fields[users]': 'username'},
+        )
+        self.assertEqual(document['data'][1],
+                         {'id': 2, 'name': 'Test Task2', 'executor': None})
+        self.assertEqual(document['included']['users'], [
+            {'id': 1, 'username': 'max_payne'},
+            {'id': 2, 'username': 'Hermione'},
+        ])
+        self.assertEqual([status['name'] for status
+                          in document['included']['statuses']],
+                         ['In progress', 'Finished'])
+        self.assertNotIn('labels', document['included'])
+
+    def test_unknown_names_are_rejected(self):
+        for params in ({'fields': 'password'}, {'include': 'name'},
+                       {'include': 'status', 'fields[statuses]': 'tasks'}):
+            document = self.get_json(self.api_tasks_url, expect=400, **params)
+            self.assertIn('errors', document)
+
+    def test_include_takes_a_fixed_number_of_queries(self):
+        params = {'include': 'status,author,executor,labels',
+                  'page_size': 3}
+        queries = self.count_queries(self.api_tasks_url, **params)
+        Task.objects.bulk_create(
+            Task(name=f'extra {n}', status_id=n % 2 + 1, author=self.user2)
+            for n in range(20)
+        )
+        Task.labels.through.objects.bulk_create(
+            Task.labels.through(task=task, label_id=1)
+            for task in Task.objects.filter(name__startswith='extra')
+        )
+        params['page_size'] = 20
+        self.assertEqual(self.count_queries(self.api_tasks_url, **params),
+                         queries)
+
+    def test_task_filter(self):
+        document = self.get_json(self.api_tasks_url, status=2)
+        self.assertEqual([task['id'] for task in document['data']], [2])
+        document = self.get_json(self.api_tasks_url, labels=1, q='Task1')
+        self.assertEqual([task['id'] for task in document['data']], [1])
+        document = self.get_json(self.api_tasks_url, expect=400, executor=99)
+        self.assertIn('executor', document['errors'])
+
+    def test_detail(self):
+        url = reverse('api_tasks_detail', kwargs={'pk': 3})
+        document = self.get_json(url, include='status')
+        self.assertEqual(document['data']['name'], 'Test Task3')
+        self.assertEqual(document['included']['statuses'][0]['id'], 1)
+        self.get_json(reverse('api_tasks_detail', kwargs={'pk': 99}),
+                      expect=404)
+
+    def test_other_resources(self):
+        for name in ('statuses', 'labels', 'users'):
+            document = self.get_json(reverse(f'api_{name}'))
+            self.assertEqual([row['id'] for row in document['data']], [1, 2])
+        document = self.get_json(reverse('api_users'))
+        self.assertNotIn('password', document['data'][0])
+
+    def test_conditional_get(self):
+        response = self.client.get(self.api_tasks_url)
+        response = self.client.get(
+            self.api_tasks_url, headers={'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_task_counts_follow_the_tasks(self):
+        for name in ('statuses', 'labels'):
+            with self.subTest(name=name):
+                url = reverse(f'api_{name}')
+                etag = self.client.get(url)['ETag']
+                task = Task.objects.create(name=f'Counted {name}',
+                                           status_id=1, author=self.user)
+                task.labels.add(1)
+                response = self.client.get(
+                    url, headers={'If-None-Match': etag}
+                )
+                self.assertEqual(response.status_code, 200)
+
+
+class TaskBulkTest(ApiTestMixin, TestCase):
+
+    def post(self, data, status=200):
+        response = self.client.post(self.bulk_url, json.dumps(data),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, status)
+        return response.json()
+
+    def test_create_and_update(self):
+        document = self.post({'data': [
+            {'name': 'bulk one', 'status': 2, 'labels': [1, 2]},
+            {'id': 1, 'status': 2, 'labels': []},
+            {'id': 3, 'name': 'renamed', 'executor': None},
+        ]})
+        created, first, third = document['data']
+        self.assertEqual(created['author'], self.user.pk)
+        self.assertEqual(created['labels'], [1, 2])
+        self.assertEqual((first['status'], first['labels']), (2, []))
+        self.assertEqual(first['name'], 'Test Task1')
+        self.assertEqual((third['name'], third['executor']), ('renamed', None))
+        self.assertEqual(
+            dict(Statuses.objects.values_list('pk', 'task_count')),
+            {1: 1, 2: 3},
+        )
+        self.assertEqual(dict(Label.objects.values_list('pk', 'task_count')),
+                         {1: 1, 2: 2})
+
+    def test_invalid_item_fails_the_batch(self):
+        document = self.post({'data': [
+            {'name': 'would be created', 'status': 1},
+            {'id': 2, 'status': 99},
+            {'name': 'Test Task1', 'status': 1, 'labels': [7]},
+            {'name': '', 'status': 1},
+            {'status': 1, 'colour': 'red'},
+        ]}, status=400)
+        self.assertEqual(set(document['errors']), {'1', '2', '3', '4'})
+        self.assertEqual(set(document['errors']['2']), {'name', 'labels'})
+        self.assertEqual(set(document['errors']['4']), {'colour'})
+        self.assertFalse(Task.objects.filter(
+            name='would be created'
+        ).exists())
+        self.assertEqual(Task.objects.get(pk=2).status_id, 2)
+
+    def test_names_are_unique_within_the_batch(self):
+        document = self.post({'data': [
+            {'name': 'twin', 'status': 1},
+            {'name': 'twin', 'status': 1},
+            {'id': 1, 'name': 'Test Task2'},
+        ]}, status=400)
+        self.assertEqual(set(document['errors']), {'1', '2'})
+
+    def test_malformed_body(self):
+        self.post([], status=400)
+        self.post({'data': {}}, status=400)
+        response = self.client.post(self.bulk_url, 'not json',
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        def queries(names):
+            with CaptureQueriesContext(connection) as captured:
+                self.post({'data': [
+                    {'name': name, 'status': 1, 'labels': [1]}
+                    for name in names
+                ] + [{'id': 1, 'name': f'{names[0]} renamed', 'labels': [2]}]})
+            return len(captured)
+
+        self.assertEqual(queries(['a', 'b']),
+                         queries([f'c{n}' for n in range(30)]))
@@ -0,0 +1,24 @@
+from django.urls import path
+from task_manager.api.views import (
+    DashboardView,
+    ResourceDetailView,
+    ResourceListView,
+    TaskBulkView,
+)
+from .resources import RESOURCES
+
+urlpatterns = [
+    path('tasks/bulk/', TaskBulkView.as_view(), name='api_tasks_bulk'),
+    path('dashboard/', DashboardView.as_view(), name='api_dashboard'),
+]
+
+for resource in RESOURCES.values():
+    options = {'resource_type': resource.type,
+               'version_tables': resource.version_tables}
+    urlpatterns += [
+        path(f'{resource.type}/', ResourceListView.as_view(**options),
+             name=f'api_{resource.type}'),
+        path(f'{resource.type}/<int:pk>/',
+             ResourceDetailView.as_view(**options),
+             name=f'api_{resource.type}_detail'),
+    ]
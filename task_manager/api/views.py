@@ -0,0 +1,201 @@
+import json
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.http import JsonResponse
+from django.utils.translation import gettext as _
+from django.views.generic import View
+from task_manager.pagination import InvalidCursor, KeysetPaginator
+from task_manager.tasks.bulk import TaskBatch
+from task_manager.tasks.dashboard import get_dashboard
+from task_manager.view_mixins import ConditionalGetMixin
+from .resources import RESOURCES
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BATCH_SIZE = 1000
+
+
+class ApiError(Exception):
+    def __init__(self, errors, status=400):
+        super().__init__(errors)
+        self.errors = errors
+        self.status = status
+
+    def response(self):
+        return JsonResponse({'errors': self.errors}, status=self.status)
+
+
+class ApiView(View):
+    """Session-authenticated JSON endpoint.
+
+    Anonymous requests get a 401 and ApiError raised by a handler is
+    turned into its JSON error response.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            if not request.user.is_authenticated:
+                raise ApiError({NON_FIELD_ERRORS: [
+                    _('You are not authorized! Please log in.')
+                ]}, status=401)
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return error.response()
+
+
+class ResourceView(ApiView):
+    """Read a resource with sparse fieldsets and included relations.
+
+    ``fields=a,b`` picks the fields of the resource, ``include=rel,...``
+    embeds the rows its relations point to and ``fields[<type>]=...``
+    picks the fields of those.
+    """
+    http_method_names = ['get', 'head', 'options']
+    read_from_replica = True
+    resource_type = None
+
+    @property
+    def resource(self):
+        return RESOURCES[self.resource_type]
+
+    def get_names(self, param, allowed):
+        value = self.request.GET.get(param)
+        if value is None:
+            return None
+        names = list(dict.fromkeys(name for name in value.split(',') if name))
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ApiError({param: [
+                _('Unknown field: %s') % ', '.join(unknown)
+            ]})
+        return names
+
+    def get_fields(self, resource, param='fields'):
+        fields = self.get_names(param, resource.fields)
+        if fields is None:
+            return resource.fields
+        return ['id', *(name for name in fields if name != 'id')]
+
+    def get_include(self):
+        return self.get_names('include', self.resource.relations) or []
+
+    def get_document(self, objects):
+        include = self.get_include()
+        fieldsets = {
+            type: self.get_fields(RESOURCES[type], f'fields[{type}]')
+            for type in {self.resource.relations[name] for name in include}
+        }
+        return self.resource.document(objects, self.fields, include,
+                                      fieldsets)
+
+    def get_queryset(self):
+        self.fields = self.get_fields(self.resource)
+        return self.resource.get_queryset().only(
+            *self.resource.columns(self.fields, self.get_include())
+        )
+
+
+class ResourceListMixin:
+
+    def filter_queryset(self, queryset):
+        filterset_class = self.resource.filterset_class
+        if filterset_class is None:
+            return queryset
+        filterset = filterset_class(self.request.GET or None,
+                                    queryset=queryset, request=self.request)
+        if filterset.is_bound and not filterset.is_valid():
+            raise ApiError({field: list(errors)
+                            for field, errors in filterset.errors.items()})
+        return filterset.qs
+
+    def get_page_size(self):
+        try:
+            page_size = int(self.request.GET.get('page_size', PAGE_SIZE))
+        except ValueError:
+            page_size = 0
+        if not 0 < page_size <= MAX_PAGE_SIZE:
+            raise ApiError({'page_size': [
+                _('Enter a whole number from 1 to %d.') % MAX_PAGE_SIZE
+            ]})
+        return page_size
+
+    def link(self, page, query):
+        return f'{self.request.path}?{query}' if page else None
+
+    def get(self, request, *args, **kwargs):
+        paginator = KeysetPaginator(
+            self.filter_queryset(self.get_queryset()), self.get_page_size(),
+            ordering=self.resource.ordering, params=request.GET,
+        )
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise ApiError({'cursor': [_('Invalid cursor.')]})
+        document = self.get_document(list(page))
+        document['links'] = {
+            'next': self.link(page.has_next(), page.next_query),
+            'prev': self.link(page.has_previous(), page.previous_query),
+        }
+        return JsonResponse(document)
+
+
+class ResourceDetailMixin:
+
+    def get(self, request, *args, **kwargs):
+        obj = self.get_queryset().filter(pk=kwargs['pk']).first()
+        if obj is None:
+            raise ApiError({'id': [_('Not found.')]}, status=404)
+        document = self.get_document([obj])
+        document['data'] = document['data'][0]
+        return JsonResponse(document)
+
+
+class ResourceListView(ConditionalGetMixin, ResourceListMixin, ResourceView):
+    pass
+
+
+class ResourceDetailView(ConditionalGetMixin, ResourceDetailMixin,
+                         ResourceView):
+    pass
+
+
+class DashboardView(ApiView):
+    """Task counts per status, label, executor and creation day."""
+    http_method_names = ['get', 'head', 'options']
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'data': get_dashboard()})
+
+
+class TaskBulkView(ApiView):
+    """Create and update up to MAX_BATCH_SIZE tasks in one transaction.
+
+    The body is ``{"data": [task, ...]}``; tasks with an ``id`` are
+    updates. See task_manager.tasks.bulk.TaskBatch.
+    """
+    http_method_names = ['post', 'options']
+
+    def get_items(self):
+        try:
+            body = json.loads(self.request.body)
+        except ValueError:
+            raise ApiError({NON_FIELD_ERRORS: [_('Malformed JSON.')]})
+        items = body.get('data') if isinstance(body, dict) else None
+        if not isinstance(items, list):
+            raise ApiError({'data': [_('Expected a list.')]})
+        if len(items) > MAX_BATCH_SIZE:
+            raise ApiError({'data': [
+                _('At most %d tasks per batch.') % MAX_BATCH_SIZE
+            ]})
+        return items
+
+    def post(self, request, *args, **kwargs):
+        batch = TaskBatch(request.user, self.get_items()).run()
+        if batch.errors:
+            raise ApiError(batch.errors)
+        resource = RESOURCES['tasks']
+        pks = [task.pk for task, labels in batch.tasks]
+        tasks = resource.get_queryset().in_bulk(pks)
+        return JsonResponse(resource.document(
+            [tasks[pk] for pk in pks], resource.fields
+        ))
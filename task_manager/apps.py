@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class TaskManagerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'task_manager'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import checks  # noqa: F401
+        from .timing_middleware import install_query_recorder
+        connection_created.connect(install_query_recorder)
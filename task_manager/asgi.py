@@ -9,7 +9,12 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 from django.core.asgi import get_asgi_application
+from task_manager.template_warmup import warm_templates
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
 application = get_asgi_application()
+
+# Parse every template before the first request. A template that does not
+# compile keeps the worker from booting.
+warm_templates()
@@ -0,0 +1,53 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'version:{}'
+
+
+def get_version(name):
+    """Return the current change version of a table.
+
+    Versions are nanosecond timestamps of the last write, so they also
+    tell when the table last changed.
+    """
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(*names):
+    return [get_version(name) for name in names]
+
+
+async def aget_version(name):
+    """Like get_version(), through the async cache API."""
+    key = VERSION_KEY.format(name)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+async def aget_versions(*names):
+    return [await aget_version(name) for name in names]
+
+
+def bump_version(*names):
+    now = time.time_ns()
+    cache.set_many({VERSION_KEY.format(name): now for name in names}, None)
+
+
+def touch(*names):
+    """Invalidate everything cached under the given table versions.
+
+    The version is bumped right away and again once the transaction
+    commits, so a value rebuilt from pre-commit data by a concurrent
+    request does not outlive the write.
+    """
+    bump_version(*names)
+    transaction.on_commit(lambda: bump_version(*names))
@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.core import checks
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.urls import URLPattern, URLResolver, get_resolver
+from .template_warmup import compile_templates
+
+
+def _view_classes(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if view_class is not None:
+                yield view_class
+
+
+def _leading_index_columns(model):
+    opts = model._meta
+    columns = {opts.pk.name}
+    columns.update(field.name for field in opts.concrete_fields
+                   if field.unique or field.db_index)
+    columns.update(index.fields[0].lstrip('-') for index in opts.indexes
+                   if index.fields and index.condition is None)
+    columns.update(fields[0] for fields in opts.unique_together)
+    return columns
+
+
+@checks.register(checks.Tags.models, checks.Tags.urls)
+def check_sortable_columns(app_configs, **kwargs):
+    errors = []
+    seen = set()
+    for view_class in _view_classes(get_resolver().url_patterns):
+        columns = getattr(view_class, 'sortable_columns', None)
+        model = getattr(view_class, 'model', None)
+        if not columns or model is None or view_class in seen:
+            continue
+        seen.add(view_class)
+        indexed = _leading_index_columns(model) | {'pk'}
+        for column, field in columns.items():
+            if field not in indexed:
+                errors.append(checks.Error(
+                    f"Sortable column '{column}' of {view_class.__name__} "
+                    f"orders by '{field}', which has no index.",
+                    hint='Add an index leading with this field or drop the '
+                         'column from sortable_columns.',
+                    obj=view_class,
+                    id='task_manager.E001',
+                ))
+    return errors
+
+
+@checks.register(checks.Tags.templates)
+def check_templates_compile(app_configs, **kwargs):
+    return [
+        checks.Error(
+            f"Template '{name}' does not compile: {error}",
+            id='task_manager.E002',
+        )
+        for name, error in compile_templates().items()
+    ]
+
+
+# Deployment checks for settings that cost performance, run by
+# "manage.py check --deploy" (add "--tag performance" for these alone).
+PERFORMANCE = 'performance'
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _debug_warnings():
+    if settings.DEBUG:
+        yield checks.Warning(
+            'DEBUG is on, so every SQL query of a request is kept in memory.',
+            hint="Run with DJANGO_ENV=prod.",
+            id='task_manager.W001',
+        )
+
+
+def _cache_warnings():
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in LOCAL_CACHES:
+        yield checks.Warning(
+            f'The default cache is {backend}, which worker processes do '
+            f'not share, so they disagree on table versions.',
+            hint='Set CACHE_BACKEND to a shared backend.',
+            id='task_manager.W002',
+        )
+
+
+def _connection_warnings():
+    for alias, database in settings.DATABASES.items():
+        if 'POOL' in database:
+            continue
+        if database.get('CONN_MAX_AGE', 0) == 0:
+            yield checks.Warning(
+                f"Database '{alias}' opens a new connection per request.",
+                hint='Set CONN_MAX_AGE.',
+                id='task_manager.W003',
+            )
+        elif not database.get('CONN_HEALTH_CHECKS', False):
+            yield checks.Warning(
+                f"Database '{alias}' reuses connections without health "
+                f"checks, so a dropped connection fails a request.",
+                hint='Set CONN_HEALTH_CHECKS = True.',
+                id='task_manager.W004',
+            )
+
+
+def _template_warnings():
+    loaders = engines['django'].engine.template_loaders
+    if not any(isinstance(loader, CachedLoader) for loader in loaders):
+        yield checks.Warning(
+            'Templates are read and parsed on every render.',
+            hint="Wrap the loaders in 'django.template.loaders.cached.Loader'.",
+            id='task_manager.W005',
+        )
+
+
+def _static_warnings():
+    backend = settings.STORAGES['staticfiles']['BACKEND']
+    if 'Manifest' not in backend:
+        yield checks.Warning(
+            f'Static files are stored with {backend}, so their names do '
+            f'not change with their content and cannot be cached for long.',
+            hint='Use whitenoise.storage.CompressedManifestStaticFilesStorage.',
+            id='task_manager.W006',
+        )
+
+
+@checks.register(PERFORMANCE, deploy=True)
+def check_performance_settings(app_configs, **kwargs):
+    return [
+        *_debug_warnings(),
+        *_cache_warnings(),
+        *_connection_warnings(),
+        *_template_warnings(),
+        *_static_warnings(),
+    ]
@@ -0,0 +1,5 @@
+"""PostgreSQL backend that shares a bounded pool of connections.
+
+Used as ``ENGINE`` when the database URL asks for pooling, see
+pool.configure_pooling.
+"""
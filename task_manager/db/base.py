@@ -0,0 +1,57 @@
+from functools import partial
+import psycopg2
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from .pool import get_pool
+
+
+def is_alive(connection):
+    """Ping a pooled connection before it is handed out again.
+
+    Like CONN_HEALTH_CHECKS, which does nothing with CONN_MAX_AGE=0, it
+    catches connections the server closed while they were idle.
+    """
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Borrows connections from the process-wide pool and returns them on
+    close() instead of closing them."""
+
+    @property
+    def pool(self):
+        return get_pool(self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        # The parent sets this for the connections it opens only.
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = IsolationLevel(
+            options.get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return self.pool.acquire(
+            partial(super().get_new_connection, conn_params), is_alive
+        )
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection, self._reusable())
+
+    def _reusable(self):
+        connection = self.connection
+        if connection.closed or (self.errors_occurred
+                                 and not self.is_usable()):
+            return False
+        if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        return True
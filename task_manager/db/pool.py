@@ -0,0 +1,146 @@
+import queue
+import threading
+from django.db.utils import OperationalError
+
+POOL_ENGINE = 'task_manager.db'
+POOL_TIMEOUT = 10
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """At most ``max_size`` connections shared by the threads of a process.
+
+    A connection is opened only when no idle one is left; when all of
+    them are in use, callers wait up to ``timeout`` seconds for one.
+    """
+
+    def __init__(self, max_size, timeout=POOL_TIMEOUT):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self.size = self.in_use = self.peak_in_use = 0
+        self.waits = self.timeouts = 0
+
+    def _take_slot(self):
+        if self._slots.acquire(blocking=False):
+            return
+        self._count('waits')
+        if not self._slots.acquire(timeout=self.timeout):
+            self._count('timeouts')
+            raise PoolTimeout(
+                f'No database connection was free within '
+                f'{self.timeout}s ({self.max_size} in use).'
+            )
+
+    def acquire(self, connect, usable=None):
+        """Return an idle connection, or a new one made by ``connect()``.
+
+        Idle connections failing ``usable(connection)``, such as ones the
+        server dropped while they sat in the pool, are closed and skipped.
+        """
+        self._take_slot()
+        try:
+            connection = self._checkout(connect, usable)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return connection
+
+    def _checkout(self, connect, usable):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if usable is None or usable(connection):
+                return connection
+            self._discard(connection)
+        connection = connect()
+        self._count('size')
+        return connection
+
+    def _discard(self, connection):
+        self._count('size', -1)
+        connection.close()
+
+    def release(self, connection, reusable=True):
+        """Give a connection back, closing it unless ``reusable``."""
+        with self._lock:
+            self.in_use -= 1
+        try:
+            if reusable:
+                self._idle.put(connection)
+            else:
+                self._discard(connection)
+        finally:
+            self._slots.release()
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'in_use': self.in_use,
+                'idle': self.size - self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(settings_dict):
+    """Return the process-wide pool of the database in ``settings_dict``."""
+    key = tuple(settings_dict.get(name)
+                for name in ('HOST', 'PORT', 'NAME', 'USER'))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(**settings_dict['POOL'])
+        return _pools[key]
+
+
+def pool_stats():
+    """Return ``{database name: stats}`` of the pools of this process."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {key[2]: pool.stats() for key, pool in pools}
+
+
+def configure_pooling(database, pool_size=None):
+    """Apply the pooling options of a dj_database_url config in place.
+
+    ``?pool_size=N`` (or ``pool_size``) switches to the pooling backend,
+    with ``?pool_timeout=S`` seconds to wait for a free connection.
+    Connections go back to the pool at the end of each request instead of
+    staying with the thread that opened them, so CONN_MAX_AGE is 0.
+
+    ``?pgbouncer=true`` suits PgBouncer in transaction mode, which cannot
+    keep the server-side cursors of queryset.iterator() open.
+    """
+    options = database.setdefault('OPTIONS', {})
+    if options.pop('pgbouncer', False):
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    pool_size = options.pop('pool_size', pool_size)
+    timeout = options.pop('pool_timeout', POOL_TIMEOUT)
+    if pool_size:
+        database.update(
+            ENGINE=POOL_ENGINE,
+            CONN_MAX_AGE=0,
+            POOL={'max_size': int(pool_size), 'timeout': float(timeout)},
+        )
+    return database
@@ -0,0 +1,84 @@
+"""Routing of the reads of read-only views to a replica database.
+
+ReplicaRoutingMiddleware keeps a RoutingState for each request. Reads go
+to the ``replica`` database while the state says so, and the state
+records whether the request wrote anything. Writes always go to the
+primary.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA = 'replica'
+# Sessions are read on every request and must see the latest login.
+PRIMARY_ONLY_APPS = {'sessions'}
+
+# Like the request timings, the state follows the request into
+# sync_to_async threads.
+_current = ContextVar('replica_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+def current_state():
+    return _current.get()
+
+
+@contextmanager
+def routing():
+    """Route the database access inside the block with a fresh state."""
+    state = RoutingState()
+    token = _current.set(state)
+    try:
+        yield state
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def primary():
+    """Read from the primary inside the block.
+
+    For values kept under the current table versions: the versions are
+    bumped on the primary, and a replica still behind the write would
+    store the old rows under the new version.
+    """
+    state = _current.get()
+    use_replica = state is not None and state.use_replica
+    if use_replica:
+        state.use_replica = False
+    try:
+        yield
+    finally:
+        if use_replica:
+            state.use_replica = True
+
+
+def _routed(model):
+    return (_current.get() is not None
+            and model._meta.app_label not in PRIMARY_ONLY_APPS)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _routed(model) and _current.get().use_replica:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        if _routed(model):
+            _current.get().wrote = True
+        # Not the database the instance was read from, which may be the
+        # replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db != REPLICA
@@ -0,0 +1,148 @@
+import threading
+from unittest import mock, skipUnless
+import dj_database_url
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test import SimpleTestCase, TestCase
+from task_manager.db import pool as pool_module
+from task_manager.db.base import DatabaseWrapper
+from task_manager.db.pool import (
+    POOL_ENGINE,
+    ConnectionPool,
+    PoolTimeout,
+    configure_pooling,
+)
+
+
+class ConfigurePoolingTest(SimpleTestCase):
+    url = 'postgresql://user:secret@db:5432/tasks'
+
+    def test_pool_options_from_url(self):
+        database = configure_pooling(dj_database_url.parse(
+            f'{self.url}?pool_size=8&pool_timeout=2&sslmode=require',
+            conn_max_age=600,
+        ))
+        self.assertEqual(database['ENGINE'], POOL_ENGINE)
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['POOL'], {'max_size': 8, 'timeout': 2.0})
+        self.assertEqual(database['OPTIONS'], {'sslmode': 'require'})
+
+    def test_pool_size_fallback_and_pgbouncer(self):
+        database = configure_pooling(
+            dj_database_url.parse(f'{self.url}?pgbouncer=true'), '5'
+        )
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertEqual(database['POOL']['max_size'], 5)
+
+    def test_no_pooling_by_default(self):
+        database = configure_pooling(dj_database_url.parse(self.url))
+        self.assertNotIn('POOL', database)
+        self.assertFalse(database['DISABLE_SERVER_SIDE_CURSORS'])
+
+
+class ConnectionPoolTest(SimpleTestCase):
+
+    def test_timeout(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.acquire(object)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(object)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_broken_connections_are_dropped(self):
+        pool = ConnectionPool(max_size=1)
+        conn = pool.acquire(mock.Mock)
+        pool.release(conn, reusable=False)
+        conn.close.assert_called_once()
+        self.assertIsNot(pool.acquire(mock.Mock), conn)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_unusable_idle_connections_are_replaced(self):
+        pool = ConnectionPool(max_size=2)
+        dead, alive = pool.acquire(mock.Mock), pool.acquire(mock.Mock)
+        pool.release(alive)
+        pool.release(dead)
+        # The most recently released connection is tried first.
+        self.assertIs(pool.acquire(mock.Mock, lambda conn: conn is alive),
+                      alive)
+        dead.close.assert_called_once()
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_failed_connect_frees_the_slot(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        with self.assertRaises(OSError):
+            pool.acquire(mock.Mock(side_effect=OSError))
+        self.assertIsNotNone(pool.acquire(object))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+class PooledBackendTest(TestCase):
+
+    def setUp(self):
+        # A pool of each test's own; the pools are keyed by server and db.
+        patcher = mock.patch.dict(pool_module._pools, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.close_pools)
+
+    @staticmethod
+    def close_pools():
+        for pool in pool_module._pools.values():
+            while not pool._idle.empty():
+                pool._idle.get_nowait().close()
+
+    @staticmethod
+    def pooled(max_size):
+        settings = {**connection.settings_dict, 'ENGINE': POOL_ENGINE,
+                    'POOL': {'max_size': max_size, 'timeout': 5}}
+        # Under the default alias, which django.contrib.postgres looks up
+        # when a connection is created.
+        return DatabaseWrapper(settings, alias=DEFAULT_DB_ALIAS)
+
+    def test_connections_are_reused(self):
+        pooled = self.pooled(2)
+        pooled.ensure_connection()
+        first = pooled.connection
+        pooled.close()
+        pooled.ensure_connection()
+        self.assertIs(pooled.connection, first)
+        self.assertEqual(pooled.pool.stats()['size'], 1)
+        pooled.close()
+
+    def test_connection_dropped_while_idle_is_replaced(self):
+        pooled = self.pooled(2)
+        pooled.ensure_connection()
+        pid = pooled.connection.get_backend_pid()
+        pooled.close()
+        with connection.cursor() as cursor:
+            # Waits up to 5s for the backend to exit.
+            cursor.execute('SELECT pg_terminate_backend(%s, 5000)', [pid])
+        with pooled.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            self.assertNotEqual(cursor.fetchone()[0], pid)
+        self.assertEqual(pooled.pool.stats()['size'], 1)
+        pooled.close()
+
+    def test_load_stays_within_budget(self):
+        errors = []
+
+        def request():
+            pooled = self.pooled(3)
+            try:
+                with pooled.cursor() as cursor:
+                    cursor.execute('SELECT pg_sleep(0.01)')
+            except Exception as error:
+                errors.append(error)
+            finally:
+                pooled.close()
+
+        threads = [threading.Thread(target=request) for _ in range(30)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = next(iter(pool_module._pools.values())).stats()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(stats['size'], 3)
+        self.assertEqual(stats['peak_in_use'], 3)
+        self.assertEqual((stats['in_use'], stats['timeouts']), (0, 0))
+        self.assertGreater(stats['waits'], 0)
@@ -0,0 +1,113 @@
+import time
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+from task_manager.cache_versions import touch
+from task_manager.db.router import REPLICA, ReplicaRouter, routing
+from task_manager.replica_middleware import PIN_COOKIE
+from task_manager.tasks.choices import get_choices
+from task_manager.tasks.dashboard import get_dashboard
+from task_manager.tasks.tests.mixins import TaskViewsTestMixin
+
+
+class ReplicaRoutingTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # The replica is the test database itself, so it holds the
+        # fixtures; the router's choices tell where reads went.
+        patcher = mock.patch.dict(settings.DATABASES,
+                                  {REPLICA: settings.DATABASES['default']})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        connections[REPLICA] = connections['default']
+        self.addCleanup(connections.__delitem__, REPLICA)
+        self.reads = []
+        route = ReplicaRouter.db_for_read
+
+        def db_for_read(router, model, **hints):
+            self.reads.append(route(router, model, **hints))
+            return self.reads[-1]
+
+        patcher = mock.patch.object(ReplicaRouter, 'db_for_read',
+                                    db_for_read)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Past the lag allowed for the writes of earlier tests.
+        self.now = time.time() + settings.REPLICA_PIN_SECONDS + 1
+        patcher = mock.patch('task_manager.view_mixins.time',
+                             mock.Mock(time=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_login(self.user)
+
+    def get(self, url):
+        self.reads.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_read_only_views_read_from_replica(self):
+        for url in (self.tasks_url, self.task_view_url, reverse('users'),
+                    reverse('statuses'), reverse('labels')):
+            with self.subTest(url=url):
+                self.get(url)
+                self.assertIn(REPLICA, self.reads)
+
+    def test_other_views_and_sessions_use_the_primary(self):
+        self.get(self.task_create_url)
+        self.assertNotIn(REPLICA, self.reads)
+        self.get(self.tasks_url)
+        self.assertIn(None, self.reads)  # the session
+
+    def test_writes_pin_to_primary(self):
+        response = self.client.post(self.task_create_url, {
+            'name': 'Pinned', 'status': 1,
+        })
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'],
+                         settings.REPLICA_PIN_SECONDS)
+        self.get(self.tasks_url)
+        self.assertNotIn(REPLICA, self.reads)
+        self.client.cookies.pop(PIN_COOKIE)
+        self.get(self.tasks_url)
+        self.assertIn(REPLICA, self.reads)
+
+    def test_reads_do_not_pin(self):
+        response = self.get(self.tasks_url)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    async def test_async_view_reads_from_replica(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        self.reads.clear()
+        response = await self.async_client.get(self.tasks_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(REPLICA, self.reads)
+
+    def test_replica_behind_a_touch(self):
+        # The replica has not replayed the write yet: what is kept under
+        # the new versions must come from the primary.
+        touch('statuses')
+        self.now = time.time()
+        response = self.get(reverse('statuses'))
+        # Only the user, looked up for the ETag, came from the replica.
+        self.assertEqual(self.reads, [None, REPLICA, None])
+        self.reads.clear()
+        with routing() as state:
+            state.use_replica = True
+            get_choices('statuses')
+            get_dashboard()
+            self.assertTrue(state.use_replica)
+        self.assertTrue(self.reads)
+        self.assertNotIn(REPLICA, self.reads)
+        # Once the replica has caught up, the page is read from it and
+        # the unchanged ETag stands.
+        self.now += settings.REPLICA_PIN_SECONDS + 1
+        self.reads.clear()
+        self.assertEqual(self.client.get(reverse('statuses'), headers={
+            'if-none-match': response['ETag'],
+        }).status_code, 304)
+        self.get(reverse('statuses'))
+        self.assertIn(REPLICA, self.reads)
@@ -0,0 +1,197 @@
+"""Error reports posted off the request path.
+
+By default rollbar posts every occurrence from a new thread, with a new
+HTTP session each time. ErrorReporter hooks into rollbar's event
+handlers instead:
+
+* repeats of an error (same exception class raised from the same line)
+  are reported at most ERROR_REPORT_RATE_LIMIT times per
+  ERROR_REPORT_RATE_WINDOW seconds. Repeats held back are skipped
+  before rollbar builds their payload, and the next report sent for that
+  error carries their number as ``custom.suppressed_occurrences``;
+* payloads go on a bounded queue and the request carries on. When the
+  queue is full the payload is dropped and counted;
+* one daemon thread per process drains the queue in batches of
+  ERROR_REPORT_BATCH_SIZE and posts them one after the other through
+  rollbar's blocking handler, reusing its keep-alive session.
+
+ROLLBAR['endpoint'] may point at a local stub, as the tests do.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+import rollbar
+from django.conf import settings
+from rollbar.lib import events
+
+logger = logging.getLogger('task_manager.error_reporting')
+
+FLUSH_TIMEOUT = 2
+
+
+def fingerprint(exc_info):
+    """Exception class and the line it was raised from."""
+    cls, _, trace = exc_info
+    while trace is not None and trace.tb_next is not None:
+        trace = trace.tb_next
+    where = None
+    if trace is not None:
+        where = (trace.tb_frame.f_code.co_filename, trace.tb_lineno)
+    return f'{cls.__module__}.{cls.__qualname__}', where
+
+
+class RateLimiter:
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def admit(self, key, now=None):
+        """Return None if ``key`` is over the limit, otherwise the number
+        of occurrences held back since it was last admitted."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            started, admitted, held = self._seen.get(key, (now, 0, 0))
+            if now - started >= self.window:
+                started, admitted = now, 0
+            if admitted >= self.limit:
+                self._seen[key] = (started, admitted, held + 1)
+                return None
+            self._forget(now)
+            self._seen[key] = (started, admitted + 1, 0)
+            return held
+
+    def suppressed(self):
+        with self._lock:
+            return sum(held for _, _, held in self._seen.values())
+
+    def _forget(self, now):
+        expired = [key for key, (started, _, _) in self._seen.items()
+                   if now - started >= self.window]
+        for key in expired:
+            del self._seen[key]
+
+
+class ErrorReporter:
+    def __init__(self, limiter, maxsize=100, batch_size=10, send=None):
+        self.limiter = limiter
+        self.queue = queue.Queue(maxsize)
+        self.batch_size = batch_size
+        self.sent = 0
+        self.dropped = 0
+        self._send = send or rollbar.send_payload
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._overflowing = False
+
+    def install(self):
+        """Register with rollbar; rollbar.init() must have run."""
+        events.add_exception_info_handler(self.admit)
+        events.add_payload_handler(self.submit)
+
+    def uninstall(self):
+        events.remove_exception_info_handler(self.admit)
+        events.remove_payload_handler(self.submit)
+
+    def admit(self, exc_info, extra_data=None, **kwargs):
+        held = self.limiter.admit(fingerprint(exc_info))
+        if held is None:
+            return False
+        if held and isinstance(extra_data, dict):
+            extra_data['suppressed_occurrences'] = held
+        return exc_info
+
+    def submit(self, payload, **kwargs):
+        if threading.current_thread() is self._thread:
+            # The drain thread sending: let rollbar post it.
+            return payload
+        try:
+            self.queue.put_nowait(payload)
+        except queue.Full:
+            self._drop()
+        else:
+            self._ensure_thread()
+        return False
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Wait for the queued payloads to be posted."""
+        deadline = time.monotonic() + timeout
+        done = self.queue.all_tasks_done
+        with done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                done.wait(remaining)
+        return True
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'suppressed': self.limiter.suppressed(),
+        }
+
+    def _drop(self):
+        with self._lock:
+            self.dropped += 1
+            overflowing, self._overflowing = self._overflowing, True
+        if not overflowing:
+            logger.warning('Error report queue full, dropping reports.')
+
+    def _ensure_thread(self):
+        with self._lock:
+            alive = self._thread is not None and self._thread.is_alive()
+            if alive and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._drain, name='error-reporter', daemon=True
+            )
+            self._thread.start()
+
+    def _drain(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for payload in batch:
+                self._post(payload)
+            with self._lock:
+                self._overflowing = False
+
+    def _post(self, payload):
+        try:
+            self._send(payload, payload.get('access_token'))
+            self.sent += 1
+        except Exception:
+            logger.exception('Could not post an error report.')
+        finally:
+            self.queue.task_done()
+
+
+_reporter = None
+
+
+def get_reporter():
+    """The reporter of this process, configured from settings."""
+    global _reporter
+    if _reporter is None:
+        _reporter = ErrorReporter(
+            RateLimiter(settings.ERROR_REPORT_RATE_LIMIT,
+                        settings.ERROR_REPORT_RATE_WINDOW),
+            maxsize=settings.ERROR_REPORT_QUEUE_SIZE,
+            batch_size=settings.ERROR_REPORT_BATCH_SIZE,
+        )
+        atexit.register(_reporter.flush)
+    return _reporter
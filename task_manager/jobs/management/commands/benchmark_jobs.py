@@ -0,0 +1,50 @@
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connections
+from task_manager.jobs.queue import Worker, enqueue
+
+QUEUE = 'benchmark'
+
+
+def noop(number):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Measure job queue throughput: enqueue jobs one by one, then '
+            'drain them with concurrent workers.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=10)
+
+    def handle(self, *args, jobs, concurrency, batch_size, **options):
+        start = time.perf_counter()
+        for number in range(jobs):
+            enqueue(noop, number, queue=QUEUE)
+        self.report('enqueue', jobs, time.perf_counter() - start)
+
+        workers = [Worker(QUEUE, batch_size) for _ in range(concurrency)]
+        threads = [threading.Thread(target=self.drain, args=(worker,))
+                   for worker in workers]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done = sum(worker.done for worker in workers)
+        self.report(f'dequeue ({concurrency} workers)', done,
+                    time.perf_counter() - start)
+
+    @staticmethod
+    def drain(worker):
+        try:
+            worker.run(burst=True)
+        finally:
+            connections.close_all()
+
+    def report(self, phase, jobs, elapsed):
+        self.stdout.write(f'{phase}: {jobs / elapsed:.0f} jobs/s '
+                          f'({jobs} jobs in {elapsed:.2f}s)')
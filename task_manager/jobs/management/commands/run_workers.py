@@ -0,0 +1,72 @@
+import signal
+import threading
+from contextlib import contextmanager
+from django.core.management.base import BaseCommand
+from django.db import connections
+from task_manager.jobs.queue import DEFAULT_QUEUE, Worker
+
+
+STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+@contextmanager
+def stop_on_signals(stop):
+    """Set ``stop`` on SIGINT and SIGTERM inside the block.
+
+    The previous handlers are put back afterwards. Signal handlers can
+    only be installed from the main thread; elsewhere, e.g. when the
+    command is called from a thread, ``stop`` is left to the caller.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = {signum: signal.signal(signum, lambda *args: stop.set())
+                for signum in STOP_SIGNALS}
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+class Command(BaseCommand):
+    help = 'Run job queue workers until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', default=DEFAULT_QUEUE)
+        parser.add_argument('--concurrency', type=int, default=4,
+                            help='Worker threads, each with its own '
+                                 'database connection.')
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument('--poll-interval', type=float, default=1,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is empty.')
+
+    def handle(self, *args, queue, concurrency, batch_size, poll_interval,
+               burst, **options):
+        stop = threading.Event()
+        workers = [Worker(queue, batch_size, poll_interval)
+                   for _ in range(concurrency)]
+        threads = [threading.Thread(target=self.work,
+                                    args=(worker, stop, burst))
+                   for worker in workers]
+        with stop_on_signals(stop):
+            for thread in threads:
+                thread.start()
+            # Joining with a timeout keeps the main thread able to take
+            # signals.
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(0.5)
+        self.stdout.write(
+            f'{sum(worker.done for worker in workers)} jobs done, '
+            f'{sum(worker.failed for worker in workers)} failed.'
+        )
+
+    @staticmethod
+    def work(worker, stop, burst):
+        try:
+            worker.run(stop, burst)
+        finally:
+            connections.close_all()
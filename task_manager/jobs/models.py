@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A call of ``task`` waiting to run.
+
+    ``run_at`` doubles as the lease: a worker claiming the job pushes it
+    into the future, so the job comes back if the worker dies.
+    """
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    queue = models.CharField(max_length=50, default='default')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['queue', 'run_at'],
+                         name='job_queue_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task} #{self.pk}'
+
+
+class DeadJob(models.Model):
+    """A job that failed max_attempts times, kept for inspection."""
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    queue = models.CharField(max_length=50)
+    attempts = models.IntegerField()
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.task} #{self.pk}'
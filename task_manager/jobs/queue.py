@@ -0,0 +1,133 @@
+"""A small job queue kept in the database.
+
+enqueue() stores a call of an importable function; workers started by
+``manage.py run_workers`` claim due jobs with SELECT ... FOR UPDATE SKIP
+LOCKED, so any number of them can share a queue. A job that raises is
+retried with exponential backoff and moves to DeadJob once it has used
+up its attempts.
+
+Jobs are written in the caller's transaction: they run only if it
+commits. A job runs at least once; if the worker dies or loses the
+database before recording the outcome, the job runs again.
+"""
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import DeadJob, Job
+
+logger = logging.getLogger('task_manager.jobs')
+
+DEFAULT_QUEUE = 'default'
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 10
+BACKOFF_MAX = 60 * 60
+# How long a claimed job stays hidden from other workers.
+LEASE = timedelta(minutes=5)
+
+
+def task_path(task):
+    if isinstance(task, str):
+        return task
+    return f'{task.__module__}.{task.__qualname__}'
+
+
+def enqueue(task, *args, queue=DEFAULT_QUEUE, delay=None,
+            max_attempts=MAX_ATTEMPTS, **kwargs):
+    """Queue ``task(*args, **kwargs)``; the arguments must be JSON.
+
+    ``task`` is a module-level function or its dotted path. Its keyword
+    arguments cannot be named like the options of enqueue.
+    """
+    return Job.objects.create(
+        task=task_path(task), args=list(args), kwargs=kwargs, queue=queue,
+        run_at=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts,
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before another attempt: 10s, 20s, 40s ... 1h."""
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+class Worker:
+    def __init__(self, queue=DEFAULT_QUEUE, batch_size=10, poll_interval=1):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.done = self.failed = 0
+
+    def claim(self):
+        """Lease a batch of due jobs that no other worker holds."""
+        now = timezone.now()
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(queue=self.queue, run_at__lte=now)
+                .order_by('run_at')[:self.batch_size]
+            )
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                run_at=now + LEASE, attempts=F('attempts') + 1
+            )
+        for job in jobs:
+            job.attempts += 1
+        return jobs
+
+    def perform(self, job):
+        try:
+            import_string(job.task)(*job.args, **job.kwargs)
+        except Exception:
+            self.failed += 1
+            self.retry(job, traceback.format_exc())
+        else:
+            self.done += 1
+            Job.objects.filter(pk=job.pk).delete()
+
+    @staticmethod
+    def retry(job, error):
+        if job.attempts < job.max_attempts:
+            logger.warning('%s failed, attempt %d of %d', job,
+                           job.attempts, job.max_attempts)
+            Job.objects.filter(pk=job.pk).update(
+                last_error=error,
+                run_at=timezone.now() + timedelta(
+                    seconds=retry_delay(job.attempts)
+                ),
+            )
+            return
+        logger.error('%s failed for good:\n%s', job, error)
+        with transaction.atomic():
+            DeadJob.objects.create(
+                task=job.task, args=job.args, kwargs=job.kwargs,
+                queue=job.queue, attempts=job.attempts, last_error=error,
+                created_at=job.created_at,
+            )
+            Job.objects.filter(pk=job.pk).delete()
+
+    def run_once(self):
+        """Run one batch; return the number of jobs claimed."""
+        jobs = self.claim()
+        for job in jobs:
+            self.perform(job)
+        return len(jobs)
+
+    def run(self, stop=None, burst=False):
+        """Work until ``stop`` is set, or the queue is empty with burst."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                if self.run_once():
+                    continue
+                if burst:
+                    break
+            except DatabaseError:
+                # A job whose outcome was not saved runs again once its
+                # lease expires.
+                logger.exception('Job queue %s is unavailable', self.queue)
+            stop.wait(self.poll_interval)
@@ -0,0 +1,9 @@
+from django.core.cache import cache
+
+
+def record(value, key='recorded'):
+    cache.set(key, cache.get(key, []) + [value])
+
+
+def fail():
+    raise ValueError('boom')
@@ -0,0 +1,115 @@
+import io
+import signal
+import threading
+from datetime import timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from task_manager.jobs.management.commands.run_workers import (
+    STOP_SIGNALS,
+    stop_on_signals,
+)
+from task_manager.jobs.models import DeadJob, Job
+from task_manager.jobs.queue import LEASE, Worker, enqueue, retry_delay
+from .functions import fail, record
+
+
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        # The test transaction leaves autocommit off, which makes
+        # close_old_connections() close the connection; the test client
+        # disconnects it for the same reason.
+        patcher = mock.patch('task_manager.jobs.queue.close_old_connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_enqueue_and_run(self):
+        job = enqueue(record, 1, key='numbers')
+        enqueue('task_manager.jobs.tests.functions.record', 2, key='numbers')
+        self.assertEqual(job.task, 'task_manager.jobs.tests.functions.record')
+        Worker().run(burst=True)
+        self.assertEqual(cache.get('numbers'), [1, 2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_delayed_and_other_queues_wait(self):
+        enqueue(record, 1, delay=timedelta(minutes=1))
+        enqueue(record, 2, queue='mail')
+        Worker().run(burst=True)
+        self.assertIsNone(cache.get('recorded'))
+        Worker('mail').run(burst=True)
+        self.assertEqual(cache.get('recorded'), [2])
+
+    def test_claimed_jobs_are_leased(self):
+        enqueue(record, 1)
+        worker = Worker()
+        [job] = worker.claim()
+        self.assertEqual(worker.claim(), [])
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now() + LEASE / 2)
+
+    def test_failures_back_off_then_go_to_dead_letter(self):
+        job = enqueue(fail, max_attempts=2)
+        worker = Worker()
+        with self.assertLogs('task_manager.jobs', 'WARNING'):
+            worker.run_once()
+        job.refresh_from_db()
+        self.assertIn('ValueError: boom', job.last_error)
+        self.assertGreater(job.run_at, timezone.now())
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('task_manager.jobs', 'ERROR'):
+            worker.run_once()
+        self.assertFalse(Job.objects.exists())
+        dead = DeadJob.objects.get()
+        self.assertEqual((dead.task, dead.attempts), (job.task, 2))
+        self.assertEqual(worker.failed, 2)
+
+    def test_retry_delay(self):
+        self.assertEqual([retry_delay(attempt) for attempt in (1, 2, 3)],
+                         [10, 20, 40])
+        self.assertEqual(retry_delay(30), 60 * 60)
+
+    def test_rolled_back_enqueue_is_dropped(self):
+        try:
+            with transaction.atomic():
+                enqueue(record, 1)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(Job.objects.exists())
+
+
+class RunWorkersTest(TransactionTestCase):
+
+    def test_burst(self):
+        cache.clear()
+        for number in range(25):
+            enqueue(record, number)
+        out = io.StringIO()
+        call_command('run_workers', '--burst', '--concurrency', '1',
+                     stdout=out)
+        self.assertEqual(sorted(cache.get('recorded')), list(range(25)))
+        self.assertIn('25 jobs done, 0 failed.', out.getvalue())
+
+    def test_signal_handlers_are_restored(self):
+        before = [signal.getsignal(signum) for signum in STOP_SIGNALS]
+        stop = threading.Event()
+        with stop_on_signals(stop):
+            signal.raise_signal(signal.SIGTERM)
+        self.assertTrue(stop.is_set())
+        self.assertEqual([signal.getsignal(signum)
+                          for signum in STOP_SIGNALS], before)
+
+    def test_from_another_thread(self):
+        out = io.StringIO()
+        thread = threading.Thread(target=call_command, args=(
+            'run_workers', '--burst', '--concurrency', '1',
+        ), kwargs={'stdout': out})
+        thread.start()
+        thread.join()
+        self.assertIn('0 jobs done, 0 failed.', out.getvalue())
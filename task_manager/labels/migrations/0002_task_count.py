@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='label',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
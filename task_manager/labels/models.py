@@ -4,6 +4,9 @@ from django.db import models
 class Label(models.Model):
     name = models.CharField(max_length=150)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Number of tasks using this row, kept up to date by the signals in
+    # task_manager.tasks.signals; see reconcile_task_counters for repairs.
+    task_count = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -8,6 +8,8 @@ from ..views import (
     LabelUpdateView
 )
 from task_manager.labels.forms import LabelForm
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.models import Task
 from .mixins import (
     LabelsCreationFormTestMixin,
     LabelsViewsTestMixin
@@ -168,6 +170,17 @@ class LabelsViewsTest(LabelsViewsTestMixin, TestCase):
         self.assertEqual(self.labels.count(), 1)
         self.assertRedirects(response, self.labels_url)
 
+    def test_label_in_use_delete_POST(self):
+        status = Statuses.objects.create(name='open')
+        Task.objects.create(name='labelled', status=status,
+                            author=self.user).labels.add(1)
+        # A drifted counter must not let a label in use go.
+        self.labels.filter(pk=1).update(task_count=0)
+        self.client.force_login(self.user)
+        response = self.client.post(self.label_delete_url)
+        self.assertTrue(self.labels.filter(pk=1).exists())
+        self.assertRedirects(response, self.labels_url)
+
     def test_anonym_user_label_delete_POST(self):
         self.assertEqual(self.labels.count(), 2)
         response = self.client.post(self.label_delete_url)
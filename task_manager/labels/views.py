@@ -1,6 +1,7 @@
 from .models import Label
 from django.urls import reverse_lazy
 from task_manager.access_mixins import LoginRequireMixin
+from task_manager.view_mixins import ConditionalGetMixin
 from .forms import LabelForm
 from django.views.generic import ListView
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
@@ -16,9 +17,12 @@ class LabelAbstractMixin(LoginRequireMixin):
     form_class = LabelForm
 
 
-class LabelIndexView(LabelAbstractMixin, ListView):
+class LabelIndexView(LabelAbstractMixin, ConditionalGetMixin, ListView):
     template_name = 'labels/index.html'
     context_object_name = 'labels'
+    # The task counts change with the tasks.
+    version_tables = ('labels', 'tasks')
+    read_from_replica = True
 
 
 class LabelCreateView(LabelAbstractMixin, CreateView):
@@ -36,7 +40,10 @@ class LabelDeleteView(LoginRequireMixin, DeleteView):
     template_name = 'labels/delete.html'
 
     def post(self, request, *args, **kwargs):
-        if self.get_object().tasks.exists():
+        label = self.get_object()
+        # The label links are not protected, so a zero task_count, which
+        # may have drifted, is confirmed against the tasks.
+        if label.task_count or label.tasks.exists():
             messages.error(
                 self.request,
                 _('Cannot delete labels because it is in use.'))
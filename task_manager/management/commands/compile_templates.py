@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from task_manager.template_warmup import compile_templates, project_templates
+
+
+class Command(BaseCommand):
+    help = ('Compile every template in task_manager/templates and report '
+            'the ones that fail.')
+
+    def handle(self, *args, **options):
+        errors = compile_templates()
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'{len(errors)} templates do not compile.')
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(list(project_templates()))} templates compiled.'
+        ))
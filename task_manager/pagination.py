@@ -0,0 +1,189 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import QueryDict
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(direction, values):
+    raw = json.dumps([direction, values], default=_encode_value)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if direction not in ('n', 'p') or not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return direction, values
+
+
+def normalize_ordering(ordering):
+    """Return ordering as (field, descending) pairs ending in a unique key."""
+    keys = [(name.lstrip('-'), name.startswith('-'))
+            for name in map(str, ordering or ())]
+    if not any(name in ('pk', 'id') for name, _ in keys):
+        keys.append(('pk', keys[-1][1] if keys else False))
+    return keys
+
+
+def keyset_filter(keys, values, forward=True, inclusive=False):
+    """Build the lexicographic "row comes after/before values" condition."""
+    condition = Q()
+    for index, (name, descending) in enumerate(keys):
+        lookup = 'gt' if forward != descending else 'lt'
+        if inclusive and index == len(keys) - 1:
+            lookup += 'e'
+        term = Q(**{f'{name}__{lookup}': values[index]})
+        for position in range(index):
+            term &= Q(**{keys[position][0]: values[position]})
+        condition |= term
+    return condition
+
+
+def _resolve(obj, path):
+    for attr in path.split('__'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class KeysetPage:
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        last = self.object_list[len(self.object_list) - 1]
+        return self.paginator.cursor_for(last, 'n')
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        if not self.object_list:
+            _, values = decode_cursor(self.paginator.cursor)
+            return encode_cursor('p', values)
+        return self.paginator.cursor_for(self.object_list[0], 'p')
+
+    @property
+    def next_query(self):
+        return self.paginator.querystring(self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self.paginator.querystring(self.previous_cursor)
+
+
+class KeysetPaginator:
+    """Cursor pagination over a queryset ordered by a unique key.
+
+    Each page is fetched with a ``WHERE key > cursor LIMIT n`` query, so
+    the cost does not depend on how deep the page is and rows inserted
+    while a user is paging never shift the following pages.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None, params=None,
+                 cursor_kwarg='cursor'):
+        self.keys = normalize_ordering(
+            ordering or queryset.query.order_by or ['pk']
+        )
+        self.queryset = queryset.order_by(*(
+            ('-' if descending else '') + name
+            for name, descending in self.keys
+        ))
+        self.per_page = int(per_page)
+        self.params = params if params is not None else QueryDict()
+        self.cursor_kwarg = cursor_kwarg
+        self.cursor = None
+
+    def row_values(self, obj):
+        return [_resolve(obj, name) for name, _ in self.keys]
+
+    def cursor_for(self, obj, direction):
+        return encode_cursor(direction, self.row_values(obj))
+
+    def querystring(self, cursor):
+        params = self.params.copy()
+        params.setlist(self.cursor_kwarg, [cursor] if cursor else [])
+        return params.urlencode()
+
+    def _start_queryset(self, cursor):
+        direction, values = decode_cursor(cursor)
+        if len(values) != len(self.keys):
+            raise InvalidCursor(cursor)
+        if direction == 'n':
+            return self.queryset.filter(keyset_filter(self.keys, values))
+        # Walk back one page on the (cheap) key columns only, then serve
+        # the page forwards from there so ordering stays the same.
+        boundary = list(self.queryset.filter(
+            keyset_filter(self.keys, values, forward=False)
+        ).reverse().values_list(
+            *(name for name, _ in self.keys)
+        )[:self.per_page])
+        if not boundary:
+            return None
+        return self.queryset.filter(
+            keyset_filter(self.keys, list(boundary[-1]), inclusive=True)
+        )
+
+    def _start(self, cursor):
+        try:
+            return self._start_queryset(cursor)
+        except (ValidationError, ValueError, TypeError):
+            # Values that do not fit the current ordering, e.g. a cursor
+            # taken under another sort order.
+            raise InvalidCursor(cursor)
+
+    def _exists_beyond(self, obj, forward=True):
+        return self.queryset.filter(keyset_filter(
+            self.keys, self.row_values(obj), forward=forward
+        )).exists()
+
+    def page(self, cursor=None):
+        self.cursor = cursor
+        queryset = self._start(cursor) if cursor else None
+        started = queryset is not None
+        object_list = (queryset if started else self.queryset)[:self.per_page]
+        rows = len(object_list)
+        has_next = (rows == self.per_page
+                    and self._exists_beyond(object_list[rows - 1]))
+        has_previous = started and (
+            not rows or self._exists_beyond(object_list[0], forward=False)
+        )
+        return KeysetPage(self, object_list, has_next, has_previous)
@@ -0,0 +1,64 @@
+"""Read-replica routing of read-only views.
+
+Views with ``read_from_replica = True`` read from the replica database
+when serving GET and HEAD requests. A request that writes pins its
+browser to the primary for REPLICA_PIN_SECONDS with a cookie, so the page
+it redirects to shows the write even while the replica lags behind.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from task_manager.db.router import REPLICA, current_state, routing
+
+PIN_COOKIE = 'pin_primary'
+READ_METHODS = ('GET', 'HEAD')
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with routing() as state:
+            response = self.get_response(request)
+        return self.pin(response, state)
+
+    async def __acall__(self, request):
+        with routing() as state:
+            response = await self.get_response(request)
+        return self.pin(response, state)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        current_state().use_replica = (
+            replica_configured()
+            and request.method in READ_METHODS
+            and getattr(view_class, 'read_from_replica', False)
+            and PIN_COOKIE not in request.COOKIES
+        )
+
+    async def aprocess_view(self, request, view_func, view_args,
+                            view_kwargs):
+        self.process_view(request, view_func, view_args, view_kwargs)
+
+    @staticmethod
+    def pin(response, state):
+        if state.wrote and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -1,7 +1,15 @@
 from rollbar.contrib.django.middleware import RollbarNotifierMiddleware
 
+from task_manager.error_reporting import get_reporter
+
 
 class CustomRollbarNotifierMiddleware(RollbarNotifierMiddleware):
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        # Reports are queued and posted in the background,
+        # see task_manager/error_reporting.py.
+        get_reporter().install()
+
     def get_extra_data(self, request, exc):
         extra_data = dict()
         extra_data = {
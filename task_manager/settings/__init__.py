@@ -0,0 +1,21 @@
+"""Settings of the profile named by the DJANGO_ENV environment variable.
+
+``dev`` (the default) is for local work and the test suite, ``prod`` for
+deployments.
+"""
+import os
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'dev')
+
+if DJANGO_ENV == 'prod':
+    from .prod import *  # noqa: F403
+elif DJANGO_ENV == 'dev':
+    from .dev import *  # noqa: F403
+else:
+    raise ImproperlyConfigured(
+        f"Unknown DJANGO_ENV '{DJANGO_ENV}', use 'dev' or 'prod'."
+    )
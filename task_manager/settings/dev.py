@@ -0,0 +1,8 @@
+import os
+from .base import *  # noqa: F401,F403
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+# Time every request locally, see task_manager/timing_middleware.py.
+REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'true') == 'true'
@@ -0,0 +1,36 @@
+import os
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, CACHES, DATABASES, ROLLBAR
+
+DEBUG = False
+
+# Shared by the worker processes of one instance, which is what the table
+# versions in task_manager/cache_versions.py need. Point CACHE_BACKEND at
+# memcached or redis when running several instances.
+CACHES = {'default': {
+    **CACHES['default'],
+    'BACKEND': os.getenv('CACHE_BACKEND',
+                         'django.core.cache.backends.filebased.FileBasedCache'),
+    'LOCATION': os.getenv('CACHE_LOCATION', '/tmp/task-manager-cache'),
+}}
+
+# Keep connections open between requests, and check a reused connection
+# before the request runs so that one dropped by the server is replaced.
+# A pooled database returns its connections to the pool instead.
+DATABASES = {alias: {**database, 'CONN_HEALTH_CHECKS': True}
+             for alias, database in DATABASES.items()}
+for database in DATABASES.values():
+    if 'POOL' not in database:
+        database['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', 600))
+
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+ROLLBAR = {**ROLLBAR, 'environment': 'production'}
@@ -0,0 +1,91 @@
+import importlib.util
+from types import SimpleNamespace
+from unittest import mock
+from django.conf import settings
+from django.core import checks
+from django.test import SimpleTestCase, override_settings
+from task_manager.settings import BASE_DIR, prod
+
+
+def performance_warnings():
+    return [warning.id for warning in checks.run_checks(
+        tags=['performance'], include_deployment_checks=True
+    )]
+
+
+class PerformanceSettingsTest(SimpleTestCase):
+
+    def test_only_run_with_deploy(self):
+        self.assertEqual(checks.run_checks(tags=['performance']), [])
+
+    @override_settings(
+        DEBUG=True,
+        CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }},
+        TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'OPTIONS': {'loaders': [
+                'django.template.loaders.app_directories.Loader',
+            ]},
+        }],
+        STORAGES={'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage'
+                       '.StaticFilesStorage',
+        }},
+    )
+    @mock.patch.dict(settings.DATABASES, clear=True, values={
+        'default': {'CONN_MAX_AGE': 0},
+        'replica': {'CONN_MAX_AGE': 60},
+    })
+    def test_misconfiguration_is_reported(self):
+        self.assertEqual(performance_warnings(), [
+            'task_manager.W001',
+            'task_manager.W002',
+            'task_manager.W003',
+            'task_manager.W004',
+            'task_manager.W005',
+            'task_manager.W006',
+        ])
+
+    def test_prod_profile_passes(self):
+        profile = {name: getattr(prod, name) for name in (
+            'DEBUG', 'CACHES', 'TEMPLATES', 'STORAGES',
+        )}
+        with override_settings(**profile), mock.patch.dict(
+            settings.DATABASES, prod.DATABASES, clear=True
+        ):
+            self.assertEqual(performance_warnings(), [])
+
+    def test_prod_profile_times_on_request_only(self):
+        self.assertFalse(prod.REQUEST_TIMING_ENABLED)
+
+
+def gunicorn_config():
+    spec = importlib.util.spec_from_file_location(
+        'gunicorn_config', BASE_DIR / 'gunicorn.conf.py'
+    )
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config
+
+
+class GunicornConfigTest(SimpleTestCase):
+
+    def start(self, workers):
+        server = SimpleNamespace(cfg=SimpleNamespace(workers=workers),
+                                 log=mock.Mock())
+        gunicorn_config().on_starting(server)
+        return server
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }})
+    def test_workers_need_a_shared_cache(self):
+        self.start(1)
+        with self.assertRaises(SystemExit):
+            self.start(4)
+
+    def test_prod_cache_is_shared(self):
+        with override_settings(CACHES=prod.CACHES):
+            self.assertFalse(self.start(4).log.error.called)
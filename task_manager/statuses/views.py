@@ -5,8 +5,10 @@ from django.urls import reverse_lazy
 from .models import Statuses
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from task_manager.access_mixins import LoginRequireMixin
+from task_manager.view_mixins import ConditionalGetMixin
 from django.views.generic import ListView
 from django.shortcuts import redirect
+from django.db.models import ProtectedError
 
 
 class StatusAbstractMixin(LoginRequireMixin):
@@ -16,9 +18,12 @@ class StatusAbstractMixin(LoginRequireMixin):
     form_class = StatusForm
 
 
-class StatusIndexView(StatusAbstractMixin, ListView):
+class StatusIndexView(StatusAbstractMixin, ConditionalGetMixin, ListView):
     template_name = 'statuses/index.html'
     context_object_name = 'statuses'
+    # The task counts change with the tasks.
+    version_tables = ('statuses', 'tasks')
+    read_from_replica = True
 
 
 class StatusCreateView(StatusAbstractMixin, CreateView):
@@ -46,12 +51,19 @@ class StatusDeleteView(LoginRequireMixin, DeleteView):
     success_message = _('Status has been deleted successfully.')
 
     def post(self, request, *args, **kwargs):
-        if self.get_object().tasks.exists():
-            messages.error(
-                self.request,
-                _('Cannot delete status because it is in use.'))
-            return redirect('statuses')
-        return super().post(request, *args, **kwargs)
+        if self.get_object().task_count:
+            return self.in_use()
+        try:
+            return super().post(request, *args, **kwargs)
+        except ProtectedError:
+            # The counter drifted; the foreign key still protects the row.
+            return self.in_use()
+
+    def in_use(self):
+        messages.error(
+            self.request,
+            _('Cannot delete status because it is in use.'))
+        return redirect('statuses')
 
     def get_success_url(self):
         messages.success(self.request,
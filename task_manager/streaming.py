@@ -0,0 +1,44 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+CHUNK_BYTES = 64 * 1024
+
+
+def buffered(lines, size=CHUNK_BYTES):
+    """Group small text lines into chunks of roughly ``size`` bytes."""
+    buffer, buffered_bytes = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        buffered_bytes += len(data)
+        if buffered_bytes >= size:
+            yield b''.join(buffer)
+            buffer, buffered_bytes = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+async def aiterate(iterator):
+    """Drive a blocking iterator from the event loop, one chunk per hop.
+
+    Every step runs in the thread-sensitive executor, so database cursors
+    opened by the iterator stay on the thread that owns the connection.
+    """
+    iterator = iter(iterator)
+    done = object()
+    fetch = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await fetch(iterator, done)) is not done:
+        yield chunk
+
+
+def stream_response(request, lines, content_type, filename=None):
+    chunks = buffered(lines)
+    if isinstance(request, ASGIRequest):
+        # Handing Django a sync iterator under ASGI makes it read the whole
+        # body into memory first.
+        chunks = aiterate(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
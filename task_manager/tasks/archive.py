@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.utils import timezone
+from task_manager.cache_versions import touch
+from .models import Task
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def archivable(status_ids, before):
+    """Live tasks in one of ``status_ids`` not changed since ``before``."""
+    return Task.objects.live().filter(status__in=status_ids,
+                                      updated_at__lt=before)
+
+
+def archive_batches(status_ids, before, batch_size=ARCHIVE_BATCH_SIZE):
+    """Archive the archivable() tasks a batch at a time, in pk order.
+
+    Each batch is its own short transaction and yields the number of tasks
+    it archived. Rows locked by a concurrent edit are skipped rather than
+    waited for and left to the next run; archived tasks drop out of
+    archivable(), so an interrupted run simply resumes where it stopped.
+    """
+    tasks, last = archivable(status_ids, before), 0
+    while True:
+        with transaction.atomic():
+            pks = list(tasks.filter(pk__gt=last).order_by('pk').values_list(
+                'pk', flat=True
+            ).select_for_update(skip_locked=True)[:batch_size])
+            if not pks:
+                return
+            archived = Task.objects.filter(pk__in=pks).update(
+                archived_at=timezone.now()
+            )
+            touch('tasks')
+        last = pks[-1]
+        yield archived
@@ -0,0 +1,59 @@
+from collections import defaultdict
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from task_manager.pagination import KeysetPaginator
+
+BOARD_CARDS = 10
+# Cards are ordered like the task list; "load more" pages through the
+# rest of a column with a keyset cursor on the same keys.
+BOARD_ORDERING = ['created_at', 'pk']
+
+
+class BoardColumn:
+    def __init__(self, status_id, name, total, cards, next_query=None):
+        self.status_id = status_id
+        self.name = name
+        self.total = total
+        self.cards = cards
+        # Query string of the column page that follows the cards.
+        self.next_query = next_query
+
+    @property
+    def has_more(self):
+        return self.total > len(self.cards)
+
+
+def board_cards(queryset, per_column=BOARD_CARDS):
+    """The first ``per_column`` tasks of every status, in one query.
+
+    ROW_NUMBER() numbers the tasks within their status and a second
+    window counts the whole partition, so each card also carries the
+    size of its column.
+    """
+    return queryset.annotate(
+        position=Window(RowNumber(), partition_by=F('status'),
+                        order_by=[F(name).asc() for name in BOARD_ORDERING]),
+        column_total=Window(Count('pk'), partition_by=F('status')),
+    ).filter(position__lte=per_column).order_by('status', 'position')
+
+
+def board_columns(queryset, statuses, params=None, per_column=BOARD_CARDS):
+    """Group the cards into a column per ``(pk, name)`` status.
+
+    ``params`` are the query parameters the "load more" links keep.
+    """
+    cards, totals = defaultdict(list), {}
+    for task in board_cards(queryset, per_column):
+        cards[task.status_id].append(task)
+        totals[task.status_id] = task.column_total
+    paginator = KeysetPaginator(queryset, per_column,
+                                ordering=BOARD_ORDERING, params=params)
+    columns = []
+    for pk, name in statuses:
+        column = BoardColumn(pk, name, totals.get(pk, 0), cards[pk])
+        if column.has_more:
+            column.next_query = paginator.querystring(
+                paginator.cursor_for(column.cards[-1], 'n')
+            )
+        columns.append(column)
+    return columns
@@ -0,0 +1,326 @@
+from collections import Counter
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from task_manager.cache_versions import touch
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from . import history
+from .counters import (
+    apply_counts,
+    apply_rollup,
+    count_created,
+    count_deleted,
+    count_moved,
+    grouped,
+)
+from .models import ExecutorRollup, Task
+
+BATCH_FIELDS = ('id', 'name', 'description', 'status', 'executor', 'labels')
+# An edit brings an archived task back, like TaskUpdateView.
+UPDATED_FIELDS = ['name', 'description', 'status', 'executor', 'updated_at',
+                  'archived_at']
+# Checked against the ids loaded up front rather than by the model.
+REFERENCES = ['status', 'author', 'executor', 'search_vector']
+# Tasks per statement of a bulk action, within the query parameter limit
+# of every backend.
+ACTION_CHUNK_SIZE = 500
+
+
+def _to_python(key, value):
+    if key not in BATCH_FIELDS:
+        raise ValidationError(_('Unknown field.'))
+    if key != 'labels':
+        return Task._meta.get_field(key).to_python(value)
+    if not isinstance(value, list):
+        raise ValidationError(
+            forms.ModelMultipleChoiceField.default_error_messages[
+                'invalid_list'
+            ]
+        )
+    return list(dict.fromkeys(map(Label._meta.pk.to_python, value)))
+
+
+def _parse(item):
+    """Convert the values of one item, or raise ValidationError."""
+    if not isinstance(item, dict):
+        raise ValidationError({NON_FIELD_ERRORS: _('Expected an object.')})
+    parsed, errors = {}, {}
+    for key, value in item.items():
+        try:
+            parsed[key] = _to_python(key, value)
+        except ValidationError as error:
+            errors[key] = error.messages
+    if errors:
+        raise ValidationError(errors)
+    return parsed
+
+
+def _existing(queryset, values):
+    return set(queryset.filter(pk__in=values).values_list('pk', flat=True))
+
+
+class TaskBatch:
+    """Create and update many tasks in one transaction.
+
+    Items are dicts of task fields. An item with an ``id`` updates that
+    task and only touches the fields it carries; the others create tasks
+    authored by ``author``. The updated tasks, the referenced statuses,
+    users and labels and the clashing names are loaded with one query
+    each, whatever the size of the batch, and the writes are bulk
+    statements. One invalid item fails the whole batch: ``errors`` then
+    maps item indexes to ``{field: [messages]}``.
+    """
+
+    def __init__(self, author, items):
+        self.author = author
+        self.items = items
+        self.errors = {}
+        self.tasks = []
+
+    def run(self):
+        try:
+            with transaction.atomic():
+                self.validate()
+                if not self.errors:
+                    self.write()
+        except IntegrityError:
+            # A concurrent writer took one of the names after the check.
+            self.errors[NON_FIELD_ERRORS] = [
+                _('The tasks changed while saving, try again.')
+            ]
+            self.tasks = []
+        return self
+
+    def validate(self):
+        parsed = self.each_item(_parse, enumerate(self.items))
+        self.load(list(parsed.values()))
+        self.tasks = list(self.each_item(self.build, parsed.items()).values())
+
+    def each_item(self, function, items):
+        """Map ``function`` over ``(index, item)`` pairs.
+
+        Returns the results by index; failing items are left out and
+        their errors recorded.
+        """
+        results = {}
+        for index, item in items:
+            try:
+                results[index] = function(item)
+            except ValidationError as error:
+                self.errors[index] = error.message_dict
+        return results
+
+    def load(self, parsed):
+        def collect(key):
+            return {values[key] for values in parsed
+                    if values.get(key) is not None}
+
+        self.updated = Task.objects.select_for_update().in_bulk(
+            collect('id')
+        )
+        self.previous = {pk: (task.status_id, task.executor_id)
+                         for pk, task in self.updated.items()}
+        self.before = history.snapshots(list(self.updated))
+        self.statuses = _existing(Statuses.objects, collect('status'))
+        self.users = _existing(get_user_model().objects, collect('executor'))
+        self.labels = _existing(Label.objects, {
+            label for values in parsed for label in values.get('labels', ())
+        })
+        self.names = dict(Task.objects.filter(
+            name__in=collect('name')
+        ).values_list('name', 'pk'))
+        self.seen_names = set()
+        self.seen_ids = set()
+
+    def build(self, values):
+        """Return (task, label ids or None) for parsed item values."""
+        task = self.get_task(values.get('id'))
+        for key in ('name', 'description', 'status', 'executor'):
+            if key in values:
+                setattr(task, Task._meta.get_field(key).attname, values[key])
+        errors = self.check_references(values)
+        try:
+            task.clean_fields(exclude=REFERENCES)
+        except ValidationError as error:
+            errors.update(error.message_dict)
+        errors.update(self.check_name(task))
+        if errors:
+            raise ValidationError(errors)
+        return task, values.get('labels')
+
+    def get_task(self, pk):
+        if pk is None:
+            return Task(author=self.author)
+        if pk not in self.updated:
+            raise ValidationError({'id': [
+                forms.ModelChoiceField.default_error_messages['invalid_choice']
+            ]})
+        if pk in self.seen_ids:
+            raise ValidationError({'id': [
+                _('This task is already in the batch.')
+            ]})
+        self.seen_ids.add(pk)
+        return self.updated[pk]
+
+    def check_references(self, values):
+        """Check the statuses, users and labels an item refers to."""
+        invalid = forms.ModelChoiceField.default_error_messages[
+            'invalid_choice'
+        ]
+        errors = {}
+        if values.get('id') is None and values.get('status') is None:
+            errors['status'] = [forms.Field.default_error_messages['required']]
+        elif 'status' in values and values['status'] not in self.statuses:
+            errors['status'] = [invalid]
+        if values.get('executor') not in self.users | {None}:
+            errors['executor'] = [invalid]
+        unknown = [label for label in values.get('labels', ())
+                   if label not in self.labels]
+        if unknown:
+            errors['labels'] = [
+                forms.ModelMultipleChoiceField.default_error_messages[
+                    'invalid_choice'
+                ] % {'value': unknown[0]}
+            ]
+        return errors
+
+    def check_name(self, task):
+        owner = self.names.get(task.name, task.pk)
+        if owner != task.pk or task.name in self.seen_names:
+            return {'name': task.unique_error_message(Task, ['name']).messages}
+        self.seen_names.add(task.name)
+        return {}
+
+    def write(self):
+        created = [task for task, labels in self.tasks if task.pk is None]
+        updated = [task for task, labels in self.tasks if task.pk is not None]
+        Task.objects.bulk_create(created)
+        now = timezone.now()
+        for task in updated:
+            task.updated_at = now
+            task.archived_at = None
+        Task.objects.bulk_update(updated, UPDATED_FIELDS)
+        # Labels are counted by write_labels().
+        count_created(created, ())
+        count_moved(updated, self.previous)
+        apply_counts(Label, self.write_labels())
+        history.record(self.author, self.before, history.snapshots(
+            [task.pk for task, labels in self.tasks]
+        ))
+        touch('tasks')
+
+    def write_labels(self):
+        """Replace the links of every task that was given labels.
+
+        Returns the change in task count of each label.
+        """
+        through = Task.labels.through
+        relinked = {task.pk: labels for task, labels in self.tasks
+                    if labels is not None}
+        unlinked = through.objects.filter(task_id__in=[
+            pk for pk in relinked if pk in self.previous
+        ])
+        counts = Counter()
+        counts.subtract(unlinked.values_list('label_id', flat=True))
+        unlinked.delete()
+        through.objects.bulk_create(
+            through(task_id=pk, label_id=label)
+            for pk, labels in relinked.items() for label in labels
+        )
+        counts.update(label for labels in relinked.values()
+                      for label in labels)
+        return counts
+
+
+class TaskBulkAction:
+    """Apply one change to a set of tasks with set-based statements.
+
+    The tasks of ``queryset`` are locked up front, then every action
+    runs an UPDATE, an INSERT or a DELETE per ACTION_CHUNK_SIZE tasks
+    and keeps the counters in step, like the signals would. ``changed``
+    is the number of tasks the action changed out of ``selected``; tasks
+    that already had the value are left alone and only the author of a
+    task may delete it.
+    """
+    actions = ('status', 'executor', 'add_label', 'remove_label', 'delete')
+    # Moved field -> (counted model, how to apply the counts)
+    moves = {
+        'status': (Statuses, apply_counts),
+        'executor': (ExecutorRollup, apply_rollup),
+    }
+
+    def __init__(self, user, queryset):
+        self.user = user
+        self.queryset = queryset
+        self.selected = self.changed = 0
+
+    def run(self, action, value=None):
+        handler = getattr(self, action)
+        self.now = timezone.now()
+        with transaction.atomic():
+            pks = list(dict.fromkeys(
+                self.queryset.select_for_update(of=('self',))
+                .order_by('pk').values_list('pk', flat=True)
+            ))
+            for start in range(0, len(pks), ACTION_CHUNK_SIZE):
+                chunk = pks[start:start + ACTION_CHUNK_SIZE]
+                before = history.snapshots(chunk)
+                self.changed += handler(chunk, value)
+                history.record(self.user, before, history.snapshots(chunk))
+            if self.changed:
+                touch('tasks')
+        self.selected = len(pks)
+        return self
+
+    def edited(self):
+        """The fields every changed task gets; see UPDATED_FIELDS."""
+        return {'updated_at': self.now, 'archived_at': None}
+
+    def move(self, pks, field, value):
+        model, apply = self.moves[field]
+        tasks = Task.objects.filter(pk__in=pks).exclude(**{field: value})
+        moved = grouped(tasks, field)
+        changed = tasks.update(**{field: value}, **self.edited())
+        apply(model, {**{pk: -count for pk, count in moved.items()},
+                      value: changed})
+        return changed
+
+    def status(self, pks, status):
+        return self.move(pks, 'status', status)
+
+    def executor(self, pks, executor):
+        return self.move(pks, 'executor', executor)
+
+    def add_label(self, pks, label):
+        through = Task.labels.through
+        linked = set(through.objects.filter(
+            task_id__in=pks, label_id=label
+        ).values_list('task_id', flat=True))
+        added = [pk for pk in pks if pk not in linked]
+        through.objects.bulk_create(
+            through(task_id=pk, label_id=label) for pk in added
+        )
+        apply_counts(Label, {label: len(added)})
+        return Task.objects.filter(pk__in=added).update(**self.edited())
+
+    def remove_label(self, pks, label):
+        links = Task.labels.through.objects.filter(task_id__in=pks,
+                                                   label_id=label)
+        removed = list(links.values_list('task_id', flat=True))
+        links.delete()
+        apply_counts(Label, {label: -len(removed)})
+        return Task.objects.filter(pk__in=removed).update(**self.edited())
+
+    def delete(self, pks, value=None):
+        tasks = Task.objects.filter(pk__in=pks, author=self.user)
+        count_deleted(tasks)
+        Task.labels.through.objects.filter(task__in=tasks).delete()
+        # tasks.delete() would count every task again in the pre_delete
+        # signal, one task at a time. The links were the only rows
+        # pointing at tasks: TaskEvent.task_id is not a foreign key, and
+        # run() records the deletions from its snapshots.
+        return tasks._raw_delete(tasks.db)
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from task_manager.cache_versions import get_version
+from task_manager.db.router import primary
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+
+CHOICES_TIMEOUT = 60 * 60
+
+
+def _status_choices():
+    return list(Statuses.objects.order_by('pk').values_list('pk', 'name'))
+
+
+def _label_choices():
+    return list(Label.objects.order_by('pk').values_list('pk', 'name'))
+
+
+def _executor_choices():
+    users = get_user_model().objects.order_by('pk').values_list(
+        'pk', 'first_name', 'last_name'
+    )
+    return [(pk, f'{first_name} {last_name}'.strip())
+            for pk, first_name, last_name in users]
+
+
+# choice list name -> (table version it depends on, builder)
+CHOICE_SOURCES = {
+    'statuses': ('statuses', _status_choices),
+    'labels': ('labels', _label_choices),
+    'executors': ('users', _executor_choices),
+}
+
+
+def get_choices(name):
+    table, build = CHOICE_SOURCES[name]
+    key = f'choices:{name}:{get_version(table)}'
+    choices = cache.get(key)
+    if choices is None:
+        with primary():
+            choices = build()
+        cache.set(key, choices, CHOICES_TIMEOUT)
+    return choices
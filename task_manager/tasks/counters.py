@@ -0,0 +1,143 @@
+from collections import Counter, defaultdict
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from .models import DailyRollup, ExecutorRollup, Task
+
+# (counted model, table holding the references, referencing column,
+#  cache_versions table of the counted model)
+COUNTED = (
+    (Statuses, Task, 'status_id', 'statuses'),
+    (Label, Task.labels.through, 'label_id', 'labels'),
+)
+
+
+def apply_counts(model, changes):
+    """Add ``{pk: delta}`` to task_count, one UPDATE per distinct delta."""
+    by_delta = defaultdict(list)
+    for pk, delta in changes.items():
+        if pk is not None and delta:
+            by_delta[delta].append(pk)
+    for delta, pks in by_delta.items():
+        model.objects.filter(pk__in=pks).update(
+            task_count=F('task_count') + delta
+        )
+
+
+def apply_rollup(model, changes):
+    """apply_counts() for rollups, whose rows are created on demand."""
+    model.objects.bulk_create(
+        [model(pk=pk) for pk, delta in changes.items()
+         if pk is not None and delta],
+        ignore_conflicts=True,
+    )
+    apply_counts(model, changes)
+
+
+def created_day(task):
+    return timezone.localdate(task.created_at,
+                              timezone.get_default_timezone())
+
+
+def count_created(tasks, label_ids):
+    """Count tasks written with bulk_create, which sends no signals.
+
+    ``label_ids`` holds the label ids linked to each task.
+    """
+    apply_counts(Statuses, Counter(task.status_id for task in tasks))
+    apply_counts(Label, Counter(
+        label_id for labels in label_ids for label_id in set(labels)
+    ))
+    apply_rollup(ExecutorRollup, Counter(task.executor_id for task in tasks))
+    apply_rollup(DailyRollup, Counter(map(created_day, tasks)))
+
+
+def count_moved(tasks, previous):
+    """Count tasks written with bulk_update.
+
+    ``previous`` maps their pks to their ``(status_id, executor_id)``
+    before the update.
+    """
+    statuses, executors = Counter(), Counter()
+    for task in tasks:
+        status_id, executor_id = previous[task.pk]
+        statuses.update({task.status_id: 1})
+        statuses.subtract({status_id: 1})
+        executors.update({task.executor_id: 1})
+        executors.subtract({executor_id: 1})
+    apply_counts(Statuses, statuses)
+    apply_rollup(ExecutorRollup, executors)
+
+
+def actual_count(source, column):
+    return Coalesce(Subquery(
+        source.objects.filter(**{column: OuterRef('pk')})
+        .order_by().values(column)
+        .annotate(count=Count('*')).values('count')
+    ), 0)
+
+
+def reconcile(model, source, column):
+    """Reset drifted counters from the referencing rows, in bulk.
+
+    Returns the number of rows that were off.
+    """
+    actual = actual_count(source, column)
+    return model.objects.annotate(actual=actual).exclude(
+        task_count=F('actual')
+    ).update(task_count=actual)
+
+
+def grouped(queryset, column):
+    """``{value of column: number of rows}`` for the rows of ``queryset``."""
+    return dict(queryset.order_by().values(column).annotate(count=Count('*'))
+                .values_list(column, 'count'))
+
+
+def _by_day(tasks):
+    day = TruncDate('created_at', tzinfo=timezone.get_default_timezone())
+    return tasks.annotate(day=day)
+
+
+def executor_counts():
+    return grouped(Task.objects.filter(executor__isnull=False), 'executor')
+
+
+def daily_counts():
+    return grouped(_by_day(Task.objects.all()), 'day')
+
+
+def count_deleted(tasks):
+    """Uncount a queryset of tasks deleted without signals."""
+    for model, counts in (
+        (Statuses, grouped(tasks, 'status')),
+        (ExecutorRollup, grouped(tasks, 'executor')),
+        (DailyRollup, grouped(_by_day(tasks), 'day')),
+        (Label, grouped(Label.objects.filter(tasks__in=tasks), 'pk')),
+    ):
+        apply_counts(model, {pk: -count for pk, count in counts.items()})
+
+
+# (rollup model, builder of the actual {pk: count})
+ROLLUPS = (
+    (ExecutorRollup, executor_counts),
+    (DailyRollup, daily_counts),
+)
+
+
+def rebuild(model, actual):
+    """Make the rollup rows match ``actual``, writing only the drifted ones.
+
+    Returns the number of rows that were off.
+    """
+    stored = dict(model.objects.values_list('pk', 'task_count'))
+    stale = [pk for pk, count in stored.items() if pk not in actual]
+    drifted = [model(pk=pk, task_count=count)
+               for pk, count in actual.items() if stored.get(pk) != count]
+    model.objects.filter(pk__in=stale).delete()
+    model.objects.bulk_create(drifted, update_conflicts=True,
+                              unique_fields=[model._meta.pk.name],
+                              update_fields=['task_count'])
+    return len(drifted) + sum(1 for pk in stale if stored[pk])
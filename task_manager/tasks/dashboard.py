@@ -0,0 +1,74 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+from task_manager.cache_versions import get_versions
+from task_manager.db.router import primary
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from .models import DailyRollup, ExecutorRollup
+
+DASHBOARD_DAYS = 30
+DASHBOARD_EXECUTORS = 10
+DASHBOARD_TIMEOUT = 60 * 60
+# Every count comes from a task_count column or a rollup, so the
+# dashboard changes with these tables and never reads tasks_task.
+DASHBOARD_TABLES = ('tasks', 'statuses', 'labels', 'users')
+
+
+def _counts(model):
+    return list(
+        model.objects.order_by('pk').values('id', 'name', 'task_count')
+    )
+
+
+def _executors():
+    rollups = ExecutorRollup.objects.filter(task_count__gt=0).select_related(
+        'executor'
+    ).order_by('-task_count', 'pk')[:DASHBOARD_EXECUTORS]
+    return [{'id': rollup.pk,
+             'name': rollup.executor.get_full_name()
+             or rollup.executor.username,
+             'task_count': rollup.task_count}
+            for rollup in rollups]
+
+
+def _created(today):
+    since = today - timedelta(days=DASHBOARD_DAYS - 1)
+    counts = dict(DailyRollup.objects.filter(day__gte=since)
+                  .values_list('day', 'task_count'))
+    days = (since + timedelta(days=n) for n in range(DASHBOARD_DAYS))
+    return [{'day': day, 'task_count': counts.get(day, 0)} for day in days]
+
+
+def build_dashboard(today):
+    statuses = _counts(Statuses)
+    total = sum(status['task_count'] for status in statuses)
+    assigned = ExecutorRollup.objects.aggregate(
+        assigned=Sum('task_count')
+    )['assigned'] or 0
+    return {
+        'total': total,
+        'statuses': statuses,
+        'labels': _counts(Label),
+        'executors': _executors(),
+        'unassigned': total - assigned,
+        'created': _created(today),
+    }
+
+
+def get_dashboard():
+    """Task statistics, cached until a task, status, label or user changes.
+
+    Days are counted in TIME_ZONE, like DailyRollup.
+    """
+    today = timezone.localdate(timezone=timezone.get_default_timezone())
+    key = ':'.join(map(str, (
+        'dashboard', today, *get_versions(*DASHBOARD_TABLES),
+    )))
+    dashboard = cache.get(key)
+    if dashboard is None:
+        with primary():
+            dashboard = build_dashboard(today)
+        cache.set(key, dashboard, DASHBOARD_TIMEOUT)
+    return dashboard
@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+EXPORT_FIELDS = ('id', 'name', 'description', 'status', 'author',
+                 'executor', 'labels', 'created_at')
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield tasks as flat dicts, reading them through a database cursor."""
+    for task in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            'id': task.pk,
+            'name': task.name,
+            'description': task.description or '',
+            'status': task.status.name,
+            'author': task.author.username,
+            'executor': task.executor.username if task.executor else '',
+            'labels': [label.name for label in task.labels.all()],
+            'created_at': task.created_at.isoformat(),
+        }
+
+
+def csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    def line(row):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    yield line(dict(zip(EXPORT_FIELDS, EXPORT_FIELDS)))
+    for row in rows:
+        yield line({**row, 'labels': ', '.join(row['labels'])})
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (csv_lines, 'text/csv; charset=utf-8'),
+    'jsonl': (jsonl_lines, 'application/x-ndjson; charset=utf-8'),
+}
@@ -4,7 +4,7 @@ from .models import Task
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Statuses
 from django.contrib.auth import get_user_model
-from .forms import CustomChoiceField
+from .forms import CustomChoiceField, TaskFilterForm
 from django.utils.translation import gettext_lazy as _
 
 
@@ -13,6 +13,13 @@ class CustomExecutorFilter(django_filters.Filter):
 
 
 class TaskFilter(django_filters.FilterSet):
+    q = django_filters.CharFilter(
+        label=_('Search'),
+        method='search',
+        widget=forms.TextInput(attrs={'class': 'form-control',
+                                      'type': 'search'})
+    )
+
     executor = CustomExecutorFilter(
         queryset=get_user_model().objects.all(),
         label=_('Executor'),
@@ -41,11 +48,44 @@ class TaskFilter(django_filters.FilterSet):
         method="self_tasks",
     )
 
+    archived = django_filters.BooleanFilter(
+        widget=forms.CheckboxInput(attrs={
+            'class': "form-check-input mr-3"}),
+        label=_("Include archived"),
+        method="include_archived",
+    )
+
     class Meta:
         model = Task
-        fields = ['status', 'executor', 'labels', 'author']
+        fields = ['q', 'status', 'executor', 'labels', 'author', 'archived']
+        form = TaskFilterForm
+
+    @property
+    def qs(self):
+        # Archived tasks are left out unless the toggle is on, also when
+        # nothing is filtered and the filterset is unbound.
+        if not hasattr(self, '_qs'):
+            queryset = super().qs
+            if not self.cleaned('archived'):
+                queryset = queryset.live()
+            # Searched last: whether typos are forgiven depends on what
+            # matches among the tasks left, see TaskQuerySet.search().
+            text = (self.cleaned('q') or '').strip()
+            self._qs = queryset.search(text) if text else queryset
+        return self._qs
+
+    def cleaned(self, name):
+        return self.is_bound and self.form.cleaned_data.get(name)
+
+    def search(self, queryset, name, value):
+        # Applied by qs, after the other filters.
+        return queryset
 
     def self_tasks(self, queryset, name, value):
         if name == 'author' and value:
             return queryset.filter(author__exact=self.request.user)
         return queryset
+
+    def include_archived(self, queryset, name, value):
+        # Applied by qs, after the other filters.
+        return queryset
@@ -2,6 +2,10 @@ from django import forms
 from .models import Task
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from .choices import get_choices
+from .importer import IMPORT_FORMATS
 
 
 class CustomChoiceField(forms.ModelChoiceField):
@@ -9,7 +13,51 @@ class CustomChoiceField(forms.ModelChoiceField):
         return f'{obj.get_full_name()}'
 
 
-class TaskForm(forms.ModelForm):
+class CachedChoiceIterator(forms.models.ModelChoiceIterator):
+    """Yield select options from the choice cache instead of the database.
+
+    The field keeps its queryset, so submitted values are still validated
+    against the current rows.
+    """
+
+    def choices(self):
+        return get_choices(self.field.cached_choices)
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from self.choices()
+
+    def __len__(self):
+        return len(self.choices()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.choices())
+
+
+class CachedChoicesMixin:
+    cached_choices = {
+        'status': 'statuses',
+        'executor': 'executors',
+        'labels': 'labels',
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field_name, source in self.cached_choices.items():
+            field = self.fields.get(field_name)
+            if field is None:
+                continue
+            field.cached_choices = source
+            field.iterator = CachedChoiceIterator
+            field.widget.choices = field.choices
+
+
+class TaskFilterForm(CachedChoicesMixin, forms.Form):
+    pass
+
+
+class TaskForm(CachedChoicesMixin, forms.ModelForm):
     executor = CustomChoiceField(
         queryset=get_user_model().objects.all(),
         label=_('Executor'),
@@ -30,3 +78,97 @@ class TaskForm(forms.ModelForm):
             'status': forms.Select(attrs={'class': 'form-select'}),
             'labels': forms.SelectMultiple(attrs={'class': 'form-select'})
         }
+
+
+class TaskImportForm(forms.Form):
+    file = forms.FileField(
+        label=_('File'),
+        help_text=_('CSV with a header row or JSON Lines with the columns '
+                    'name, description, status, executor, labels.'),
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control',
+                                               'accept': '.csv,.jsonl'})
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        extension = upload.name.rsplit('.', 1)[-1].lower()
+        if extension not in IMPORT_FORMATS:
+            raise forms.ValidationError(
+                _('Upload a .csv or .jsonl file.')
+            )
+        upload.format = extension
+        return upload
+
+
+class TaskBulkForm(CachedChoicesMixin, forms.Form):
+    """An action on the checked tasks or on all tasks the filter matches."""
+    cached_choices = {
+        'status': 'statuses',
+        'executor': 'executors',
+        'label': 'labels',
+    }
+    # Action -> the field holding its value, if it takes one.
+    value_fields = {
+        'status': 'status',
+        'executor': 'executor',
+        'add_label': 'label',
+        'remove_label': 'label',
+        'delete': None,
+    }
+
+    action = forms.ChoiceField(
+        label=_('Action'),
+        choices=[
+            ('status', _('Change status')),
+            ('executor', _('Reassign')),
+            ('add_label', _('Add label')),
+            ('remove_label', _('Remove label')),
+            ('delete', _('Delete')),
+        ],
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    status = forms.ModelChoiceField(
+        queryset=Statuses.objects.all(),
+        label=_('Status'),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    executor = CustomChoiceField(
+        queryset=get_user_model().objects.all(),
+        label=_('Executor'),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    label = forms.ModelChoiceField(
+        queryset=Label.objects.all(),
+        label=_('Label'),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.all(),
+        required=False,
+        widget=forms.MultipleHiddenInput
+    )
+    all_matching = forms.BooleanField(
+        label=_('All tasks matching the filter'),
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        field = self.value_fields.get(cleaned_data.get('action'))
+        # Reassigning to nobody unassigns the tasks.
+        if field in ('status', 'label') and not cleaned_data.get(field):
+            self.add_error(field, forms.Field.default_error_messages[
+                'required'
+            ])
+        if not cleaned_data.get('tasks') and not cleaned_data['all_matching']:
+            raise forms.ValidationError(_('Select some tasks.'))
+        return cleaned_data
+
+    def get_value(self):
+        field = self.value_fields[self.cleaned_data['action']]
+        value = self.cleaned_data.get(field) if field else None
+        return value.pk if value is not None else None
@@ -0,0 +1,195 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone as dt_timezone
+from functools import reduce
+from itertools import groupby
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Task, TaskEvent
+
+TRACKED_FIELDS = ('name', 'description', 'status', 'executor')
+TIMELINE_EVENTS = 50
+
+
+def snapshots(pks):
+    """``{pk: tracked values}`` of the tasks, in two queries."""
+    labels = defaultdict(set)
+    for task_id, label_id in Task.labels.through.objects.filter(
+        task_id__in=pks
+    ).values_list('task_id', 'label_id'):
+        labels[task_id].add(label_id)
+    rows = Task.objects.filter(pk__in=pks).values_list(
+        'pk', 'name', 'description', 'status_id', 'executor_id'
+    )
+    return {pk: {**dict(zip(TRACKED_FIELDS, values)), 'labels': labels[pk]}
+            for pk, *values in rows}
+
+
+def diff(before, after):
+    """The TaskEvent.diff between two snapshots, either may be empty."""
+    changes = {field: [before.get(field), after.get(field)]
+               for field in TRACKED_FIELDS
+               if before.get(field) != after.get(field)}
+    old, new = before.get('labels', set()), after.get('labels', set())
+    if old != new:
+        changes['labels'] = [sorted(old - new), sorted(new - old)]
+    return changes
+
+
+def record(actor, before, after):
+    """Store an event for every task that differs between the snapshots.
+
+    Tasks missing from ``before`` were created, tasks missing from
+    ``after`` were deleted.
+    """
+    events = []
+    for pk in sorted(before.keys() | after.keys()):
+        changes = diff(before.get(pk, {}), after.get(pk, {}))
+        if not changes:
+            continue
+        action = (TaskEvent.CREATED if pk not in before
+                  else TaskEvent.DELETED if pk not in after
+                  else TaskEvent.UPDATED)
+        events.append(TaskEvent(task_id=pk, actor=actor, action=action,
+                                diff=changes))
+    TaskEvent.objects.bulk_create(events)
+
+
+def timeline(task_id):
+    """The latest events of a task, newest first, off the timeline index."""
+    return TaskEvent.objects.filter(task_id=task_id).select_related(
+        'actor'
+    ).order_by('-created_at', '-id')[:TIMELINE_EVENTS]
+
+
+def merge(first, second):
+    """One diff with the effect of two consecutive ones."""
+    merged = {}
+    for field in first.keys() | second.keys():
+        if field == 'labels':
+            removed, added = map(set, first.get(field, [[], []]))
+            then_removed, then_added = map(set, second.get(field, [[], []]))
+            change = [sorted(removed - then_added | then_removed - added),
+                      sorted(added - then_removed | then_added - removed)]
+            if change != [[], []]:
+                merged[field] = change
+            continue
+        old = first[field][0] if field in first else second[field][0]
+        new = second[field][1] if field in second else first[field][1]
+        if old != new:
+            merged[field] = [old, new]
+    return merged
+
+
+def compact(events, batch_size=1000):
+    """Merge runs of one actor's changes to a task on the same day.
+
+    ``events`` are UPDATED events ordered by task and time. The last event
+    of a run keeps the merged diff and the others are deleted, as is the
+    last one when the changes cancel out. Returns the number of events
+    deleted.
+    """
+    def key(event):
+        return (event.task_id, event.actor_id,
+                timezone.localdate(event.created_at,
+                                   timezone.get_default_timezone()))
+
+    merged, deleted, removed = [], [], 0
+    for _, run in groupby(events, key):
+        *earlier, last = run
+        if not earlier:
+            continue
+        last.diff = reduce(merge, [event.diff for event in (*earlier, last)])
+        deleted += [event.pk for event in earlier]
+        if last.diff:
+            merged.append(last)
+        else:
+            deleted.append(last.pk)
+        if len(merged) + len(deleted) >= batch_size:
+            removed += _write_compacted(merged, deleted)
+            merged, deleted = [], []
+    return removed + _write_compacted(merged, deleted)
+
+
+def compact_before(cutoff, tasks_per_batch=500):
+    """compact() the changes made before ``cutoff``, a batch of tasks at
+    a time so that no run is split."""
+    events = TaskEvent.objects.filter(action=TaskEvent.UPDATED,
+                                      created_at__lt=cutoff)
+    removed, last = 0, None
+    while True:
+        batch = events.filter(task_id__gt=last) if last is not None else events
+        task_ids = list(batch.order_by('task_id').values_list(
+            'task_id', flat=True
+        ).distinct()[:tasks_per_batch])
+        if not task_ids:
+            return removed
+        removed += compact(events.filter(task_id__in=task_ids).order_by(
+            'task_id', 'created_at', 'id'
+        ))
+        last = task_ids[-1]
+
+
+def _write_compacted(merged, deleted):
+    with transaction.atomic():
+        TaskEvent.objects.bulk_update(merged, ['diff'])
+        TaskEvent.objects.filter(pk__in=deleted).delete()
+    return len(deleted)
+
+
+# Monthly partitions of tasks_taskevent on PostgreSQL.
+
+def month_start(day, months=0):
+    month = day.year * 12 + day.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def month_bound(month):
+    """Start of ``month`` in UTC, the bound of its partition."""
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'tasks_taskevent_p{month:%Y%m}'
+
+
+def partitions():
+    """``{month: table name}`` of the attached monthly partitions."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = 'tasks_taskevent'::regclass"
+        )
+        names = [name for name, in cursor.fetchall()]
+    return {date(int(name[-6:-2]), int(name[-2:]), 1): name
+            for name in names if name != 'tasks_taskevent_default'}
+
+
+def create_partition(month):
+    """Attach the partition of ``month``, with its rows from the default.
+
+    Events written before the partition existed went to the default
+    partition; they are moved over before attaching, which PostgreSQL
+    would refuse otherwise.
+    """
+    name = partition_name(month)
+    start, end = month_bound(month), month_bound(month_start(month, 1))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {name} (LIKE tasks_taskevent '
+            'INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(
+            'WITH moved AS (DELETE FROM tasks_taskevent_default '
+            'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved', [start, end]
+        )
+        cursor.execute(
+            f'ALTER TABLE tasks_taskevent ATTACH PARTITION {name} '
+            f"FOR VALUES FROM ('{start.isoformat()}') "
+            f"TO ('{end.isoformat()}')"
+        )
+
+
+def drop_partition(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE {name}')
@@ -0,0 +1,179 @@
+import csv
+import json
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as _
+from task_manager.cache_versions import touch
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from . import history
+from .counters import count_created
+from .models import Task
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+IMPORT_BATCH_SIZE = 1000
+
+
+def read_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(stream):
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+def _name_map(queryset, field):
+    # Names are not unique for statuses and labels; the oldest row wins.
+    return dict(queryset.order_by('-pk').values_list(field, 'pk'))
+
+
+def _clean(value):
+    return '' if value is None else str(value).strip()
+
+
+def _split_labels(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, type(None))):
+        raise ValueError(_('Malformed labels'))
+    return [name for name in map(_clean, value or ()) if name]
+
+
+class TaskImporter:
+    """Create tasks in bulk from CSV or JSONL rows.
+
+    Status, label and user names are resolved against maps loaded once
+    up front, name clashes are checked with one query per batch and every
+    batch is written with two bulk inserts in its own transaction. Rows
+    that cannot be imported are collected in ``errors`` as
+    ``(line, message)`` pairs and do not stop the import.
+    """
+
+    def __init__(self, author, batch_size=IMPORT_BATCH_SIZE):
+        self.author = author
+        self.batch_size = batch_size
+        self.statuses = _name_map(Statuses.objects, 'name')
+        self.labels = _name_map(Label.objects, 'name')
+        self.users = _name_map(get_user_model().objects, 'username')
+        self.seen_names = set()
+        self.created = 0
+        self.errors = []
+
+    def run(self, stream, fmt):
+        rows = READERS[fmt](stream)
+        while batch := list(islice(rows, self.batch_size)):
+            self.import_batch(batch)
+        return self
+
+    def resolve(self, row):
+        """Return (task, label ids) for a row or raise ValueError."""
+        if row is None:
+            raise ValueError(_('Malformed row'))
+        name = _clean(row.get('name'))
+        if not name:
+            raise ValueError(_('Name is required'))
+        status = self._lookup(self.statuses, row.get('status'),
+                              _('Unknown status'), required=True)
+        executor = self._lookup(self.users, row.get('executor'),
+                                _('Unknown executor'))
+        author = self._lookup(self.users, row.get('author'),
+                              _('Unknown author'))
+        labels = [self._lookup(self.labels, label, _('Unknown label'))
+                  for label in _split_labels(row.get('labels'))]
+        task = Task(name=name, description=row.get('description') or None,
+                    status_id=status, executor_id=executor,
+                    author_id=author or self.author.pk)
+        try:
+            # Lengths and the like; the relations were resolved above and
+            # the name clashes are checked per batch.
+            task.clean_fields(exclude=['status', 'author', 'executor'])
+        except ValidationError as error:
+            raise ValueError(' '.join(error.messages))
+        return task, labels
+
+    @staticmethod
+    def _lookup(names, value, message, required=False):
+        value = _clean(value)
+        if not value and not required:
+            return None
+        if value not in names:
+            raise ValueError(f'{message}: {value}')
+        return names[value]
+
+    def _resolve_batch(self, batch):
+        resolved = []
+        for line, row in batch:
+            try:
+                resolved.append((line, *self.resolve(row)))
+            except ValueError as error:
+                self.errors.append((line, str(error)))
+        return resolved
+
+    def import_batch(self, batch):
+        resolved = self._drop_duplicates(self._resolve_batch(batch))
+        try:
+            self._write(resolved)
+        except IntegrityError:
+            # A concurrent writer took some of the names after the check.
+            for line, task, labels in resolved:
+                task.pk = None
+            resolved = self._drop_duplicates(resolved, recheck=True)
+            try:
+                self._write(resolved)
+            except IntegrityError:
+                self.errors.extend(
+                    (line, _('Conflicts with a concurrent change, '
+                             'import the row again'))
+                    for line, task, labels in resolved
+                )
+
+    def _drop_duplicates(self, resolved, recheck=False):
+        names = [task.name for line, task, labels in resolved]
+        taken = set(Task.objects.filter(name__in=names)
+                    .values_list('name', flat=True))
+        if not recheck:
+            taken |= self.seen_names & set(names)
+        unique = []
+        for line, task, labels in resolved:
+            if task.name in taken:
+                self.errors.append(
+                    (line, _('Task with this name already exists: %s')
+                     % task.name)
+                )
+                continue
+            taken.add(task.name)
+            unique.append((line, task, labels))
+        return unique
+
+    def _write(self, resolved):
+        if not resolved:
+            return
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(
+                [task for line, task, labels in resolved]
+            )
+            Task.labels.through.objects.bulk_create(
+                Task.labels.through(task_id=task.pk, label_id=label_id)
+                for task, (line, unsaved, labels) in zip(tasks, resolved)
+                for label_id in dict.fromkeys(labels)
+            )
+            count_created(tasks, [labels for line, task, labels in resolved])
+            history.record(self.author, {},
+                           history.snapshots([task.pk for task in tasks]))
+            touch('tasks')
+        self.seen_names.update(task.name for task in tasks)
+        self.created += len(tasks)
@@ -0,0 +1,43 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.archive import ARCHIVE_BATCH_SIZE, archive_batches
+
+
+class Command(BaseCommand):
+    help = ('Archive the tasks in a terminal status that have not been '
+            'changed for a while. Safe to interrupt and run again.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status', action='append', dest='statuses',
+            help='Status name to archive; repeat for several. '
+                 'Defaults to TASK_ARCHIVE_STATUSES.',
+        )
+        parser.add_argument(
+            '--days', type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS,
+            help='Archive tasks not changed for this many days.',
+        )
+        parser.add_argument('--batch-size', type=int,
+                            default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        names = options['statuses'] or settings.TASK_ARCHIVE_STATUSES
+        if not names:
+            raise CommandError('No statuses to archive, see '
+                               'TASK_ARCHIVE_STATUSES.')
+        statuses = dict(Statuses.objects.filter(
+            name__in=names
+        ).values_list('name', 'pk'))
+        unknown = sorted(set(names) - statuses.keys())
+        if unknown:
+            raise CommandError(f'Unknown statuses: {", ".join(unknown)}.')
+        before = timezone.now() - timedelta(days=options['days'])
+        archived = 0
+        for count in archive_batches(list(statuses.values()), before,
+                                     options['batch_size']):
+            archived += count
+            self.stdout.write(f'{archived} tasks archived...')
+        self.stdout.write(self.style.SUCCESS(f'{archived} tasks archived.'))
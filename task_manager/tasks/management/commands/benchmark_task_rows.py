@@ -0,0 +1,36 @@
+import statistics
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Template
+from task_manager.tasks.models import Task
+from task_manager.templatetags.task_rows import row_keys
+
+ROWS = Template('{% load task_rows %}{% task_rows tasks %}')
+
+
+class Command(BaseCommand):
+    help = ('Time rendering a page of task list rows with a cold and a '
+            'warm row fragment cache.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, rows, repeat, **options):
+        tasks = list(Task.objects.for_listing().order_by('-pk')[:rows])
+        if len(tasks) < rows:
+            raise CommandError(f'Only {len(tasks)} tasks, need {rows}.')
+        keys = list(row_keys(tasks).values())
+        for state in ('cold', 'warm'):
+            timings = []
+            for _ in range(repeat):
+                if state == 'cold':
+                    cache.delete_many(keys)
+                start = time.perf_counter()
+                ROWS.render(Context({'tasks': tasks}))
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f'{state}: {statistics.median(timings):.1f} ms median, '
+                f'{min(timings):.1f} ms best ({rows} rows, {repeat} runs)'
+            )
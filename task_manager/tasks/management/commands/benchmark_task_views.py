@@ -0,0 +1,79 @@
+import asyncio
+import time
+from collections import Counter
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from task_manager.db.pool import pool_stats
+from task_manager.tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = ('Measure requests/sec of the task pages served by the ASGI '
+            'handler with several requests in flight, and the connection '
+            'pool usage.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help='Defaults to the task list and the detail '
+                                 'and delete pages of a task of the user.')
+        parser.add_argument('--user', required=True,
+                            help='Username the requests are made as.')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=50)
+
+    def handle(self, *args, paths, user, requests, concurrency, **options):
+        try:
+            user = get_user_model().objects.get(username=user)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Unknown user: {user}')
+        client = AsyncClient()
+        client.force_login(user)
+        for path in paths or self.default_paths(user):
+            # The test client always sends "Host: testserver".
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+            ):
+                elapsed, statuses = asyncio.run(
+                    self.load(client, path, requests, concurrency)
+                )
+            codes = ', '.join(f'{code}: {count}'
+                              for code, count in sorted(statuses.items()))
+            self.stdout.write(
+                f'{path}: {requests / elapsed:.1f} req/s '
+                f'({requests} requests, {concurrency} concurrent; {codes})'
+            )
+        # With pooling, the connections this process ever held at once.
+        for name, stats in pool_stats().items():
+            self.stdout.write(
+                f'db pool {name}: peak {stats["peak_in_use"]} of '
+                f'{stats["max_size"]} connections, {stats["size"]} open, '
+                f'{stats["waits"]} waits, {stats["timeouts"]} timeouts'
+            )
+
+    @staticmethod
+    def default_paths(user):
+        task = Task.objects.filter(author=user).order_by('pk').first()
+        if task is None:
+            raise CommandError('The user has no tasks, pass paths.')
+        return [
+            reverse('tasks'),
+            reverse('task_detail', kwargs={'pk': task.pk}),
+            reverse('task_delete', kwargs={'pk': task.pk}),
+        ]
+
+    @staticmethod
+    async def load(client, path, requests, concurrency):
+        pending = iter(range(requests))
+        statuses = Counter()
+
+        async def worker():
+            for _ in pending:
+                response = await client.get(path)
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start, statuses
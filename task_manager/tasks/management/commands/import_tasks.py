@@ -0,0 +1,44 @@
+import os
+import sys
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from task_manager.tasks.importer import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    TaskImporter,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from a CSV or JSONL file ("-" reads stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--author', required=True,
+                            help='Username recorded as author when a row '
+                                 'has no author column.')
+        parser.add_argument('--format', choices=IMPORT_FORMATS,
+                            help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int,
+                            default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, path, author, format, batch_size, **options):
+        fmt = format or os.path.splitext(path)[1].lstrip('.').lower()
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError('Cannot tell the format, pass --format.')
+        try:
+            author = get_user_model().objects.get(username=author)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Unknown author: {author}')
+        importer = TaskImporter(author, batch_size=batch_size)
+        if path == '-':
+            importer.run(sys.stdin, fmt)
+        else:
+            with open(path, newline='', encoding='utf-8') as stream:
+                importer.run(stream, fmt)
+        for line, message in importer.errors:
+            self.stderr.write(f'line {line}: {message}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.created} tasks, '
+            f'{len(importer.errors)} rows skipped.'
+        ))
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from task_manager.tasks import history
+from task_manager.tasks.models import TaskEvent
+
+
+class Command(BaseCommand):
+    help = ('Create the upcoming monthly partitions of the task history, '
+            'drop the expired ones and compact old changes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=2,
+            help='Partitions to create past the current month.',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = history.month_start(now, -settings.TASK_HISTORY_MONTHS)
+        if connection.vendor == 'postgresql':
+            self.maintain_partitions(now, cutoff, options['months_ahead'])
+        # Rows of other backends and of the default partition.
+        removed, _ = TaskEvent.objects.filter(
+            created_at__lt=history.month_bound(cutoff)
+        ).delete()
+        self.report(f'{removed} expired events removed.')
+        compacted = history.compact_before(
+            now - timedelta(days=settings.TASK_HISTORY_COMPACT_DAYS)
+        )
+        self.report(f'{compacted} events merged by compaction.')
+
+    def maintain_partitions(self, now, cutoff, months_ahead):
+        existing = history.partitions()
+        months = [history.month_start(now, n)
+                  for n in range(months_ahead + 1)]
+        for month in months:
+            if month not in existing:
+                history.create_partition(month)
+        expired = [name for month, name in existing.items() if month < cutoff]
+        for name in expired:
+            history.drop_partition(name)
+        self.report(f'{len(set(months) - set(existing))} partitions created, '
+                    f'{len(expired)} expired partitions dropped.')
+
+    def report(self, message):
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from task_manager.cache_versions import touch
+from task_manager.tasks.counters import COUNTED, ROLLUPS, rebuild, reconcile
+
+
+class Command(BaseCommand):
+    help = ('Recount the tasks of every status, label, executor and day '
+            'and repair counters that drifted.')
+
+    def handle(self, *args, **options):
+        for model, source, column, version in COUNTED:
+            with transaction.atomic():
+                repaired = reconcile(model, source, column)
+                if repaired:
+                    touch(version)
+            self.report(model, repaired)
+        for model, actual in ROLLUPS:
+            with transaction.atomic():
+                repaired = rebuild(model, actual())
+                if repaired:
+                    # The dashboard is cached under the tasks version.
+                    touch('tasks')
+            self.report(model, repaired)
+
+    def report(self, model, repaired):
+        self.stdout.write(self.style.SUCCESS(
+            f'{model.__name__}: '
+            f'{repaired} counters repaired.'
+        ))
@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-18 20:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('labels', '0001_initial'),
+        ('statuses', '0001_initial'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='author',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='tasks_author', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='tasks', to='statuses.statuses', verbose_name='Status'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'executor', 'created_at'], name='task_status_executor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['author', 'created_at'], name='task_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('executor__isnull', False)), fields=['executor', 'created_at'], name='task_assigned_created_idx'),
+        ),
+        # The auto-created labels table only has (task_id, label_id) unique
+        # and a label_id index; filtering by label then has to visit the
+        # table rows to get task_id. This one covers the reverse join.
+        migrations.RunSQL(
+            'CREATE INDEX tasks_task_labels_label_task_idx '
+            'ON tasks_task_labels (label_id, task_id)',
+            'DROP INDEX tasks_task_labels_label_task_idx',
+        ),
+    ]
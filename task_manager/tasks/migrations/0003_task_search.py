@@ -0,0 +1,70 @@
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The trigger keeps search_vector current for every write path, including
+# bulk_create and queryset.update(). The name weighs more than the
+# description; the configuration matches tasks.models.SEARCH_CONFIG.
+FORWARDS_SQL = [
+    '''
+    CREATE FUNCTION tasks_task_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A')
+            || setweight(
+                to_tsvector('simple', coalesce(NEW.description, '')), 'B'
+            );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    ''',
+    '''
+    CREATE TRIGGER tasks_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, search_vector
+    ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_search_vector_update()
+    ''',
+    'UPDATE tasks_task SET search_vector = NULL',
+    'CREATE INDEX task_search_vector_idx ON tasks_task '
+    'USING gin (search_vector)',
+    'CREATE INDEX task_name_trgm_idx ON tasks_task '
+    'USING gin (name gin_trgm_ops)',
+]
+
+BACKWARDS_SQL = [
+    'DROP INDEX task_name_trgm_idx',
+    'DROP INDEX task_search_vector_idx',
+    'DROP TRIGGER tasks_task_search_vector_trigger ON tasks_task',
+    'DROP FUNCTION tasks_task_search_vector_update()',
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_filter_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            run_on_postgresql(FORWARDS_SQL),
+            run_on_postgresql(BACKWARDS_SQL),
+        ),
+    ]
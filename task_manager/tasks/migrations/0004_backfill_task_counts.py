@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    through = Task.labels.through
+    for model, source, column in (
+        (apps.get_model('statuses', 'Statuses'), Task, 'status_id'),
+        (apps.get_model('labels', 'Label'), through, 'label_id'),
+    ):
+        model.objects.update(task_count=Coalesce(Subquery(
+            source.objects.filter(**{column: OuterRef('pk')})
+            .order_by().values(column)
+            .annotate(count=Count('*')).values('count')
+        ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_task_count'),
+        ('statuses', '0002_task_count'),
+        ('tasks', '0003_task_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
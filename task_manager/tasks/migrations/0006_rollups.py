@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 21:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    ExecutorRollup = apps.get_model('tasks', 'ExecutorRollup')
+    DailyRollup = apps.get_model('tasks', 'DailyRollup')
+    tasks = Task.objects.order_by()
+    executors = (tasks.filter(executor__isnull=False).values('executor')
+                 .annotate(count=Count('*')).values_list('executor', 'count'))
+    ExecutorRollup.objects.bulk_create(
+        ExecutorRollup(executor_id=pk, task_count=count)
+        for pk, count in executors
+    )
+    created = TruncDate('created_at', tzinfo=timezone.get_default_timezone())
+    days = (tasks.annotate(day=created).values('day')
+            .annotate(count=Count('*')).values_list('day', 'count'))
+    DailyRollup.objects.bulk_create(
+        DailyRollup(day=day, task_count=count) for day, count in days
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0005_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('task_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExecutorRollup',
+            fields=[
+                ('executor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_rollup', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('task_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
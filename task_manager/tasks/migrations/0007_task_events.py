@@ -0,0 +1,70 @@
+# Generated by Django 4.2 on 2026-10-18 21:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# On PostgreSQL the events are range partitioned by month. The primary key
+# has to include the partition key; ids still come from one identity
+# sequence, so they stay unique. Monthly partitions are attached by the
+# maintain_task_history command, the default partition takes the rest.
+POSTGRESQL_SQL = [
+    '''
+    CREATE TABLE tasks_taskevent (
+        id bigint GENERATED BY DEFAULT AS IDENTITY,
+        task_id bigint NOT NULL,
+        actor_id integer NULL,
+        action smallint NOT NULL CHECK (action >= 0),
+        diff jsonb NOT NULL,
+        created_at timestamp with time zone NOT NULL,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)
+    ''',
+    'CREATE INDEX task_event_timeline_idx ON tasks_taskevent '
+    '(task_id, created_at)',
+    'CREATE TABLE tasks_taskevent_default PARTITION OF tasks_taskevent '
+    'DEFAULT',
+]
+
+
+def create_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(apps.get_model('tasks', 'TaskEvent'))
+        return
+    for statement in POSTGRESQL_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('tasks', 'TaskEvent'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0006_rollups'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='TaskEvent',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('task_id', models.BigIntegerField()),
+                        ('action', models.PositiveSmallIntegerField(choices=[(1, 'Created'), (2, 'Changed'), (3, 'Deleted')])),
+                        ('diff', models.JSONField()),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('actor', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'indexes': [models.Index(fields=['task_id', 'created_at'], name='task_event_timeline_idx')],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_table, drop_table),
+    ]
@@ -1,8 +1,71 @@
-from django.db import models
+from django.contrib.postgres.search import SearchQuery, SearchVectorField
+from django.db import connections, models, transaction
 from task_manager.statuses.models import Statuses
 from task_manager.labels.models import Label
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from .choices import get_choices
+
+# Text search configuration used by the search_vector trigger. 'simple'
+# does no stemming, which suits the mix of Russian and English names.
+SEARCH_CONFIG = 'simple'
+
+
+class TaskQuerySet(models.QuerySet):
+    listing_fields = (
+        'name', 'created_at', 'updated_at',
+        'status', 'status__name',
+        'author', 'author__first_name', 'author__last_name',
+        'executor', 'executor__first_name', 'executor__last_name',
+    )
+
+    def for_listing(self, with_labels=False):
+        queryset = self.select_related(
+            'status', 'author', 'executor'
+        ).only(*self.listing_fields)
+        if with_labels:
+            queryset = queryset.prefetch_related(
+                models.Prefetch('labels', queryset=Label.objects.only('name'))
+            )
+        return queryset
+
+    def for_export(self):
+        return self.select_related(
+            'status', 'author', 'executor'
+        ).only(
+            'name', 'description', 'created_at',
+            'status', 'status__name',
+            'author', 'author__username',
+            'executor', 'executor__username',
+        ).prefetch_related(
+            models.Prefetch('labels', queryset=Label.objects.only('name'))
+        )
+
+    def live(self):
+        """Tasks that are not archived, see task_manager.tasks.archive."""
+        return self.filter(archived_at__isnull=True)
+
+    def search(self, text):
+        """Match ``text`` against the name and the description.
+
+        PostgreSQL uses the GIN-indexed search_vector. Only when none of
+        the tasks of this queryset matches as typed does it forgive typos,
+        by trigram word similarity on the name (also GIN-indexed);
+        otherwise names one letter apart, like "Task1" and "Task2", would
+        always match each other. Filter the queryset first, or matches
+        the user filtered out would turn the typo tolerance off. Other
+        backends fall back to unindexed substring matching.
+        """
+        if connections[self.db].vendor != 'postgresql':
+            return self.filter(models.Q(name__icontains=text)
+                               | models.Q(description__icontains=text))
+        query = SearchQuery(text, config=SEARCH_CONFIG,
+                            search_type='websearch')
+        matches = self.filter(search_vector=query)
+        if matches.exists():
+            return matches
+        return self.filter(name__trigram_word_similar=text)
 
 
 class Task(models.Model):
@@ -19,9 +82,9 @@ class Task(models.Model):
     status = models.ForeignKey(Statuses,
                                on_delete=models.PROTECT,
                                verbose_name=_('Status'), unique=False,
-                               related_name='tasks')
+                               related_name='tasks', db_index=False)
     author = models.ForeignKey(get_user_model(), on_delete=models.PROTECT,
-                               related_name='tasks_author')
+                               related_name='tasks_author', db_index=False)
     executor = models.ForeignKey(get_user_model(), on_delete=models.PROTECT,
                                  null=True, blank=True,
                                  related_name='tasks_executor')
@@ -29,3 +92,117 @@ class Task(models.Model):
                                     related_name='tasks',
                                     blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Versions the cached list rows. queryset.update() does not stamp it,
+    # so set it explicitly there.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Kept up to date by a trigger on PostgreSQL (migration 0003), so bulk
+    # inserts are covered as well. Unused on other backends.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Set by the archive_tasks command. Archived tasks drop out of the
+    # lists unless asked for, but stay in the table: labels, counters and
+    # the history keep pointing at them.
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        # Shaped after TaskFilter: every filter combination and the list
+        # ordering (created_at, id) can be served from one of these.
+        # status and author get no standalone index because they lead
+        # the composite ones. task_live_created_idx holds only the tasks
+        # that are not archived, so the default list does not walk past
+        # the archive.
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='task_created_id_idx'),
+            models.Index(fields=['created_at', 'id'],
+                         condition=models.Q(archived_at__isnull=True),
+                         name='task_live_created_idx'),
+            models.Index(fields=['status', 'executor', 'created_at'],
+                         name='task_status_executor_idx'),
+            models.Index(fields=['author', 'created_at'],
+                         name='task_author_created_idx'),
+            models.Index(fields=['executor', 'created_at'],
+                         condition=models.Q(executor__isnull=False),
+                         name='task_assigned_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The task_count signals adjust the status counters around the
+        # write; keep them in one transaction with it.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+# Rollups read by the dashboard instead of counting tasks. Like the
+# task_count columns of statuses and labels they are kept up to date by
+# the signals in task_manager.tasks.signals and the bulk write paths; see
+# reconcile_task_counters for repairs.
+
+class ExecutorRollup(models.Model):
+    executor = models.OneToOneField(get_user_model(), primary_key=True,
+                                    on_delete=models.CASCADE,
+                                    related_name='task_rollup')
+    task_count = models.IntegerField(default=0)
+
+
+class DailyRollup(models.Model):
+    # The creation date in TIME_ZONE, whatever zone the user is in.
+    day = models.DateField(primary_key=True)
+    task_count = models.IntegerField(default=0)
+
+
+class TaskEvent(models.Model):
+    """One change of a task, stored as a diff of the tracked fields.
+
+    ``diff`` maps a field to ``[old, new]``, ids for status and executor;
+    for labels it holds ``[removed ids, added ids]``. Rows are only ever
+    inserted. task_id is not a foreign key so that the history outlives
+    the task. On PostgreSQL the table is partitioned by month of
+    created_at, see the maintain_task_history command.
+    """
+    CREATED, UPDATED, DELETED = 1, 2, 3
+    ACTIONS = (
+        (CREATED, _('Created')),
+        (UPDATED, _('Changed')),
+        (DELETED, _('Deleted')),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    task_id = models.BigIntegerField()
+    actor = models.ForeignKey(get_user_model(), null=True,
+                              on_delete=models.DO_NOTHING,
+                              db_constraint=False, db_index=False,
+                              related_name='+')
+    action = models.PositiveSmallIntegerField(choices=ACTIONS)
+    diff = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task_id', 'created_at'],
+                         name='task_event_timeline_idx'),
+        ]
+
+    def changes(self):
+        """Display rows of the diff: the field name, old and new values.
+
+        Ids are shown by the cached names, or as ``#id`` once deleted;
+        for labels old and new are the removed and the added ones.
+        """
+        names = {'status': dict(get_choices('statuses')),
+                 'executor': dict(get_choices('executors')),
+                 'labels': dict(get_choices('labels'))}
+
+        def show(field, value):
+            if field not in names or value is None:
+                return value
+            if field == 'labels':
+                return ', '.join(names[field].get(pk, f'#{pk}')
+                                 for pk in value)
+            return names[field].get(value, f'#{value}')
+
+        return [{'name': Task._meta.get_field(field).verbose_name,
+                 'old': show(field, old), 'new': show(field, new),
+                 'labels': field == 'labels'}
+                for field, (old, new) in self.diff.items()]
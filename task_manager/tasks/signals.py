@@ -0,0 +1,137 @@
+from collections import Counter
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from task_manager.cache_versions import touch
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from .counters import apply_counts, apply_rollup, created_day
+from .models import DailyRollup, ExecutorRollup, Task
+
+
+@receiver(post_save, sender=Statuses)
+@receiver(post_delete, sender=Statuses)
+def statuses_changed(sender, **kwargs):
+    touch('statuses')
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def labels_changed(sender, **kwargs):
+    touch('labels')
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def tasks_changed(sender, **kwargs):
+    touch('tasks')
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        touch('tasks')
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, update_fields=None, **kwargs):
+    # Logging in only stamps last_login, which no cached list shows.
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    touch('users')
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_deleted(sender, **kwargs):
+    touch('users')
+
+
+# task_count and rollup maintenance. Task.save(), the related managers and
+# the deletion collector run these inside the write's transaction.
+# bulk_create and queryset.update() send no signals; see counters.
+
+COUNTED_FIELDS = ('status', 'executor')
+
+
+def _counted_values(instance, using, update_fields):
+    """(status_id, executor_id) of the row before and after the save.
+
+    "Before" is None for a new row.
+    """
+    after = (instance.status_id, instance.executor_id)
+    saved = [update_fields is None
+             or bool({name, f'{name}_id'} & set(update_fields))
+             for name in COUNTED_FIELDS]
+    if instance.pk is None:
+        return None, after
+    if not any(saved):
+        return after, after
+    # Lock the row so that concurrent moves count from the right values.
+    before = (
+        Task.objects.using(using).select_for_update().filter(pk=instance.pk)
+        .values_list('status_id', 'executor_id').first()
+    )
+    if before is not None:
+        after = tuple(new if is_saved else old for new, old, is_saved
+                      in zip(after, before, saved))
+    return before, after
+
+
+def _moved(before, after):
+    return {} if before == after else {before: -1, after: 1}
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted(sender, instance, using, update_fields=None, **kwargs):
+    instance._counted = _counted_values(instance, using, update_fields)
+
+
+@receiver(post_save, sender=Task)
+def count_task(sender, instance, created, **kwargs):
+    before, after = instance.__dict__.pop('_counted')
+    if before is None:
+        apply_counts(Statuses, {after[0]: 1})
+        apply_rollup(ExecutorRollup, {after[1]: 1})
+        apply_rollup(DailyRollup, {created_day(instance): 1})
+        return
+    apply_counts(Statuses, _moved(before[0], after[0]))
+    apply_rollup(ExecutorRollup, _moved(before[1], after[1]))
+
+
+@receiver(pre_delete, sender=Task)
+def uncount_task(sender, instance, **kwargs):
+    apply_counts(Statuses, {instance.status_id: -1})
+    apply_counts(ExecutorRollup, {instance.executor_id: -1})
+    apply_counts(DailyRollup, {created_day(instance): -1})
+    Label.objects.filter(tasks=instance).update(
+        task_count=F('task_count') - 1
+    )
+
+
+def _linked_labels(through, instance, reverse, pk_set):
+    own, other = ('label_id', 'task_id') if reverse else ('task_id', 'label_id')
+    links = through.objects.filter(**{own: instance.pk})
+    if pk_set is not None:
+        links = links.filter(**{f'{other}__in': pk_set})
+    return list(links.values_list('label_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def count_labels(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('pre_remove', 'pre_clear'):
+        # Only links that exist are removed, whatever pk_set asks for.
+        instance._unlinked_labels = _linked_labels(sender, instance,
+                                                   reverse, pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        removed = Counter(instance.__dict__.pop('_unlinked_labels', ()))
+        apply_counts(Label, {pk: -count for pk, count in removed.items()})
+    elif action == 'post_add':
+        added = [instance.pk] * len(pk_set) if reverse else pk_set
+        apply_counts(Label, Counter(added))
@@ -1,6 +1,7 @@
 from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib import auth
+from django.core.cache import cache
 from task_manager.settings import LOGIN_URL
 from task_manager.tasks.models import Task
 import os
@@ -15,6 +16,7 @@ class TaskViewsTestMixin(TestCase):
     fixtures = ['users', 'labels', 'statuses', 'tasks']
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.tasks = Task.objects
         self.users_model = auth.get_user_model()
@@ -38,6 +40,7 @@ class TaskCreationFormTestMixin(TestCase):
     fixtures = ['users', 'statuses']
 
     def setUp(self):
+        cache.clear()
         with open(
                 os.path.join(
                     os.path.dirname(__file__),
@@ -0,0 +1,95 @@
+import io
+from datetime import timedelta
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from task_manager.tasks.archive import archive_batches
+from task_manager.tasks.bulk import TaskBatch, TaskBulkAction
+from task_manager.tasks.models import Task
+from .mixins import TaskViewsTestMixin
+
+
+class TaskArchiveTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.long_ago = timezone.now() - timedelta(days=365)
+        Task.objects.update(updated_at=self.long_ago)
+
+    def archived(self):
+        return set(Task.objects.filter(archived_at__isnull=False)
+                   .values_list('pk', flat=True))
+
+    def archive(self, *args):
+        out = io.StringIO()
+        call_command('archive_tasks', *args, stdout=out)
+        return out.getvalue()
+
+    def test_archives_old_tasks_in_the_statuses(self):
+        Task.objects.filter(pk=3).update(updated_at=timezone.now())
+        output = self.archive('--status', 'In progress', '--days', '30')
+        self.assertEqual(self.archived(), {1})
+        self.assertIn('1 tasks archived.', output)
+        self.assertIn('0 tasks archived.', self.archive(
+            '--status', 'In progress', '--days', '30'
+        ))
+
+    def test_batches_resume(self):
+        before = timezone.now()
+        batches = archive_batches([1, 2], before, batch_size=2)
+        self.assertEqual(next(batches), 2)
+        self.assertEqual(self.archived(), {1, 2})
+        # An interrupted run leaves the rest to the next one.
+        batches.close()
+        self.assertEqual(list(archive_batches([1, 2], before, 2)), [1])
+        self.assertEqual(self.archived(), {1, 2, 3})
+
+    def test_statuses_required(self):
+        with override_settings(TASK_ARCHIVE_STATUSES=[]):
+            with self.assertRaises(CommandError):
+                self.archive()
+        with self.assertRaisesMessage(CommandError, 'Unknown statuses: Nope'):
+            self.archive('--status', 'Nope')
+
+    def test_archived_left_out_unless_included(self):
+        Task.objects.filter(pk=1).update(archived_at=timezone.now())
+        response = self.client.get(self.tasks_url)
+        self.assertEqual([task.pk for task in response.context['tasks']],
+                         [2, 3])
+        response = self.client.get(self.tasks_url, {'archived': 'on'})
+        self.assertEqual([task.pk for task in response.context['tasks']],
+                         [1, 2, 3])
+        response = self.client.get(self.tasks_url,
+                                   {'status': 1, 'archived': 'on'})
+        self.assertEqual([task.pk for task in response.context['tasks']],
+                         [1, 3])
+        response = self.client.get(reverse('api_tasks'))
+        self.assertEqual([task['id'] for task in response.json()['data']],
+                         [2, 3])
+
+    def test_detail_and_update(self):
+        Task.objects.filter(pk=1).update(archived_at=timezone.now())
+        response = self.client.get(self.task_view_url)
+        self.assertContains(response, 'В архиве')
+        self.client.post(self.task_update_url1, {
+            'name': 'Test Task1', 'status': 1, 'executor': 1,
+            'labels': [1, 2],
+        })
+        self.assertEqual(self.archived(), set())
+        self.assertNotContains(self.client.get(self.task_view_url),
+                               'В архиве')
+
+    def test_bulk_edits_bring_tasks_back(self):
+        Task.objects.update(archived_at=timezone.now())
+        batch = TaskBatch(self.user, [{'id': 1, 'name': 'Renamed'}]).run()
+        self.assertEqual(batch.errors, {})
+        self.assertEqual(self.archived(), {2, 3})
+        for action, value, pk in (('status', 1, 2), ('add_label', 1, 3)):
+            with self.subTest(action=action):
+                TaskBulkAction(self.user, Task.objects.filter(pk=pk)).run(
+                    action, value
+                )
+                self.assertNotIn(pk, self.archived())
+        self.assertEqual(self.archived(), set())
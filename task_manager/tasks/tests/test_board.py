@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.tasks.board import board_columns
+from task_manager.tasks.models import Task
+from .mixins import TaskViewsTestMixin
+
+STATUSES = [(1, 'In progress'), (2, 'Finished')]
+
+
+class TaskBoardTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.board_url = reverse('task_board')
+
+    def add_tasks(self, count, status_id=1):
+        Task.objects.bulk_create(
+            Task(name=f'card {status_id}-{n}', status_id=status_id,
+                 author=self.user)
+            for n in range(count)
+        )
+
+    def test_columns(self):
+        self.add_tasks(4)
+        columns = board_columns(Task.objects.all(), STATUSES, per_column=3)
+        first, second = columns
+        self.assertEqual((first.total, len(first.cards)), (6, 3))
+        # PostgreSQL sequences are not reset between tests.
+        self.assertEqual([task.pk for task in first.cards], list(
+            Task.objects.filter(status=1).order_by('pk')
+            .values_list('pk', flat=True)[:3]
+        ))
+        self.assertEqual(first.cards[:2], [Task(pk=1), Task(pk=3)])
+        self.assertTrue(first.has_more)
+        self.assertIn('cursor=', first.next_query)
+        self.assertEqual((second.total, [task.pk for task in second.cards]),
+                         (1, [2]))
+        self.assertFalse(second.has_more)
+        self.assertIsNone(second.next_query)
+
+    def test_empty_column(self):
+        columns = board_columns(Task.objects.filter(status=1), STATUSES)
+        self.assertEqual([(column.total, column.cards) for column in columns
+                          if column.status_id == 2], [(0, [])])
+
+    def test_board_queries_do_not_grow(self):
+        def queries():
+            self.client.get(self.board_url)  # warm the choice cache
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(self.board_url)
+            self.assertEqual(response.status_code, 200)
+            return len(captured)
+
+        before = queries()
+        self.add_tasks(30)
+        self.add_tasks(30, status_id=2)
+        self.assertEqual(queries(), before)
+
+    def test_filter_applies_to_the_board(self):
+        response = self.client.get(self.board_url, {'executor': 2})
+        columns = response.context['columns']
+        self.assertEqual([[task.pk for task in column.cards]
+                          for column in columns], [[3], []])
+        self.assertContains(response, 'Test Task3')
+        self.assertNotContains(response, 'Test Task1')
+
+    def test_load_more(self):
+        self.add_tasks(15)
+        response = self.client.get(self.board_url, {'executor': ''})
+        column = response.context['columns'][0]
+        self.assertEqual(len(column.cards), 10)
+        url = f"{reverse('task_board_column', args=[1])}?{column.next_query}"
+        self.assertContains(response, url.replace('&', '&amp;'))
+        response = self.client.get(url)
+        more = [task.pk for task in response.context['tasks']]
+        self.assertEqual(len(more), 7)
+        self.assertFalse(set(more) & {task.pk for task in column.cards})
+
+    def test_unknown_column(self):
+        response = self.client.get(reverse('task_board_column', args=[99]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(self.board_url)
+        self.assertRedirects(response, self.login_url)
@@ -0,0 +1,123 @@
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.bulk import TaskBulkAction
+from task_manager.tasks.counters import ROLLUPS
+from task_manager.tasks.models import Task, TaskEvent
+from .mixins import TaskViewsTestMixin
+
+
+class TaskBulkActionTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.bulk_url = reverse('tasks_bulk')
+
+    def post(self, data, query=''):
+        response = self.client.post(f'{self.bulk_url}{query}', data)
+        self.assertRedirects(response, f'{self.tasks_url}{query}',
+                             fetch_redirect_response=False)
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def assertCountersMatch(self):
+        for model in (Statuses, Label):
+            for counted in model.objects.all():
+                self.assertEqual(counted.task_count, counted.tasks.count())
+        for model, actual in ROLLUPS:
+            self.assertEqual({pk: count for pk, count in model.objects
+                              .values_list('pk', 'task_count') if count},
+                             actual())
+
+    def test_change_status(self):
+        before = Task.objects.get(pk=1).updated_at
+        messages = self.post({'action': 'status', 'status': 2,
+                              'tasks': [1, 2, 3]})
+        self.assertEqual(messages, ['Изменено задач: 2 из 3.'])
+        self.assertEqual(set(Task.objects.values_list('status', flat=True)),
+                         {2})
+        self.assertGreater(Task.objects.get(pk=1).updated_at, before)
+        self.assertCountersMatch()
+
+    def test_reassign_and_unassign(self):
+        self.post({'action': 'executor', 'executor': 2, 'tasks': [1, 2]})
+        self.assertEqual(set(Task.objects.values_list('executor', flat=True)),
+                         {2})
+        self.assertCountersMatch()
+        self.post({'action': 'executor', 'executor': '', 'tasks': [1, 3]})
+        self.assertEqual(Task.objects.filter(executor=None).count(), 2)
+        self.assertCountersMatch()
+
+    def test_add_and_remove_label(self):
+        messages = self.post({'action': 'add_label', 'label': 1,
+                              'tasks': [1, 2, 3]})
+        self.assertEqual(messages, ['Изменено задач: 2 из 3.'])
+        self.assertEqual(Label.objects.get(pk=1).tasks.count(), 3)
+        self.assertCountersMatch()
+        self.post({'action': 'remove_label', 'label': 2, 'tasks': [1, 3]})
+        self.assertEqual(list(Label.objects.get(pk=2).tasks.values_list(
+            'pk', flat=True
+        )), [2])
+        self.assertCountersMatch()
+
+    def test_delete_only_own_tasks(self):
+        messages = self.post({'action': 'delete', 'tasks': [1, 2, 3]})
+        self.assertEqual(len(messages), 1)
+        self.assertIn('Удалено задач: 2 из 3.', messages[0])
+        self.assertEqual(list(Task.objects.values_list('pk', flat=True)),
+                         [3])
+        self.assertCountersMatch()
+        deleted = TaskEvent.objects.filter(action=TaskEvent.DELETED)
+        self.assertEqual(sorted(deleted.values_list('task_id', flat=True)),
+                         [1, 2])
+        self.assertEqual(deleted.get(task_id=1).diff['name'],
+                         ['Test Task1', None])
+
+    def test_all_matching_the_filter(self):
+        self.post({'action': 'status', 'status': 2, 'all_matching': 'on'},
+                  query='?executor=2')
+        self.assertEqual(dict(Task.objects.values_list('pk', 'status')),
+                         {1: 1, 2: 2, 3: 2})
+        self.assertCountersMatch()
+
+    def test_invalid_form_changes_nothing(self):
+        for data, error in (
+            ({'action': 'status', 'tasks': [1]}, 'Обязательное поле.'),
+            ({'action': 'add_label', 'label': 1}, 'Выберите задачи.'),
+            ({'action': 'status', 'status': 2, 'tasks': [99]}, '99'),
+        ):
+            self.assertIn(error, self.post(data)[-1])
+        self.assertEqual(Task.objects.filter(status=2).count(), 1)
+
+    def test_queries_do_not_grow_with_the_selection(self):
+        def queries(action, value):
+            tasks = Task.objects.all()
+            with CaptureQueriesContext(connection) as captured:
+                TaskBulkAction(self.user, tasks).run(action, value)
+            return len(captured)
+
+        for action, value in (('status', 2), ('add_label', 1)):
+            few = queries(action, value)
+            Task.objects.bulk_create(
+                Task(name=f'{action} {n}', status_id=1, author=self.user)
+                for n in range(40)
+            )
+            Task.objects.update(status=1)
+            Task.labels.through.objects.all().delete()
+            self.assertEqual(queries(action, value), few)
+
+    def test_index_has_checkboxes(self):
+        response = self.client.get(self.tasks_url)
+        self.assertContains(response, 'name="tasks" value="1"')
+        self.assertContains(response, 'id="task-bulk"')
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.post(self.bulk_url, {'action': 'delete',
+                                                    'tasks': [1]})
+        self.assertRedirects(response, self.login_url)
+        self.assertTrue(Task.objects.filter(pk=1).exists())
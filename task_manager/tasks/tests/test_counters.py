@@ -0,0 +1,134 @@
+import io
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.bulk import TaskBatch
+from task_manager.tasks.importer import TaskImporter
+from task_manager.tasks.models import DailyRollup, ExecutorRollup, Task
+from .mixins import TaskViewsTestMixin
+
+
+class TaskCounterTest(TaskViewsTestMixin, TestCase):
+
+    def assertCounts(self, statuses, labels):
+        self.assertEqual(
+            dict(Statuses.objects.values_list('pk', 'task_count')), statuses
+        )
+        self.assertEqual(
+            dict(Label.objects.values_list('pk', 'task_count')), labels
+        )
+
+    def test_fixture_counts(self):
+        self.assertCounts({1: 2, 2: 1}, {1: 1, 2: 2})
+
+    def test_create_update_delete(self):
+        self.client.force_login(self.user)
+        self.client.post(self.task_create_url, {
+            'name': 'counted', 'status': 2, 'labels': [1],
+        })
+        self.assertCounts({1: 2, 2: 2}, {1: 2, 2: 2})
+        self.client.post(self.task_update_url1, {
+            'name': 'Test Task1', 'status': 2, 'labels': [1],
+        })
+        self.assertCounts({1: 1, 2: 3}, {1: 2, 2: 1})
+        self.client.post(self.task_delete_url1)
+        self.assertCounts({1: 1, 2: 2}, {1: 1, 2: 1})
+
+    def test_label_links(self):
+        task, label = self.tasks.get(pk=3), Label.objects.get(pk=1)
+        task.labels.remove(label)
+        self.assertCounts({1: 2, 2: 1}, {1: 1, 2: 2})
+        label.tasks.add(task, self.tasks.get(pk=1))
+        self.assertCounts({1: 2, 2: 1}, {1: 2, 2: 2})
+        label.tasks.clear()
+        self.assertCounts({1: 2, 2: 1}, {1: 0, 2: 2})
+
+    def test_import_counts_bulk_rows(self):
+        content = 'name,status,labels\nA,Finished,label1\nB,Finished,\n'
+        TaskImporter(self.user).run(io.StringIO(content), 'csv')
+        self.assertCounts({1: 2, 2: 3}, {1: 2, 2: 2})
+
+    def test_reconcile_command(self):
+        Statuses.objects.update(task_count=7)
+        Label.objects.filter(pk=2).update(task_count=0)
+        out = io.StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('2 counters repaired', out.getvalue())
+        self.assertIn('1 counters repaired', out.getvalue())
+        self.assertCounts({1: 2, 2: 1}, {1: 1, 2: 2})
+
+    def test_delete_guards_use_counters(self):
+        self.client.force_login(self.user)
+        for url in (reverse('status_delete', kwargs={'pk': 1}),
+                    reverse('labels_delete', kwargs={'pk': 2})):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertFalse([query for query in queries
+                              if 'tasks_task' in query['sql']])
+        self.assertEqual(Statuses.objects.count(), 2)
+        self.assertEqual(Label.objects.count(), 2)
+
+    def test_drifted_status_counter_still_protects(self):
+        self.client.force_login(self.user)
+        Statuses.objects.update(task_count=0)
+        response = self.client.post(reverse('status_delete',
+                                            kwargs={'pk': 1}))
+        self.assertRedirects(response, reverse('statuses'))
+        self.assertTrue(Statuses.objects.filter(pk=1).exists())
+
+
+class TaskRollupTest(TaskViewsTestMixin, TestCase):
+
+    def assertRollups(self, executors, total):
+        self.assertEqual(dict(ExecutorRollup.objects.filter(
+            task_count__gt=0
+        ).values_list('pk', 'task_count')), executors)
+        self.assertEqual(sum(DailyRollup.objects.values_list(
+            'task_count', flat=True
+        )), total)
+
+    def test_fixture_rollups(self):
+        self.assertRollups({1: 1, 2: 1}, 3)
+
+    def test_save_and_delete(self):
+        task = Task.objects.create(name='rolled', status_id=1,
+                                   author=self.user, executor=self.user)
+        self.assertRollups({1: 2, 2: 1}, 4)
+        task.executor = self.user2
+        task.save()
+        self.assertRollups({1: 1, 2: 2}, 4)
+        # Only the saved fields count.
+        task.executor = None
+        task.save(update_fields=['name'])
+        self.assertRollups({1: 1, 2: 2}, 4)
+        task.save(update_fields=['executor'])
+        self.assertRollups({1: 1, 2: 1}, 4)
+        Task.objects.filter(pk__in=[1, task.pk]).delete()
+        self.assertRollups({2: 1}, 2)
+
+    def test_bulk_paths(self):
+        content = 'name,status,executor\nA,Finished,Hermione\n'
+        TaskImporter(self.user).run(io.StringIO(content), 'csv')
+        self.assertRollups({1: 1, 2: 2}, 4)
+        batch = TaskBatch(self.user, [
+            {'name': 'B', 'status': 1, 'executor': 1},
+            {'id': 3, 'executor': 1},
+        ]).run()
+        self.assertFalse(batch.errors)
+        self.assertRollups({1: 3, 2: 1}, 5)
+
+    def test_reconcile_rebuilds_rollups(self):
+        ExecutorRollup.objects.filter(pk=1).update(task_count=5)
+        ExecutorRollup.objects.filter(pk=2).delete()
+        DailyRollup.objects.create(day='2000-01-01', task_count=3)
+        out = io.StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('ExecutorRollup: 2 counters repaired', out.getvalue())
+        self.assertIn('DailyRollup: 1 counters repaired', out.getvalue())
+        self.assertRollups({1: 1, 2: 1}, 3)
+        self.assertFalse(DailyRollup.objects.filter(day='2000-01-01'))
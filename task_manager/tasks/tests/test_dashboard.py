@@ -0,0 +1,73 @@
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from task_manager.tasks.dashboard import DASHBOARD_DAYS, get_dashboard
+from task_manager.tasks.models import Task
+from .mixins import TaskViewsTestMixin
+
+
+class DashboardTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.api_url = reverse('api_dashboard')
+
+    def test_counts(self):
+        Task.objects.create(name='today', status_id=2, author=self.user)
+        dashboard = get_dashboard()
+        self.assertEqual(dashboard['total'], 4)
+        self.assertEqual([(status['id'], status['task_count'])
+                          for status in dashboard['statuses']],
+                         [(1, 2), (2, 2)])
+        self.assertEqual([(label['id'], label['task_count'])
+                          for label in dashboard['labels']],
+                         [(1, 1), (2, 2)])
+        self.assertEqual([executor['id'] for executor
+                          in dashboard['executors']], [1, 2])
+        self.assertEqual(dashboard['unassigned'], 2)
+        created = dashboard['created']
+        self.assertEqual(len(created), DASHBOARD_DAYS)
+        self.assertEqual(created[-1], {
+            'day': timezone.localdate(
+                timezone=timezone.get_default_timezone()
+            ),
+            'task_count': 1,
+        })
+        self.assertEqual(created[-1]['day'] - created[0]['day'],
+                         timedelta(days=DASHBOARD_DAYS - 1))
+
+    def test_does_not_read_tasks(self):
+        with CaptureQueriesContext(connection) as queries:
+            get_dashboard()
+        self.assertTrue(queries)
+        self.assertFalse([query for query in queries
+                          if 'tasks_task"' in query['sql']])
+
+    def test_cached_until_tasks_change(self):
+        get_dashboard()
+        with CaptureQueriesContext(connection) as queries:
+            get_dashboard()
+        self.assertEqual(len(queries), 0)
+        Task.objects.filter(pk=3).delete()
+        self.assertEqual(get_dashboard()['total'], 2)
+
+    def test_api(self):
+        response = self.client.get(self.api_url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(len(data['created']), DASHBOARD_DAYS)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.api_url).status_code, 401)
+
+    def test_index(self):
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, f"?executor={self.user2.pk}")
+        self.assertEqual(response.context['dashboard']['total'], 3)
+        self.client.logout()
+        response = self.client.get(reverse('index'))
+        self.assertNotIn('dashboard', response.context)
@@ -0,0 +1,210 @@
+import io
+from datetime import timedelta
+from unittest import skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from task_manager.tasks import history
+from task_manager.tasks.bulk import TaskBatch, TaskBulkAction
+from task_manager.tasks.importer import TaskImporter
+from task_manager.tasks.models import Task, TaskEvent
+from .mixins import TaskViewsTestMixin
+
+
+class TaskHistoryTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def events(self, **filters):
+        return list(TaskEvent.objects.filter(**filters).order_by('id')
+                    .values_list('task_id', 'actor', 'action', 'diff'))
+
+    def test_create_update_delete(self):
+        self.client.post(self.task_create_url, {
+            'name': 'audited', 'status': 2, 'labels': [1],
+        })
+        task = Task.objects.get(name='audited')
+        self.assertEqual(self.events(), [(task.pk, 1, TaskEvent.CREATED, {
+            'name': [None, 'audited'], 'status': [None, 2],
+            'labels': [[], [1]],
+        })])
+        self.client.post(reverse('task_update', args=[task.pk]), {
+            'name': 'audited', 'status': 1, 'executor': 2, 'labels': [2],
+        })
+        self.assertEqual(self.events(action=TaskEvent.UPDATED), [
+            (task.pk, 1, TaskEvent.UPDATED, {
+                'status': [2, 1], 'executor': [None, 2],
+                'labels': [[1], [2]],
+            }),
+        ])
+        self.client.post(reverse('task_delete', args=[task.pk]))
+        deleted = self.events(action=TaskEvent.DELETED)[0]
+        self.assertEqual(deleted[3]['name'], ['audited', None])
+
+    def test_unchanged_update_records_nothing(self):
+        self.client.post(self.task_update_url1, {
+            'name': 'Test Task1', 'status': 1, 'executor': 1,
+            'description': Task.objects.get(pk=1).description,
+            'labels': [1, 2],
+        })
+        self.assertEqual(self.events(), [])
+
+    def test_bulk_paths(self):
+        TaskBulkAction(self.user2, Task.objects.filter(pk__in=[1, 2])).run(
+            'status', 2
+        )
+        self.assertEqual(self.events(), [
+            (1, 2, TaskEvent.UPDATED, {'status': [1, 2]}),
+        ])
+        TaskBatch(self.user, [{'id': 3, 'labels': [1]},
+                              {'name': 'batched', 'status': 1}]).run()
+        TaskImporter(self.user).run(
+            io.StringIO('name,status\nimported,Finished\n'), 'csv'
+        )
+        self.assertEqual([(task, action) for task, actor, action, diff
+                          in self.events()[1:]], [
+            (3, TaskEvent.UPDATED),
+            (Task.objects.get(name='batched').pk, TaskEvent.CREATED),
+            (Task.objects.get(name='imported').pk, TaskEvent.CREATED),
+        ])
+
+    def test_timeline_on_detail(self):
+        self.client.post(self.task_update_url1, {
+            'name': 'Test Task1', 'status': 2, 'executor': 2,
+            'labels': [1, 2],
+        })
+        response = self.client.get(self.task_view_url)
+        self.assertEqual(len(response.context['history']), 1)
+        self.assertContains(response, 'In progress → Finished')
+
+    def test_label_changes_on_detail(self):
+        self.client.post(self.task_create_url, {
+            'name': 'Labelled', 'status': 1, 'labels': [1],
+        })
+        task = Task.objects.get(name='Labelled')
+        self.client.post(reverse('task_update', args=[task.pk]), {
+            'name': 'Labelled', 'status': 1, 'labels': [2],
+        })
+        response = self.client.get(reverse('task_detail', args=[task.pk]))
+        self.assertEqual(len(response.context['history']), 2)
+        self.assertContains(response, '−&nbsp;label1')
+        self.assertContains(response, '+&nbsp;label2')
+
+    def test_merge(self):
+        self.assertEqual(history.merge(
+            {'status': [1, 2], 'labels': [[1], [2]]},
+            {'status': [2, 1], 'name': ['a', 'b'], 'labels': [[2, 3], [1]]},
+        ), {'name': ['a', 'b'], 'labels': [[3], []]})
+
+
+class TaskEventMixin(TaskViewsTestMixin):
+
+    def add_event(self, days_ago, diff, task_id=1, actor_id=1):
+        return TaskEvent.objects.create(
+            task_id=task_id, actor_id=actor_id, action=TaskEvent.UPDATED,
+            diff=diff,
+            created_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+
+class TaskHistoryMaintenanceTest(TaskEventMixin, TestCase):
+
+    @override_settings(TASK_HISTORY_MONTHS=12, TASK_HISTORY_COMPACT_DAYS=30)
+    def test_command(self):
+        expired = self.add_event(500, {'status': [1, 2]})
+        for diff in ({'status': [1, 2]}, {'executor': [1, None]},
+                     {'status': [2, 1]}):
+            self.add_event(100, diff)
+        other_actor = self.add_event(100, {'status': [1, 2]}, actor_id=2)
+        recent = [self.add_event(1, {'status': [1, 2]}),
+                  self.add_event(1, {'status': [2, 1]})]
+        out = io.StringIO()
+        call_command('maintain_task_history', stdout=out)
+        self.assertIn('1 expired events removed', out.getvalue())
+        self.assertIn('2 events merged', out.getvalue())
+        remaining = TaskEvent.objects.order_by('id')
+        self.assertNotIn(expired, remaining)
+        self.assertEqual(
+            [event.diff for event in remaining],
+            [{'executor': [1, None]}, other_actor.diff,
+             *(event.diff for event in recent)],
+        )
+
+
+def table_of(event):
+    """The partition an event is stored in."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tableoid::regclass::text FROM tasks_taskevent '
+                       'WHERE id = %s', [event.pk])
+        return cursor.fetchone()[0]
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+class TaskHistoryPartitionTest(TaskEventMixin, TestCase):
+
+    def test_partition_takes_the_rows_of_its_month(self):
+        month = history.month_start(timezone.now(), -1)
+        event = self.add_event(0, {'status': [1, 2]})
+        TaskEvent.objects.filter(pk=event.pk).update(
+            created_at=history.month_bound(month) + timedelta(days=3)
+        )
+        self.assertEqual(table_of(event), 'tasks_taskevent_default')
+        history.create_partition(month)
+        self.assertEqual(history.partitions(),
+                         {month: history.partition_name(month)})
+        self.assertEqual(table_of(event), history.partition_name(month))
+        self.assertEqual(history.timeline(1)[0].pk, event.pk)
+
+    @override_settings(TASK_HISTORY_MONTHS=12, TASK_HISTORY_COMPACT_DAYS=30)
+    def test_expired_partitions_are_dropped(self):
+        expired = history.month_start(timezone.now(), -14)
+        history.create_partition(expired)
+        event = self.add_event(0, {'status': [1, 2]})
+        TaskEvent.objects.filter(pk=event.pk).update(
+            created_at=history.month_bound(expired)
+        )
+        self.assertEqual(table_of(event), history.partition_name(expired))
+        out = io.StringIO()
+        call_command('maintain_task_history', '--months-ahead', '1',
+                     stdout=out)
+        self.assertIn('2 partitions created, 1 expired partitions dropped',
+                      out.getvalue())
+        self.assertEqual(set(history.partitions()), {
+            history.month_start(timezone.now(), n) for n in (0, 1)
+        })
+        self.assertFalse(TaskEvent.objects.filter(pk=event.pk).exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+class TaskEventMigrationTest(TransactionTestCase):
+
+    def partitioning(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, c.relkind, c.relispartition "
+                "FROM pg_class c WHERE c.relname IN "
+                "('tasks_taskevent', 'tasks_taskevent_default') "
+                "ORDER BY c.relname"
+            )
+            return cursor.fetchall()
+
+    def test_migrates_both_ways(self):
+        call_command('migrate', 'tasks', '0006', verbosity=0)
+        self.assertEqual(self.partitioning(), [])
+        call_command('migrate', 'tasks', verbosity=0)
+        self.assertEqual(self.partitioning(), [
+            ('tasks_taskevent', 'p', False),
+            ('tasks_taskevent_default', 'r', True),
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'tasks_taskevent' "
+                "AND column_name = 'task_id'"
+            )
+            # Like the ids of Task.
+            self.assertEqual(cursor.fetchone(), ('bigint',))
@@ -0,0 +1,137 @@
+import io
+import json
+import os
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from unittest import mock
+from task_manager.tasks.importer import TaskImporter
+from .mixins import TaskViewsTestMixin
+
+CSV_ROWS = '''name,description,status,executor,labels
+Imported 1,first,In progress,Hermione,"label1, label2"
+Imported 2,,Finished,,
+Imported 3,,Missing,,
+Test Task1,,Finished,,
+Imported 1,,Finished,,
+Imported 4,,Finished,nobody,
+Imported 5,,Finished,,unknown
+'''
+
+
+class TaskImportCommandTest(TaskViewsTestMixin, TestCase):
+    fixtures = ['users', 'labels', 'statuses', 'tasks']
+
+    def import_file(self, content, suffix, *args):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f'tasks{suffix}')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            out, err = io.StringIO(), io.StringIO()
+            call_command('import_tasks', path, '--author', 'max_payne',
+                         *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv(self):
+        out, err = self.import_file(CSV_ROWS, '.csv')
+        self.assertIn('Imported 2 tasks, 5 rows skipped.', out)
+        self.assertEqual(
+            [line.split(':')[0] for line in err.splitlines()],
+            ['line 4', 'line 7', 'line 8', 'line 5', 'line 6']
+        )
+        task = self.tasks.get(name='Imported 1')
+        self.assertEqual(task.author, self.user)
+        self.assertEqual(task.executor, self.user2)
+        self.assertEqual(task.status.name, 'In progress')
+        self.assertEqual(
+            sorted(task.labels.values_list('name', flat=True)),
+            ['label1', 'label2']
+        )
+        self.assertIsNone(self.tasks.get(name='Imported 2').description)
+
+    def test_import_jsonl(self):
+        rows = [
+            {'name': 'Json 1', 'status': 'Finished', 'labels': ['label1'],
+             'author': 'Hermione'},
+            {'name': 'Json 2', 'status': 'Finished', 'labels': 7},
+        ]
+        content = '\n'.join(map(json.dumps, rows)) + '\nnot json\n'
+        out, err = self.import_file(content, '.jsonl')
+        self.assertIn('Imported 1 tasks, 2 rows skipped.', out)
+        self.assertEqual(self.tasks.get(name='Json 1').author, self.user2)
+
+    def test_import_validates_field_lengths(self):
+        content = f'name,status,description\n{"x" * 256},Finished,\n' \
+                  f'Short,Finished,{"y" * 151}\nFits,Finished,\n'
+        out, err = self.import_file(content, '.csv')
+        self.assertIn('Imported 1 tasks, 2 rows skipped.', out)
+        self.assertEqual(
+            [line.split(':')[0] for line in err.splitlines()],
+            ['line 2', 'line 3']
+        )
+
+    def test_import_reports_a_lost_retry(self):
+        with mock.patch.object(TaskImporter, '_write',
+                               side_effect=IntegrityError):
+            importer = TaskImporter(self.user).run(
+                io.StringIO('name,status\nRaced,Finished\n'), 'csv'
+            )
+        self.assertEqual([line for line, message in importer.errors], [2])
+        self.assertEqual(importer.created, 0)
+
+    def test_import_batches_use_fixed_queries(self):
+        def run(count, batch_size):
+            content = 'name,status,labels\n' + ''.join(
+                f'Batch {count}-{i},Finished,label1\n' for i in range(count)
+            )
+            importer = TaskImporter(self.user, batch_size=batch_size)
+            with CaptureQueriesContext(connection) as queries:
+                importer.run(io.StringIO(content), 'csv')
+            self.assertEqual(importer.created, count)
+            return len(queries)
+
+        self.assertEqual(run(20, 20), run(100, 100))
+        self.assertEqual(self.tasks.get(name='Batch 100-7').labels.count(), 1)
+
+
+class TaskImportViewTest(TaskViewsTestMixin, TestCase):
+    fixtures = ['users', 'labels', 'statuses', 'tasks']
+
+    def setUp(self):
+        super().setUp()
+        self.import_url = reverse('tasks_import')
+
+    def upload(self, content, name='tasks.csv'):
+        return self.client.post(self.import_url, {
+            'file': SimpleUploadedFile(name, content.encode()),
+        })
+
+    def test_anonym_user_import(self):
+        response = self.client.get(self.import_url)
+        self.assertRedirects(response, self.login_url)
+
+    def test_import_success_POST(self):
+        self.client.force_login(self.user2)
+        response = self.upload('name,status\nUploaded,Finished\n')
+        self.assertRedirects(response, self.tasks_url)
+        self.assertEqual(self.tasks.get(name='Uploaded').author, self.user2)
+
+    def test_import_reports_row_errors_POST(self):
+        self.client.force_login(self.user)
+        response = self.upload(CSV_ROWS)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'tasks/import.html')
+        self.assertEqual(len(response.context['importer'].errors), 5)
+        self.assertEqual(self.tasks.filter(name__startswith='Imported')
+                         .count(), 2)
+
+    def test_import_wrong_extension_POST(self):
+        self.client.force_login(self.user)
+        response = self.upload('name,status\nUploaded,Finished\n', 'tasks.xls')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors['file'])
+        self.assertFalse(self.tasks.filter(name='Uploaded').exists())
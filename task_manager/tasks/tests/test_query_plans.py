@@ -0,0 +1,108 @@
+import itertools
+import re
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from task_manager.labels.models import Label
+from task_manager.pagination import KeysetPaginator, keyset_filter
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.filter import TaskFilter
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import TaskIndexView
+
+SEQUENTIAL_SCAN = {
+    'sqlite': re.compile(r'\bSCAN (tasks_task\w*)\b(?! USING)'),
+    'postgresql': re.compile(r'Seq Scan on (tasks_task\w*)'),
+}
+FILTER_VALUES = ('status', 'executor', 'labels', 'author', 'archived')
+
+
+class TaskQueryPlanTest(TestCase):
+    """Every TaskFilter combination must be answered from an index.
+
+    The plans are taken without table statistics on SQLite and with
+    sequential scans penalised on PostgreSQL, so a plan only contains one
+    when no index can serve the query, whatever the table size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = get_user_model().objects
+        people = [users.create(username=f'planner{i}') for i in range(4)]
+        statuses = [Statuses.objects.create(name=f'status {i}')
+                    for i in range(4)]
+        labels = [Label.objects.create(name=f'label {i}') for i in range(4)]
+        cls.user, cls.status, cls.label = people[0], statuses[0], labels[0]
+        tasks = Task.objects.bulk_create(
+            Task(name=f'plan task {i}', status=statuses[i % 4],
+                 author=people[i % 3],
+                 executor=people[i % 4] if i % 5 else None)
+            for i in range(500)
+        )
+        Task.labels.through.objects.bulk_create(
+            Task.labels.through(task_id=task.pk, label_id=label.pk)
+            for index, task in enumerate(tasks)
+            for label in labels[:index % 3]
+        )
+
+    def setUp(self):
+        self.request = RequestFactory().get('/tasks/')
+        self.request.user = self.user
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def filter_combinations(self):
+        values = {
+            'status': self.status.pk,
+            'executor': self.user.pk,
+            'labels': self.label.pk,
+            'author': 'on',
+            'archived': 'on',
+        }
+        for size in range(len(FILTER_VALUES) + 1):
+            for names in itertools.combinations(FILTER_VALUES, size):
+                yield {name: values[name] for name in names}
+
+    def listing_queryset(self, data):
+        queryset = Task.objects.for_listing().order_by(
+            *TaskIndexView.ordering
+        )
+        return TaskFilter(data, queryset=queryset, request=self.request).qs
+
+    def assertNoSequentialScan(self, queryset, data):
+        pattern = SEQUENTIAL_SCAN.get(connection.vendor)
+        if pattern is None:
+            self.skipTest(f'No plan parser for {connection.vendor}')
+        plan = queryset.explain()
+        self.assertIsNone(
+            pattern.search(plan),
+            f'Sequential scan for filter {data}:\n{plan}'
+        )
+
+    def test_filter_combinations_use_indexes(self):
+        for data in self.filter_combinations():
+            with self.subTest(data=data):
+                queryset = self.listing_queryset(data)
+                self.assertNoSequentialScan(queryset[:50], data)
+
+    def test_live_listing_skips_the_archive(self):
+        queryset = self.listing_queryset(None)[:50]
+        self.assertNoSequentialScan(queryset, None)
+        self.assertIn('task_live_created_idx', queryset.explain())
+
+    def test_search_uses_indexes(self):
+        if connection.vendor != 'postgresql':
+            self.skipTest('Substring fallback outside PostgreSQL')
+        data = {'q': 'plan task 42'}
+        self.assertNoSequentialScan(self.listing_queryset(data)[:50], data)
+
+    def test_next_page_uses_indexes(self):
+        anchor = Task.objects.order_by('created_at', 'pk')[100]
+        for data in self.filter_combinations():
+            with self.subTest(data=data):
+                paginator = KeysetPaginator(self.listing_queryset(data), 50)
+                queryset = paginator.queryset.filter(keyset_filter(
+                    paginator.keys, paginator.row_values(anchor)
+                ))
+                self.assertNoSequentialScan(queryset[:50], data)
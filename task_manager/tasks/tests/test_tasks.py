@@ -1,4 +1,12 @@
+import csv
+import io
+import json
+import threading
+from asgiref.sync import sync_to_async
+from unittest import mock, skipUnless
 from django.test import TestCase
+from task_manager.tasks.export import export_rows
+from task_manager.tasks.filter import TaskFilter
 from task_manager.tasks.forms import TaskForm
 from django.urls import reverse, resolve
 from task_manager.tasks.views import (
@@ -9,6 +17,14 @@ from task_manager.tasks.views import (
     TaskDeleteView
 )
 from django.contrib import auth
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from task_manager.statuses.models import Statuses
+from task_manager.tasks.models import Task
+from task_manager.templatetags.task_rows import row_keys
 from .mixins import (
     TaskViewsTestMixin,
     TaskCreationFormTestMixin
@@ -234,3 +250,494 @@ class TaskViewsTest(TaskViewsTestMixin, TestCase):
         response = self.client.get(self.task_view_url)
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, self.login_url)
+
+
+class TaskListingQueriesTest(TaskViewsTestMixin, TestCase):
+    fixtures = ['users', 'labels', 'statuses', 'tasks']
+
+    def count_index_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.tasks_url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_index_query_count_does_not_grow_with_rows(self):
+        self.client.force_login(self.user)
+        self.count_index_queries()
+        initial = self.count_index_queries()
+        Task.objects.bulk_create(
+            Task(name=f'bulk task {i}', status_id=1 + i % 2,
+                 author=self.user, executor=self.user2)
+            for i in range(20)
+        )
+        self.assertEqual(self.count_index_queries(), initial)
+
+    def test_for_listing_joins_related_rows(self):
+        tasks = list(Task.objects.for_listing().order_by('pk'))
+        with self.assertNumQueries(0):
+            rows = [
+                (str(task.status), task.author.get_full_name(),
+                 task.executor.get_full_name() if task.executor else '')
+                for task in tasks
+            ]
+        self.assertEqual(rows[0], ('In progress', 'Max Smith', 'Max Smith'))
+
+    def test_for_listing_prefetches_labels_on_demand(self):
+        with self.assertNumQueries(2):
+            tasks = list(
+                Task.objects.for_listing(with_labels=True).order_by('pk')
+            )
+            labels = [[label.name for label in task.labels.all()]
+                      for task in tasks]
+        self.assertEqual(len(labels[0]), 2)
+        self.assertEqual(labels[2], [])
+
+
+class TaskPaginationTest(TaskViewsTestMixin, TestCase):
+    fixtures = ['users', 'labels', 'statuses', 'tasks']
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        Task.objects.bulk_create(
+            Task(name=f'paged task {i:03}', status_id=1 + i % 2,
+                 author=self.user)
+            for i in range(117)
+        )
+
+    def walk(self, params=None, direction='next'):
+        seen = []
+        query = QueryDict(mutable=True)
+        query.update(params or {})
+        while True:
+            response = self.client.get(f'{self.tasks_url}?{query.urlencode()}')
+            self.assertEqual(response.status_code, 200)
+            seen.append([task.pk for task in response.context['tasks']])
+            page = response.context['page_obj']
+            if not getattr(page, f'has_{direction}')():
+                return seen, page
+            query = QueryDict(getattr(page, f'{direction}_query'),
+                              mutable=True)
+
+    def test_pages_cover_all_rows_once(self):
+        pages, _ = self.walk()
+        ids = [pk for page in pages for pk in page]
+        expected = list(Task.objects.order_by('created_at', 'pk')
+                        .values_list('pk', flat=True))
+        self.assertEqual([len(page) for page in pages], [50, 50, 20])
+        self.assertEqual(ids, expected)
+
+    def test_walking_back_returns_the_same_pages(self):
+        forward, last = self.walk()
+        query = QueryDict(last.previous_query)
+        response = self.client.get(f'{self.tasks_url}?{query.urlencode()}')
+        self.assertEqual([task.pk for task in response.context['tasks']],
+                         forward[1])
+
+    def test_pagination_keeps_filter_params(self):
+        pages, _ = self.walk({'status': 1})
+        ids = [pk for page in pages for pk in page]
+        self.assertEqual(len(ids), Task.objects.filter(status=1).count())
+        self.assertEqual(len(set(ids)), len(ids))
+        response = self.client.get(self.tasks_url, {'status': 1})
+        self.assertIn('status=1',
+                      response.context['page_obj'].next_query)
+
+    def test_inserts_do_not_shift_next_page(self):
+        response = self.client.get(self.tasks_url)
+        first = [task.pk for task in response.context['tasks']]
+        next_query = response.context['page_obj'].next_query
+        early = Task.objects.create(name='early task', status_id=1,
+                                    author=self.user)
+        Task.objects.filter(pk=early.pk).update(
+            created_at=Task.objects.get(pk=first[0]).created_at
+        )
+        response = self.client.get(f'{self.tasks_url}?{next_query}')
+        second = [task.pk for task in response.context['tasks']]
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(second[0], first[-1] + 1)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.tasks_url, {'cursor': 'broken'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_sorted_pages_cover_all_rows_once(self):
+        pages, _ = self.walk({'sort_by': '-created_at'})
+        ids = [pk for page in pages for pk in page]
+        self.assertEqual(ids, list(Task.objects.order_by(
+            '-created_at', '-pk').values_list('pk', flat=True)))
+        self.assertEqual(ids[-3:], [3, 2, 1])
+
+    def test_cursor_from_other_sort_is_rejected(self):
+        response = self.client.get(self.tasks_url, {'sort_by': 'name'})
+        next_query = response.context['page_obj'].next_query.replace(
+            'sort_by=name', 'sort_by=created_at')
+        response = self.client.get(f'{self.tasks_url}?{next_query}')
+        self.assertEqual(response.status_code, 404)
+
+    def test_sort_headers_drop_cursor(self):
+        response = self.client.get(self.tasks_url, {'status': 1})
+        next_query = response.context['page_obj'].next_query
+        response = self.client.get(f'{self.tasks_url}?{next_query}')
+        self.assertContains(response, 'href="?status=1&amp;sort_by=name"')
+        self.assertNotContains(response, 'cursor=&amp;sort_by')
+
+
+class TaskChoiceCacheTest(TaskViewsTestMixin, TestCase):
+    fixtures = ['users', 'labels', 'statuses', 'tasks']
+
+    def render_forms(self):
+        TaskForm().as_p()
+        TaskFilter({}, queryset=Task.objects.all()).form.as_p()
+
+    def test_warm_cache_renders_without_queries(self):
+        self.render_forms()
+        with self.assertNumQueries(0):
+            self.render_forms()
+
+    def test_choices_match_database(self):
+        form = TaskForm()
+        self.assertEqual(
+            list(form.fields['executor'].choices)[1:],
+            [(user.pk, user.get_full_name())
+             for user in self.users_model.objects.order_by('pk')]
+        )
+        self.assertEqual(
+            [pk for pk, _ in form.fields['labels'].choices],
+            [1, 2]
+        )
+
+    def test_status_write_invalidates_choices(self):
+        self.render_forms()
+        status = Statuses.objects.create(name='fresh status')
+        self.assertIn((status.pk, 'fresh status'),
+                      list(TaskForm().fields['status'].choices))
+        status.delete()
+        self.assertNotIn((status.pk, 'fresh status'),
+                         list(TaskForm().fields['status'].choices))
+
+    def test_user_rename_invalidates_executors(self):
+        self.render_forms()
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        choices = TaskFilter({}, queryset=Task.objects.all()).form.fields[
+            'executor'].choices
+        self.assertIn((self.user.pk, 'Renamed Smith'), list(choices))
+
+    def test_login_keeps_cache_warm(self):
+        self.user.set_password('secret')
+        self.user.save()
+        self.render_forms()
+        self.assertTrue(
+            self.client.login(username='max_payne', password='secret')
+        )
+        with self.assertNumQueries(0):
+            self.render_forms()
+
+    def test_submitted_values_are_still_validated(self):
+        self.render_forms()
+        form = TaskForm({'name': 'task', 'status': 999})
+        self.assertFalse(form.is_valid())
+        self.assertTrue(form.errors['status'])
+
+
+class TaskExportTest(TaskViewsTestMixin, TestCase):
+    fixtures = ['users', 'labels', 'statuses', 'tasks']
+
+    def setUp(self):
+        super().setUp()
+        self.csv_url = reverse('tasks_export', kwargs={'fmt': 'csv'})
+        self.jsonl_url = reverse('tasks_export', kwargs={'fmt': 'jsonl'})
+
+    def test_anonym_user_export(self):
+        response = self.client.get(self.csv_url)
+        self.assertRedirects(response, self.login_url)
+
+    def test_export_csv(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.csv_url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'],
+                         'attachment; filename="tasks.csv"')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['id'] for row in rows], ['1', '2', '3'])
+        self.assertEqual(rows[0]['status'], 'In progress')
+        self.assertEqual(rows[0]['executor'], 'max_payne')
+        self.assertEqual(rows[1]['executor'], '')
+        self.assertEqual(len(rows[0]['labels'].split(', ')), 2)
+
+    def test_export_jsonl_uses_task_filter(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.jsonl_url,
+                                   {'status': 1, 'author': 'on'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], [1])
+        self.assertEqual(rows[0]['author'], 'max_payne')
+
+    def test_export_reads_in_chunks(self):
+        self.client.force_login(self.user)
+        Task.objects.bulk_create(
+            Task(name=f'export task {i}', status_id=1, author=self.user)
+            for i in range(30)
+        )
+        # One cursor over the tasks, one labels query per chunk of ten.
+        with self.assertNumQueries(5):
+            rows = list(export_rows(
+                Task.objects.for_export().order_by('pk'), chunk_size=10
+            ))
+        self.assertEqual(len(rows), 33)
+
+    def test_export_invalid_filter(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.csv_url, {'status': 999})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_unknown_format(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('tasks_export', kwargs={'fmt': 'xml'})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_export_streams_asynchronously_under_asgi(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(self.jsonl_url)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        lines = b''.join(chunks).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines],
+                         [1, 2, 3])
+
+
+class TaskAsyncViewsTest(TaskViewsTestMixin, TestCase):
+
+    def test_task_views_are_async(self):
+        for view in (TaskDetailView, TaskDeleteView):
+            with self.subTest(view=view.__name__):
+                self.assertTrue(view.view_is_async)
+        # One thread hop for the whole list beats one per query.
+        self.assertFalse(TaskIndexView.view_is_async)
+
+    async def login(self, user):
+        await sync_to_async(self.async_client.force_login)(user)
+
+    async def test_index_under_asgi(self):
+        await self.login(self.user)
+        response = await self.async_client.get(self.tasks_url,
+                                               {'status': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task.name for task in response.context['tasks']],
+                         ['Test Task1', 'Test Task3'])
+
+    async def test_index_invalid_cursor_under_asgi(self):
+        await self.login(self.user)
+        response = await self.async_client.get(self.tasks_url,
+                                               {'cursor': 'junk'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_anonym_user_index_under_asgi(self):
+        response = await self.async_client.get(self.tasks_url)
+        self.assertRedirects(response, self.login_url,
+                             fetch_redirect_response=False)
+
+    async def test_detail_under_asgi(self):
+        await self.login(self.user)
+        response = await self.async_client.get(self.task_view_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Test Task1')
+        missing = reverse('task_detail', kwargs={'pk': 100})
+        response = await self.async_client.get(missing)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_detail_keeps_cache_io_off_the_event_loop(self):
+        await self.login(self.user)
+        loop_thread, threads = threading.current_thread(), []
+        get = cache.get
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return get(*args, **kwargs)
+
+        with mock.patch.object(cache, 'get', record_thread):
+            response = await self.async_client.get(self.task_view_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(threads)
+        self.assertNotIn(loop_thread, threads)
+
+    async def test_delete_under_asgi(self):
+        await self.login(self.user2)
+        response = await self.async_client.post(self.task_delete_url1)
+        self.assertRedirects(response, self.tasks_url,
+                             fetch_redirect_response=False)
+        self.assertTrue(await self.tasks.filter(pk=1).aexists())
+        await self.login(self.user)
+        response = await self.async_client.post(self.task_delete_url1)
+        self.assertRedirects(response, self.tasks_url,
+                             fetch_redirect_response=False)
+        self.assertFalse(await self.tasks.filter(pk=1).aexists())
+
+
+class TaskSearchTest(TaskViewsTestMixin, TestCase):
+
+    def search(self, params):
+        self.client.force_login(self.user)
+        response = self.client.get(self.tasks_url, params)
+        return sorted(task.name for task in response.context['tasks'])
+
+    def test_search_matches_name_and_description(self):
+        self.assertEqual(self.search({'q': 'task2'}), ['Test Task2'])
+        self.assertEqual(self.search({'q': 'description for'}),
+                         ['Test Task1'])
+
+    def test_search_combines_with_filters(self):
+        self.assertEqual(self.search({'q': 'test', 'status': 1}),
+                         ['Test Task1', 'Test Task3'])
+        # Not 'task1': with nothing matching in the status, PostgreSQL
+        # forgives it as a typo of 'Task2'.
+        self.assertEqual(self.search({'q': 'description for', 'status': 2}),
+                         [])
+
+    def test_blank_search_is_ignored(self):
+        self.assertEqual(len(self.search({'q': '  '})), 3)
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL search')
+    def test_typos_are_forgiven_when_nothing_matches(self):
+        self.assertEqual(self.search({'q': 'tassk2'}), ['Test Task2'])
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL search')
+    def test_typos_are_forgiven_among_the_filtered_tasks(self):
+        Task.objects.create(name='Tassk2 notes', status_id=1, author_id=1,
+                            archived_at=timezone.now())
+        self.assertEqual(self.search({'q': 'tassk2'}), ['Test Task2'])
+        self.assertEqual(self.search({'q': 'tassk2', 'archived': 'on'}),
+                         ['Tassk2 notes'])
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL search')
+    def test_search_vector_is_maintained_by_trigger(self):
+        Task.objects.bulk_create([
+            Task(name='Invoice reconciliation', status_id=1, author_id=1),
+        ])
+        self.assertEqual(
+            list(Task.objects.search('reconciliation')
+                 .values_list('name', flat=True)),
+            ['Invoice reconciliation']
+        )
+        Task.objects.filter(name='Invoice reconciliation').update(
+            description='quarterly closing'
+        )
+        self.assertEqual(Task.objects.search('closing').count(), 1)
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL search')
+    def test_search_tolerates_typos_in_name(self):
+        Task.objects.create(name='Quarterly report', status_id=1,
+                            author_id=1)
+        self.assertIn('Quarterly report',
+                      self.search({'q': 'quartely report'}))
+
+
+class TaskConditionalGetTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def revalidate(self, url, response, **params):
+        with CaptureQueriesContext(connection) as queries:
+            revalidated = self.client.get(
+                url, params, headers={'If-None-Match': response['ETag']}
+            )
+        touched = [query for query in queries
+                   if 'tasks_task' in query['sql']]
+        return revalidated, touched
+
+    def test_unchanged_pages_are_not_modified(self):
+        for url in (self.tasks_url, self.task_view_url,
+                    reverse('statuses'), reverse('labels')):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(response.has_header('Last-Modified'))
+                self.assertIn('no-cache', response['Cache-Control'])
+                revalidated, touched = self.revalidate(url, response)
+                self.assertEqual(revalidated.status_code, 304)
+                self.assertEqual(touched, [])
+
+    def test_writes_change_the_etag(self):
+        response = self.client.get(reverse('statuses'))
+        self.tasks.get(pk=2).labels.add(1)
+        revalidated, _ = self.revalidate(reverse('statuses'), response)
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertNotEqual(revalidated['ETag'], response['ETag'])
+
+    def test_etag_varies_with_user_and_query(self):
+        response = self.client.get(self.tasks_url)
+        revalidated, _ = self.revalidate(self.tasks_url, response,
+                                         status=1)
+        self.assertEqual(revalidated.status_code, 200)
+        self.client.force_login(self.user2)
+        revalidated, _ = self.revalidate(self.tasks_url, response)
+        self.assertEqual(revalidated.status_code, 200)
+
+    def test_etag_varies_with_session(self):
+        # Logging in again rotates the CSRF secret of the bulk action form.
+        response = self.client.get(self.tasks_url)
+        self.client.logout()
+        self.client.force_login(self.user)
+        revalidated, _ = self.revalidate(self.tasks_url, response)
+        self.assertEqual(revalidated.status_code, 200)
+
+    def test_pending_messages_are_rendered(self):
+        response = self.client.get(self.tasks_url)
+        # Refused without changes, so only the flash message is new.
+        self.client.post(reverse('task_delete', kwargs={'pk': 3}))
+        revalidated, _ = self.revalidate(self.tasks_url, response)
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertEqual(len(revalidated.context['messages']), 1)
+        revalidated, _ = self.revalidate(self.tasks_url, response)
+        self.assertEqual(revalidated.status_code, 304)
+
+    async def test_not_modified_under_asgi(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(self.tasks_url)
+        revalidated = await self.async_client.get(
+            self.tasks_url, headers={'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+
+class TaskRowCacheTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def rows(self, **headers):
+        return self.client.get(self.tasks_url, headers=headers).content
+
+    def test_rows_are_served_from_cache(self):
+        self.rows()
+        keys = row_keys(self.tasks.all())
+        self.assertEqual(len(cache.get_many(keys.values())), 3)
+        cache.set(keys[1], '<tr><td>cached row</td></tr>')
+        self.assertIn(b'cached row', self.rows())
+
+    def test_edits_invalidate_rows(self):
+        self.rows()
+        self.tasks.get(pk=1).save()
+        Statuses.objects.filter(pk=2).get().save()
+        self.user2.first_name = 'Renamed'
+        self.user2.save()
+        cached = cache.get_many(row_keys(self.tasks.all()).values())
+        self.assertEqual(cached, {})
+
+    def test_task_edit_is_rendered(self):
+        self.rows()
+        self.client.post(self.task_update_url2, {
+            'name': 'Edited Task2', 'status': 2,
+        })
+        self.assertIn(b'Edited Task2', self.rows())
+
+    def test_rows_vary_with_language(self):
+        self.assertIn('Изменить'.encode(), self.rows())
+        self.assertIn(b'>Change<', self.rows(accept_language='en'))
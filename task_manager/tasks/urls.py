@@ -4,12 +4,23 @@ from task_manager.tasks.views import (
     TaskCreateView,
     TaskUpdateView,
     TaskDeleteView,
-    TaskDetailView
+    TaskDetailView,
+    TaskBoardView,
+    TaskBoardColumnView,
+    TaskBulkActionView,
+    TaskExportView,
+    TaskImportView
 )
 
 urlpatterns = [
     path('', TaskIndexView.as_view(), name='tasks'),
     path('create/', TaskCreateView.as_view(), name='task_create'),
+    path('board/', TaskBoardView.as_view(), name='task_board'),
+    path('board/<int:status>/', TaskBoardColumnView.as_view(),
+         name='task_board_column'),
+    path('export.<str:fmt>', TaskExportView.as_view(), name='tasks_export'),
+    path('import/', TaskImportView.as_view(), name='tasks_import'),
+    path('bulk/', TaskBulkActionView.as_view(), name='tasks_bulk'),
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='task_update'),
     path('<int:pk>/delete/', TaskDeleteView.as_view(), name='task_delete'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task_detail'),
@@ -1,16 +1,37 @@
+import io
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from . import history
 from .models import Task
-from task_manager.access_mixins import LoginRequireMixin
-from .forms import TaskForm
+from task_manager.access_mixins import (
+    AsyncLoginRequireMixin,
+    LoginRequireMixin,
+)
+from task_manager.view_mixins import (
+    AsyncConditionalGetMixin,
+    AsyncDeleteViewMixin,
+    AsyncDetailViewMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    SortableMixin,
+)
+from .board import BOARD_CARDS, BOARD_ORDERING, board_columns
+from .bulk import TaskBulkAction
+from .choices import get_choices
+from .forms import TaskBulkForm, TaskForm, TaskImportForm
+from .importer import TaskImporter
 from .filter import TaskFilter
-from django_filters.views import FilterView
-from django.urls import reverse_lazy
+from .export import EXPORT_FORMATS, export_rows
+from django_filters.views import FilterMixin, FilterView
+from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext_lazy as _
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.contrib.messages.views import SuccessMessageMixin
-from django.views.generic.edit import CreateView, UpdateView, DeleteView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views.generic.edit import CreateView, FormView, UpdateView
 from django.contrib import messages
-from django.views.generic import DetailView
+from django.views.generic import TemplateView, View
 from django.shortcuts import redirect
+from django.http import Http404, HttpResponseBadRequest
+from task_manager.streaming import stream_response
 
 
 class FlashedLoginRequiredMixin(LoginRequiredMixin):
@@ -28,15 +49,197 @@ class TaskAbstractMixin(LoginRequireMixin):
     form_class = TaskForm
 
 
-class TaskIndexView(TaskAbstractMixin, FilterView):
+class TaskAsyncMixin(AsyncLoginRequireMixin):
     model = Task
+    login_url = "/login/"
+    success_url = reverse_lazy('tasks')
+    version_tables = ('tasks', 'statuses', 'labels', 'users')
+
+
+class TaskIndexView(TaskAbstractMixin, ConditionalGetMixin,
+                    KeysetPaginationMixin, SortableMixin, FilterView):
+    # Synchronous on purpose: the filter form, the page and the next-page
+    # check run in one worker thread instead of a thread hop each.
+    ordering = ['created_at', 'pk']
+    sortable_columns = {
+        'id': 'pk',
+        'name': 'name',
+        'created_at': 'created_at',
+    }
     template_name = 'tasks/index.html'
+    version_tables = TaskAsyncMixin.version_tables
+    read_from_replica = True
     context_object_name = 'tasks'
     filterset_class = TaskFilter
     filter_set = TaskFilter
+    listing_with_labels = False
+
+    def get_queryset(self):
+        return super().get_queryset().for_listing(
+            with_labels=self.listing_with_labels
+        )
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(bulk_form=TaskBulkForm(), **kwargs)
+
+
+class TaskBoardMixin(TaskAbstractMixin, ConditionalGetMixin):
+    filterset_class = TaskFilter
+    version_tables = TaskAsyncMixin.version_tables
+    read_from_replica = True
+
+
+class TaskBoardView(TaskBoardMixin, FilterMixin, TemplateView):
+    """Tasks in a column per status, filtered by TaskFilter.
+
+    The first BOARD_CARDS cards of every column and the column sizes come
+    from a single windowed query, see board.py.
+    """
+    template_name = 'tasks/board.html'
+
+    def get_queryset(self):
+        return Task.objects.for_listing()
+
+    def get_context_data(self, **kwargs):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            queryset = filterset.queryset.none()
+        else:
+            queryset = filterset.qs
+        columns = board_columns(queryset, get_choices('statuses'),
+                                params=self.request.GET)
+        return super().get_context_data(filter=filterset, columns=columns,
+                                        **kwargs)
+
+
+class TaskBoardColumnView(TaskBoardMixin, KeysetPaginationMixin,
+                          FilterView):
+    """The cards of one board column past the first page."""
+    template_name = 'tasks/board_column.html'
+    context_object_name = 'tasks'
+    paginate_by = BOARD_CARDS
+    ordering = BOARD_ORDERING
+
+    def get_queryset(self):
+        statuses = dict(get_choices('statuses'))
+        if self.kwargs['status'] not in statuses:
+            raise Http404(f"Unknown status: {self.kwargs['status']}")
+        self.status_name = statuses[self.kwargs['status']]
+        return super().get_queryset().for_listing().filter(
+            status=self.kwargs['status']
+        )
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(status_name=self.status_name,
+                                        **kwargs)
+
+
+class TaskExportView(TaskAbstractMixin, FilterMixin, View):
+    filterset_class = TaskFilter
+
+    def get_queryset(self):
+        return Task.objects.for_export().order_by('created_at', 'pk')
+
+    def get(self, request, *args, **kwargs):
+        if kwargs['fmt'] not in EXPORT_FORMATS:
+            raise Http404(f"Unknown export format: {kwargs['fmt']}")
+        render_lines, content_type = EXPORT_FORMATS[kwargs['fmt']]
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            return HttpResponseBadRequest(filterset.errors.as_json(),
+                                          content_type='application/json')
+        return stream_response(request, render_lines(export_rows(filterset.qs)),
+                               content_type, f"tasks.{kwargs['fmt']}")
+
+
+class TaskImportView(TaskAbstractMixin, FormView):
+    template_name = 'tasks/import.html'
+    form_class = TaskImportForm
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        importer = TaskImporter(self.request.user)
+        try:
+            importer.run(stream, upload.format)
+        except UnicodeDecodeError:
+            form.add_error('file', _('The file must be UTF-8 encoded.'))
+        finally:
+            stream.detach()
+        if importer.created:
+            messages.success(
+                self.request,
+                _('Tasks imported: %(count)d.') % {'count': importer.created}
+            )
+        if form.errors or importer.errors:
+            return self.render_to_response(
+                self.get_context_data(form=form, importer=importer)
+            )
+        return redirect(self.success_url)
+
+
+class TaskBulkActionView(TaskAbstractMixin, FilterMixin, FormView):
+    """Apply a bulk action from the task list, see bulk.TaskBulkAction.
+
+    The query string carries the list's filter, which picks the tasks
+    when the action is for all matching tasks.
+    """
+    http_method_names = ['post']
+    form_class = TaskBulkForm
+    filterset_class = TaskFilter
+
+    def get_queryset(self):
+        return Task.objects.all()
+
+    def get_success_url(self):
+        query = self.request.GET.urlencode()
+        return f"{reverse('tasks')}?{query}" if query else reverse('tasks')
+
+    def get_tasks(self, form):
+        if not form.cleaned_data['all_matching']:
+            return form.cleaned_data['tasks']
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            return Task.objects.none()
+        return filterset.qs
+
+    def form_valid(self, form):
+        action = form.cleaned_data['action']
+        bulk = TaskBulkAction(self.request.user, self.get_tasks(form)).run(
+            action, form.get_value()
+        )
+        counts = {'changed': bulk.changed, 'selected': bulk.selected}
+        if action != 'delete':
+            message = _('Tasks changed: %(changed)d of %(selected)d.')
+        elif bulk.changed == bulk.selected:
+            message = _('Tasks deleted: %(changed)d of %(selected)d.')
+        else:
+            message = _('Tasks deleted: %(changed)d of %(selected)d. '
+                        'Only the author of a task can delete it.')
+        messages.success(self.request, message % counts)
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        messages.error(self.request, ' '.join(
+            error for errors in form.errors.values() for error in errors
+        ))
+        return redirect(self.get_success_url())
 
 
-class TaskCreateView(TaskAbstractMixin, CreateView):
+class TaskHistoryMixin:
+    """Record the change a task form saves in the task's history."""
+
+    def form_valid(self, form):
+        pk = form.instance.pk
+        with transaction.atomic():
+            before = history.snapshots([pk]) if pk is not None else {}
+            response = super().form_valid(form)
+            history.record(self.request.user, before,
+                           history.snapshots([self.object.pk]))
+        return response
+
+
+class TaskCreateView(TaskAbstractMixin, TaskHistoryMixin, CreateView):
     template_name = 'tasks/create.html'
 
     def form_valid(self, form):
@@ -50,36 +253,58 @@ class TaskCreateView(TaskAbstractMixin, CreateView):
         return reverse_lazy('tasks')
 
 
-class TaskUpdateView(TaskAbstractMixin, UpdateView):
+class TaskUpdateView(TaskAbstractMixin, TaskHistoryMixin, UpdateView):
     template_name = 'tasks/update.html'
 
+    def form_valid(self, form):
+        # Editing an archived task brings it back to the list.
+        form.instance.archived_at = None
+        return super().form_valid(form)
+
     def get_success_url(self):
         messages.success(self.request,
                          _('Tasks has been updated successfully.'))
         return reverse_lazy('tasks')
 
 
-class TaskDeleteView(LoginRequireMixin,
-                     UserPassesTestMixin,
-                     SuccessMessageMixin, DeleteView):
-    model = Task
-    login_url = "/login/"
+class TaskDeleteView(TaskAsyncMixin, AsyncDeleteViewMixin):
     template_name = 'tasks/delete.html'
-    success_message = _('Task deleted successfully')
 
-    def test_func(self):
-        return self.request.user == self.get_object().author
+    def test_object(self, task):
+        return task.author_id == self.request.user.pk
 
     def handle_no_permission(self):
         messages.error(self.request,
                        _("Task can be deleted only by it's author"))
         return redirect(reverse_lazy('tasks'))
 
+    def delete_task(self):
+        with transaction.atomic():
+            before = history.snapshots([self.object.pk])
+            self.object.delete()
+            history.record(self.request.user, before, {})
+
+    async def delete_object(self):
+        await sync_to_async(self.delete_task)()
+
     def get_success_url(self):
         messages.success(self.request,
                          _('Task deleted successfully'))
         return reverse_lazy('tasks')
 
 
-class TaskDetailView(TaskAbstractMixin, DetailView):
+class TaskDetailView(TaskAsyncMixin, AsyncConditionalGetMixin,
+                     AsyncDetailViewMixin):
     template_name = 'tasks/detail.html'
+    read_from_replica = True
+
+    def get_queryset(self):
+        return Task.objects.select_related(
+            'status', 'author', 'executor'
+        ).prefetch_related('labels')
+
+    def get_context_data(self, **kwargs):
+        # Evaluated while the template renders, in a worker thread.
+        return super().get_context_data(
+            history=history.timeline(self.object.pk), **kwargs
+        )
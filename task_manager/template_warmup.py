@@ -0,0 +1,36 @@
+from pathlib import Path
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+
+
+def project_templates():
+    """Yield the names of the templates in task_manager/templates."""
+    root = Path(apps.get_app_config('task_manager').path) / 'templates'
+    for path in sorted(root.rglob('*.html')):
+        yield path.relative_to(root).as_posix()
+
+
+def compile_templates():
+    """Load every project template through the Django template engine.
+
+    The cached loader keeps the compiled templates for the life of the
+    process. Returns ``{name: error}`` for templates that do not compile.
+    """
+    engine = engines['django']
+    errors = {}
+    for name in project_templates():
+        try:
+            engine.get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+            errors[name] = error
+    return errors
+
+
+def warm_templates():
+    """Compile the templates at worker boot, refusing to start on errors."""
+    errors = compile_templates()
+    if errors:
+        raise ImproperlyConfigured('Templates do not compile: ' + '; '.join(
+            f'{name}: {error}' for name, error in errors.items()
+        ))
@@ -0,0 +1,24 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('sort_header.html', takes_context=True)
+def sort_header(context, column, title):
+    view = context.get('view')
+    if column not in getattr(view, 'sortable_columns', {}):
+        return {'title': title}
+    sort = view.get_sort()
+    active = sort is not None and sort[0] == column
+    descending = active and sort[1]
+    params = context['request'].GET.copy()
+    params.pop(getattr(view, 'cursor_kwarg', 'cursor'), None)
+    params[view.sort_kwarg] = (
+        f'-{column}' if active and not descending else column
+    )
+    return {
+        'title': title,
+        'url': f'?{params.urlencode()}',
+        'active': active,
+        'descending': descending,
+    }
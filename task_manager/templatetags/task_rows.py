@@ -0,0 +1,54 @@
+from django import template
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import get_language
+from task_manager.cache_versions import get_versions
+
+register = template.Library()
+
+ROW_TEMPLATE = 'tasks/row.html'
+ROW_TIMEOUT = 24 * 60 * 60
+# Bump when row.html changes, so rows cached by an older release are not
+# served after a deploy.
+ROW_MARKUP_VERSION = 2
+# Tables other than tasks whose rows show up in a task row.
+ROW_TABLES = ('statuses', 'labels', 'users')
+
+
+def row_keys(tasks):
+    """Return ``{task pk: fragment cache key}`` for the rows of ``tasks``.
+
+    A key changes with the task's updated_at, any status, label or user
+    edit, and the active language and timezone.
+    """
+    context = ':'.join(map(str, (
+        ROW_MARKUP_VERSION, *get_versions(*ROW_TABLES),
+        get_language(), get_current_timezone_name(),
+    )))
+    return {
+        task.pk: f'task-row:{task.pk}:{task.updated_at.timestamp()}:{context}'
+        for task in tasks
+    }
+
+
+@register.simple_tag
+def task_rows(tasks):
+    """Render the task list rows, reusing the cached markup of each row.
+
+    The whole page is read with one get_many and the missing rows are
+    stored with one set_many.
+    """
+    keys = row_keys(tasks)
+    cached = cache.get_many(keys.values())
+    row_template = get_template(ROW_TEMPLATE)
+    rows, rendered = [], {}
+    for task in tasks:
+        key = keys[task.pk]
+        row = cached.get(key)
+        if row is None:
+            row = rendered[key] = row_template.render({'task': task})
+        rows.append(row)
+    cache.set_many(rendered, ROW_TIMEOUT)
+    return mark_safe(''.join(rows))
@@ -0,0 +1,129 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import rollbar
+from django.test import TestCase, override_settings
+from task_manager import error_reporting
+from task_manager.error_reporting import ErrorReporter, RateLimiter
+from task_manager.tasks.tests.mixins import TaskViewsTestMixin
+from task_manager.tasks.views import TaskIndexView
+
+
+class StubRollbar(ThreadingHTTPServer):
+    """Local stand-in for the Rollbar item API."""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubRollbarHandler)
+        self.items = []
+        self.released = threading.Event()
+        self.released.set()
+
+    @property
+    def endpoint(self):
+        return f'http://127.0.0.1:{self.server_port}/api/1/'
+
+
+class StubRollbarHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        self.server.released.wait(5)
+        length = int(self.headers['Content-Length'])
+        self.server.items.append(json.loads(self.rfile.read(length)))
+        body = json.dumps({'err': 0, 'result': {'uuid': 'stub'}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def raise_error(*args, **kwargs):
+    raise RuntimeError('boom')
+
+
+class RateLimiterTest(TestCase):
+
+    def test_repeats_are_held_back_and_counted(self):
+        limiter = RateLimiter(limit=2, window=60)
+        self.assertEqual(limiter.admit('a', now=0), 0)
+        self.assertEqual(limiter.admit('a', now=1), 0)
+        self.assertIsNone(limiter.admit('a', now=2))
+        self.assertIsNone(limiter.admit('a', now=3))
+        self.assertEqual(limiter.admit('b', now=3), 0)
+        self.assertEqual(limiter.suppressed(), 2)
+        self.assertEqual(limiter.admit('a', now=61), 2)
+        self.assertEqual(limiter.suppressed(), 0)
+
+
+class ErrorReporterTest(TestCase):
+
+    def test_full_queue_drops(self):
+        posting = threading.Event()
+        release = threading.Event()
+
+        def send(payload, access_token):
+            posting.set()
+            release.wait(5)
+
+        reporter = ErrorReporter(RateLimiter(5, 60), maxsize=1, send=send)
+        reporter.submit({'data': 1})
+        self.assertTrue(posting.wait(5))
+        with self.assertLogs('task_manager.error_reporting', 'WARNING'):
+            results = [reporter.submit({'data': n}) for n in range(3)]
+        self.assertEqual(results, [False] * 3)
+        self.assertEqual(reporter.stats()['dropped'], 2)
+        release.set()
+        self.assertTrue(reporter.flush())
+        self.assertEqual(reporter.stats()['sent'], 2)
+
+
+@override_settings(ROLLBAR={'access_token': 'token', 'enabled': True,
+                            'handler': 'blocking', 'environment': 'test',
+                            'suppress_reinit_warning': True})
+class ErrorReportingMiddlewareTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.stub = StubRollbar()
+        threading.Thread(target=self.stub.serve_forever, daemon=True).start()
+        self.addCleanup(self.stub.server_close)
+        self.addCleanup(self.stub.shutdown)
+        self.reporter = ErrorReporter(RateLimiter(limit=1, window=60))
+        self.addCleanup(self.reporter.uninstall)
+        for patch in (
+            mock.patch.object(rollbar, 'SETTINGS', dict(rollbar.SETTINGS)),
+            mock.patch.object(error_reporting, '_reporter', self.reporter),
+            mock.patch.object(TaskIndexView, 'get_queryset', raise_error),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        # rollbar only takes the token from its first init()
+        rollbar.SETTINGS.update(access_token='token',
+                                endpoint=self.stub.endpoint)
+        self.client.raise_request_exception = False
+        self.client.force_login(self.user)
+
+    def test_report_does_not_block_the_request(self):
+        self.stub.released.clear()
+        response = self.client.get(self.tasks_url)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.stub.items, [])
+        self.stub.released.set()
+        self.assertTrue(self.reporter.flush(5))
+        [item] = self.stub.items
+        data = item['data']
+        self.assertEqual(data['body']['trace']['exception']['message'],
+                         'boom')
+        self.assertEqual(data['person']['username'], self.user.username)
+
+    def test_repeats_are_rate_limited(self):
+        for _ in range(3):
+            self.client.get(self.tasks_url)
+        self.assertTrue(self.reporter.flush(5))
+        self.assertEqual(len(self.stub.items), 1)
+        self.assertEqual(self.reporter.stats()['suppressed'], 2)
@@ -0,0 +1,53 @@
+from io import StringIO
+from unittest import mock
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+from task_manager.template_warmup import compile_templates, warm_templates
+
+BROKEN_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'loaders': [('django.template.loaders.locmem.Loader', {
+            'ok.html': '{% if ok %}ok{% endif %}',
+            'broken.html': '{% if %}',
+        })],
+    },
+}]
+
+
+class TemplateCompileTest(SimpleTestCase):
+
+    def test_project_templates_compile(self):
+        self.assertEqual(compile_templates(), {})
+        self.assertEqual(checks.run_checks(tags=['templates']), [])
+        out = StringIO()
+        call_command('compile_templates', stdout=out)
+        self.assertIn('templates compiled', out.getvalue())
+
+    @override_settings(TEMPLATES=BROKEN_TEMPLATES)
+    @mock.patch('task_manager.template_warmup.project_templates',
+                return_value=['ok.html', 'broken.html', 'missing.html'])
+    def test_failures_are_reported(self, project_templates):
+        self.assertEqual(set(compile_templates()),
+                         {'broken.html', 'missing.html'})
+        errors = checks.run_checks(tags=['templates'])
+        self.assertEqual([error.id for error in errors],
+                         ['task_manager.E002'] * 2)
+        with self.assertRaises(ImproperlyConfigured):
+            warm_templates()
+        with self.assertRaises(CommandError):
+            call_command('compile_templates', stderr=StringIO())
+
+    @override_settings(TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {'loaders': [('django.template.loaders.locmem.Loader', {
+            'cached.html': 'not cached at all',
+        })]},
+    }])
+    def test_uncached_loaders_are_reported(self):
+        warnings = checks.run_checks(tags=['performance'],
+                                     include_deployment_checks=True)
+        self.assertIn('task_manager.W005',
+                      [warning.id for warning in warnings])
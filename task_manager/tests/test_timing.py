@@ -0,0 +1,69 @@
+import json
+import re
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from task_manager.tasks.tests.mixins import TaskViewsTestMixin
+
+SERVER_TIMING = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+def parse_server_timing(value):
+    return {name: (float(duration), queries)
+            for name, duration, queries in SERVER_TIMING.findall(value)}
+
+
+class RequestTimingTest(TaskViewsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.tasks_url)
+        timings = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(timings), {'db', 'view', 'render', 'total'})
+        self.assertEqual(timings['db'][1], str(len(queries)))
+        self.assertGreaterEqual(timings['total'][0], timings['view'][0])
+
+    def test_log_line(self):
+        with self.assertLogs('task_manager.timing', 'INFO') as logs:
+            self.client.get(self.tasks_url, {'status': 1})
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], self.tasks_url)
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['over_budget'], [])
+        self.assertNotIn('slowest_queries', record)
+
+    @override_settings(REQUEST_QUERY_BUDGET=1, REQUEST_TIME_BUDGET_MS=0)
+    def test_over_budget_is_flagged(self):
+        with self.assertLogs('task_manager.timing', 'WARNING') as logs:
+            self.client.get(self.tasks_url)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['over_budget'], ['queries', 'time'])
+
+    @override_settings(REQUEST_TIMING_ENABLED=False,
+                       REQUEST_TIMING_TOKEN='s3cret')
+    def test_timing_on_demand(self):
+        response = self.client.get(self.tasks_url)
+        self.assertFalse(response.has_header('Server-Timing'))
+        response = self.client.get(self.tasks_url,
+                                   headers={'X-Request-Timing': 'wrong'})
+        self.assertFalse(response.has_header('Server-Timing'))
+        with self.assertLogs('task_manager.timing', 'INFO') as logs:
+            response = self.client.get(
+                self.tasks_url, headers={'X-Request-Timing': 's3cret'}
+            )
+        self.assertTrue(response.has_header('Server-Timing'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertTrue(record['slowest_queries'])
+        self.assertLessEqual(len(record['slowest_queries']), 5)
+
+    async def test_server_timing_under_asgi(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(self.tasks_url)
+        timings = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(timings), {'db', 'view', 'render', 'total'})
+        self.assertGreater(int(timings['db'][1]), 0)
@@ -0,0 +1,205 @@
+"""Per-request SQL and timing instrumentation.
+
+RequestTimingMiddleware measures the view, the template rendering, the
+number of queries and the time spent in the database for every request.
+The figures go out in a ``Server-Timing`` header and as one JSON line on
+the ``task_manager.timing`` logger, at WARNING level when the request is
+over the query or time budget.
+
+With REQUEST_TIMING_ENABLED off, a single request can still ask for
+timing by sending REQUEST_TIMING_TOKEN in the REQUEST_TIMING_HEADER
+header. Such requests also log their slowest statements.
+
+With connection pooling (task_manager/db/pool.py) the log line also
+carries the pool figures of the worker process.
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+from task_manager.db.pool import pool_stats
+
+logger = logging.getLogger('task_manager.timing')
+
+SLOWEST_QUERIES = 5
+
+# Context variables follow the request into sync_to_async threads, so
+# queries are attributed correctly even when requests share a thread.
+_current = ContextVar('request_timings', default=None)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class RequestTimings:
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.started = time.perf_counter()
+        self.ended = None
+        self.view_started = self.view_ended = None
+        self.render_started = self.render_ended = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest = []
+
+    def record_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        if self.profile:
+            self.slowest.append((duration, sql))
+            self.slowest.sort(key=lambda query: query[0], reverse=True)
+            del self.slowest[SLOWEST_QUERIES:]
+
+    def rendered(self, response):
+        self.render_ended = time.perf_counter()
+
+    def metrics(self):
+        """Return the phase durations in milliseconds."""
+        metrics = {'db': _ms(self.db_time)}
+        if self.view_started is not None:
+            metrics['view'] = _ms(
+                (self.view_ended or self.ended) - self.view_started
+            )
+        if self.render_ended is not None:
+            metrics['render'] = _ms(self.render_ended - self.render_started)
+        metrics['total'] = _ms(self.ended - self.started)
+        return metrics
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.record_query(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Add the recorder to every new database connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def server_timing(metrics, queries):
+    entries = []
+    for name, duration in metrics.items():
+        entry = f'{name};dur={duration}'
+        if name == 'db':
+            entry += f';desc="{queries} queries"'
+        entries.append(entry)
+    return ', '.join(entries)
+
+
+def over_budget(metrics, queries):
+    over = []
+    if queries > settings.REQUEST_QUERY_BUDGET:
+        over.append('queries')
+    if metrics['total'] > settings.REQUEST_TIME_BUDGET_MS:
+        over.append('time')
+    return over
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Hooks in the handler's own mode are called without a thread
+            # hop.
+            self.process_view = self.aprocess_view
+            self.process_template_response = (
+                self.aprocess_template_response
+            )
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = self.start(request)
+        if timings is None:
+            return self.get_response(request)
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = self.start(request)
+        if timings is None:
+            return await self.get_response(request)
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    @staticmethod
+    def profiling_requested(request):
+        token = settings.REQUEST_TIMING_TOKEN
+        value = request.headers.get(settings.REQUEST_TIMING_HEADER)
+        return bool(token and value and constant_time_compare(value, token))
+
+    def start(self, request):
+        profile = self.profiling_requested(request)
+        if not (profile or settings.REQUEST_TIMING_ENABLED):
+            return None
+        return RequestTimings(profile)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = _current.get()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args,
+                            view_kwargs):
+        self.process_view(request, view_func, view_args, view_kwargs)
+
+    def process_template_response(self, request, response):
+        timings = _current.get()
+        if timings is not None:
+            timings.view_ended = timings.render_started = time.perf_counter()
+            response.add_post_render_callback(timings.rendered)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return self.process_template_response(request, response)
+
+    def finish(self, request, response, timings):
+        timings.ended = time.perf_counter()
+        metrics = timings.metrics()
+        response['Server-Timing'] = server_timing(metrics, timings.queries)
+        over = over_budget(metrics, timings.queries)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timings.queries,
+            **{f'{name}_ms': duration for name, duration in metrics.items()},
+            'over_budget': over,
+        }
+        pools = pool_stats()
+        if pools:
+            record['db_pool'] = pools
+        if timings.profile:
+            record['slowest_queries'] = [
+                {'ms': _ms(duration), 'sql': sql}
+                for duration, sql in timings.slowest
+            ]
+        logger.log(logging.WARNING if over else logging.INFO,
+                   json.dumps(record))
+        return response
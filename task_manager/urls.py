@@ -27,4 +27,5 @@ urlpatterns = [
     path('statuses/', include('task_manager.statuses.urls')),
     path('labels/', include('task_manager.labels.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
+    path('api/', include('task_manager.api.urls')),
 ]
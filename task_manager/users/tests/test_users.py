@@ -1,4 +1,6 @@
+from django.core import checks
 from django.test import TestCase
+from unittest import mock
 from ..forms import UserCreateForm
 from ..views import (
     UsersIndexView,
@@ -60,6 +62,55 @@ class UsersViewTest(UsersViewTestMixin, TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'users/index.html')
 
+    def test_users_index_paginated_GET(self):
+        self.users.bulk_create(
+            self.users.model(username=f'user{i:03}') for i in range(60)
+        )
+        response = self.client.get(self.users_url)
+        page = response.context['page_obj']
+        self.assertEqual(len(response.context['users']), 50)
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertContains(response, f'href="?{page.next_query}"')
+        response = self.client.get(f'{self.users_url}?{page.next_query}')
+        self.assertEqual(len(response.context['users']), 12)
+        self.assertFalse(response.context['page_obj'].has_next())
+
+    def test_users_index_sorting_GET(self):
+        ordered = self.users.order_by('-username').values_list('pk', flat=True)
+        response = self.client.get(self.users_url, {'sort_by': '-username'})
+        self.assertEqual([user.pk for user in response.context['users']],
+                         list(ordered))
+        self.assertContains(response, 'href="?sort_by=username"')
+        response = self.client.get(self.users_url, {'sort_by': '-id'})
+        self.assertEqual([user.pk for user in response.context['users']],
+                         [2, 1])
+
+    def test_users_index_rejects_unlisted_sorting_GET(self):
+        for sort_by in ('password', 'first_name___pk', '-date_joined'):
+            response = self.client.get(self.users_url, {'sort_by': sort_by})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [user.pk for user in response.context['users']], [1, 2]
+            )
+
+    def test_users_index_not_modified_GET(self):
+        response = self.client.get(self.users_url)
+        etag = {'If-None-Match': response['ETag']}
+        response = self.client.get(self.users_url, headers=etag)
+        self.assertEqual(response.status_code, 304)
+        self.users.get(pk=2).save()
+        response = self.client.get(self.users_url, headers=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_sortable_columns_must_be_indexed(self):
+        self.assertEqual(checks.run_checks(tags=['urls']), [])
+        with mock.patch.object(UsersIndexView, 'sortable_columns',
+                               {'first_name': 'first_name'}):
+            errors = checks.run_checks(tags=['urls'])
+        self.assertEqual([error.id for error in errors],
+                         ['task_manager.E001'])
+
     def test_user_create_GET(self):
         response = self.client.get(self.user_create_url)
         self.assertEqual(response.status_code, 200)
@@ -7,7 +7,11 @@ from django.shortcuts import redirect
 from django.db.models import ProtectedError
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from task_manager.users.forms import UserCreateForm
-from task_manager.view_mixins import IndexViewMixin
+from task_manager.view_mixins import (
+    ConditionalGetMixin,
+    IndexViewMixin,
+    KeysetPaginationMixin,
+)
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from . import forms
@@ -35,9 +39,16 @@ class UsersAbstractMixin:
     form_class = UserCreateForm
 
 
-class UsersIndexView(UsersAbstractMixin, IndexViewMixin):
+class UsersIndexView(UsersAbstractMixin, KeysetPaginationMixin,
+                     ConditionalGetMixin, IndexViewMixin):
     template_name = 'users/index.html'
     context_object_name = 'users'
+    version_tables = ('users',)
+    read_from_replica = True
+    sortable_columns = {
+        'id': 'pk',
+        'username': 'username',
+    }
 
 
 class UserCreateView(UsersAbstractMixin, CreateView):
@@ -1,18 +1,215 @@
+import hashlib
+import time
+from django.conf import settings
+from django.contrib.messages import get_messages
 from django.contrib.messages.views import SuccessMessageMixin
 from django.db.models import ProtectedError
-from django.views.generic.edit import CreateView, UpdateView, DeleteView
-from django.views.generic import ListView
+from django.forms import Form
+from django.views.generic.edit import (
+    CreateView,
+    DeleteView,
+    FormMixin,
+    UpdateView,
+)
+from django.views.generic import DetailView, ListView
 from django.contrib import messages
+from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import get_language
+from task_manager.cache_versions import aget_versions, get_versions
+from task_manager.db.router import current_state
+from task_manager.pagination import InvalidCursor, KeysetPaginator
 
 
-class IndexViewMixin(ListView):
+class ConditionalGetMixin:
+    """Answer conditional GETs from table versions, before any query.
+
+    ``version_tables`` names the cache_versions tables the page is built
+    from. Their versions and everything else the page varies on (user,
+    language, time zone, path and query string) make up the ETag, and the
+    newest version is the Last-Modified date. Pages with flash messages
+    waiting are always rendered, a cached copy would not show them. The
+    session key is part of the ETag too: logging in rotates the CSRF
+    secret along with it, and a cached page must not post forms with a
+    token from an earlier session.
+
+    A page whose tables changed in the last REPLICA_PIN_SECONDS is read
+    from the primary: the versions are bumped there, and a replica still
+    behind would render the old rows under the new ETag, which browsers
+    then keep until the next write.
+    """
+    version_tables = ()
+
+    def get_validators(self):
+        return self.make_validators(get_versions(*self.version_tables))
+
+    def make_validators(self, versions):
+        parts = [*versions, self.request.user.pk, get_language(),
+                 get_current_timezone_name(), self.request.get_full_path(),
+                 self.request.session.session_key]
+        etag = hashlib.md5(repr(parts).encode()).hexdigest()
+        return quote_etag(etag), max(versions) // 10 ** 9
+
+    def not_modified(self, validators):
+        if len(get_messages(self.request)):
+            return None
+        etag, last_modified = validators
+        response = get_conditional_response(self.request, etag=etag,
+                                            last_modified=last_modified)
+        if response is None:
+            self.skip_lagging_replica(last_modified)
+        return response
+
+    @staticmethod
+    def skip_lagging_replica(last_modified):
+        state = current_state()
+        if (state is not None
+                and time.time() - last_modified
+                <= settings.REPLICA_PIN_SECONDS):
+            state.use_replica = False
+
+    @staticmethod
+    def add_validators(response, validators):
+        if response.status_code == 200:
+            etag, last_modified = validators
+            response.headers.setdefault('ETag', etag)
+            response.headers.setdefault('Last-Modified',
+                                        http_date(last_modified))
+            # Pages differ per user; let browsers keep them, but revalidate.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        return self.not_modified(validators) or self.add_validators(
+            super().get(request, *args, **kwargs), validators
+        )
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+
+    async def aget_validators(self):
+        # The cache may do blocking IO, e.g. the FileBasedCache of prod.
+        return self.make_validators(
+            await aget_versions(*self.version_tables)
+        )
+
+    async def get(self, request, *args, **kwargs):
+        validators = await self.aget_validators()
+        return self.not_modified(validators) or self.add_validators(
+            await super(ConditionalGetMixin, self).get(
+                request, *args, **kwargs
+            ),
+            validators,
+        )
+
+
+class KeysetPaginationMixin:
+    paginate_by = 50
+    cursor_kwarg = 'cursor'
+
+    def get_keyset_paginator(self, queryset, page_size):
+        return KeysetPaginator(
+            queryset, page_size,
+            params=self.request.GET,
+            cursor_kwarg=self.cursor_kwarg,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404('Invalid cursor.')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class SortableMixin:
+    """Order the list by a whitelisted column from the ``sort_by`` param.
+
+    ``sortable_columns`` maps the column names accepted in the query
+    string to model fields. Only index-backed fields belong there (see
+    task_manager.checks); the pk is appended as a tiebreaker so that the
+    order is total and keyset pagination stays stable.
+    """
     ordering = ['pk']
+    sortable_columns = {'id': 'pk'}
+    sort_kwarg = 'sort_by'
+
+    def get_sort(self):
+        value = self.request.GET.get(self.sort_kwarg, '')
+        column = value.removeprefix('-')
+        if column not in self.sortable_columns:
+            return None
+        return column, value.startswith('-')
 
     def get_ordering(self):
-        if self.request.GET.get('sort_by'):
-            self.ordering = self.request.GET.get('sort_by').split("___")
-        return self.ordering
+        sort = self.get_sort()
+        if sort is None:
+            return self.ordering
+        column, descending = sort
+        prefix = '-' if descending else ''
+        field = self.sortable_columns[column]
+        if field in ('pk', 'id'):
+            return [prefix + field]
+        return [prefix + field, prefix + 'pk']
+
+
+class IndexViewMixin(SortableMixin, ListView):
+    pass
+
+
+class AsyncSingleObjectMixin:
+    """Load ``self.object`` with the async ORM.
+
+    ``test_object`` is the per-object counterpart of
+    ``UserPassesTestMixin.test_func``: when it fails the handler returns
+    ``handle_no_permission()`` instead of serving the object.
+    """
+
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.verbose_name} found.')
+
+    def test_object(self, obj):
+        return True
+
+    async def load_object(self):
+        self.object = await self.aget_object()
+        return self.test_object(self.object)
+
+    async def get(self, request, *args, **kwargs):
+        if not await self.load_object():
+            return self.handle_no_permission()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+
+class AsyncDetailViewMixin(AsyncSingleObjectMixin, DetailView):
+    pass
+
+
+class AsyncDeleteViewMixin(AsyncSingleObjectMixin, FormMixin, DetailView):
+    """Async counterpart of DeleteView: GET confirms, POST deletes."""
+    form_class = Form
+    template_name_suffix = '_confirm_delete'
+
+    async def post(self, request, *args, **kwargs):
+        if not await self.load_object():
+            return self.handle_no_permission()
+        success_url = self.get_success_url()
+        await self.delete_object()
+        return HttpResponseRedirect(success_url)
+
+    async def delete_object(self):
+        await self.object.adelete()
 
 
 class CreateViewMixin(SuccessMessageMixin, CreateView):
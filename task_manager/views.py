@@ -5,10 +5,23 @@ from task_manager.users.forms import LoginUserForm
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
+from task_manager.tasks.dashboard import get_dashboard
 
 
 class IndexView(TemplateView):
     template_name = 'index.html'
+    read_from_replica = True
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            dashboard = get_dashboard()
+            context['dashboard'] = dashboard
+            # Height of the tallest bar of the created-per-day chart.
+            context['created_max'] = max(
+                day['task_count'] for day in dashboard['created']
+            )
+        return context
 
 
 class LoginUser(LoginView):
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 from django.core.wsgi import get_wsgi_application
+from task_manager.template_warmup import warm_templates
 import django
 
 os.environ["DJANGO_SETTINGS_MODULE"] = "task_manager.settings"
@@ -18,3 +19,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 application = get_wsgi_application()
 
 django.setup()
+
+# Parse every template before the first request. A template that does not
+# compile keeps the worker from booting.
+warm_templates()